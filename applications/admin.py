@@ -3,13 +3,15 @@ from django.contrib import admin, messages
 from django.db import transaction
 from django.utils.html import format_html
 from django.urls import reverse
+from django.utils import timezone
 from .models import ApplicantProfile, Application, FAQ, PolicyPage, News, ApplicationReview
 from institutions.models import Institution, Course  # ✅ correct
-from .models import ApplicationConfig
+from .models import ApplicationConfig, OutboundEvent
+from .search import ApplicationSearchMixin
 
 # Optional: import your notification helper or task if you want to call it directly
 # from .utils import notify_student_status_change
-from .tasks import send_application_status_email
+from .tasks import flush_outbound_events
 
 class IsContinuingFilter(admin.SimpleListFilter):
     title = "Application Type"
@@ -90,16 +92,14 @@ class ApplicantProfileAdmin(admin.ModelAdmin):
 
 
 @admin.register(Application)
-class ApplicationAdmin(admin.ModelAdmin):
+class ApplicationAdmin(ApplicationSearchMixin, admin.ModelAdmin):
     list_display = (
         'id', 'applicant_link', 'applicant_email', 'institution', 'course',
-        'year_of_study', 'status', 'submission_date'
+        'year_of_study', 'status', 'total_paid_display', 'payment_status_display', 'submission_date'
     )
     list_filter = ('status', 'institution', 'submission_date', 'course', IsContinuingFilter)
-    search_fields = (
-        'applicant__user__username', 'applicant__user__first_name',
-        'applicant__user__last_name', 'institution__name', 'course__name'
-    )
+    # answered from the search index by ApplicationSearchMixin
+    search_fields = ('search_document__body',)
     readonly_fields = ('submission_date', 'ai_summary')
     list_select_related = ('applicant__user', 'institution', 'course')
     actions = ('mark_as_approved', 'mark_as_rejected', 'mark_payment_paid', 'mark_payment_unpaid')
@@ -142,33 +142,35 @@ class ApplicationAdmin(admin.ModelAdmin):
         return obj.applicant.user.email if obj.applicant and obj.applicant.user else '-'
     applicant_email.short_description = 'Email'
 
+    def get_queryset(self, request):
+        # One grouped query for paid/committed sums instead of one per row
+        return super().get_queryset(request).with_payment_totals()
+
+    @admin.display(description='Paid', ordering='paid_sum')
+    def total_paid_display(self, obj):
+        return obj.total_paid
+
+    @admin.display(description='Payment Status')
+    def payment_status_display(self, obj):
+        return obj.payment_status
+
     # ---------- Admin actions that update status and notify students ----------
     @admin.action(description='Mark selected applications as Approved and notify students')
     def mark_as_approved(self, request, queryset):
-        updated = 0
-        with transaction.atomic():
-            for app in queryset.select_for_update():
-                if app.status != Application.STATUS_APPROVED:
-                    # Use the model helper so a review record is created and signals fire
-                    try:
-                        app.set_status(Application.STATUS_APPROVED, reviewer=request.user, note="Approved by admin", notify=True)
-                        updated += 1
-                    except Exception as exc:
-                        self.message_user(request, f"Failed to approve application {app.pk}: {exc}", level=messages.WARNING)
-        self.message_user(request, f"{updated} application(s) marked as Approved.", level=messages.SUCCESS)
+        # one UPDATE + one bulk review insert + one batched email enqueue
+        reviews = Application.objects.bulk_set_status(
+            queryset.values_list('pk', flat=True), Application.STATUS_APPROVED,
+            reviewer=request.user, note="Approved by admin",
+        )
+        self.message_user(request, f"{len(reviews)} application(s) marked as Approved.", level=messages.SUCCESS)
 
     @admin.action(description='Mark selected applications as Rejected and notify students')
     def mark_as_rejected(self, request, queryset):
-        updated = 0
-        with transaction.atomic():
-            for app in queryset.select_for_update():
-                if app.status != Application.STATUS_REJECTED:
-                    try:
-                        app.set_status(Application.STATUS_REJECTED, reviewer=request.user, note="Rejected by admin", notify=True)
-                        updated += 1
-                    except Exception as exc:
-                        self.message_user(request, f"Failed to reject application {app.pk}: {exc}", level=messages.WARNING)
-        self.message_user(request, f"{updated} application(s) marked as Rejected.", level=messages.SUCCESS)
+        reviews = Application.objects.bulk_set_status(
+            queryset.values_list('pk', flat=True), Application.STATUS_REJECTED,
+            reviewer=request.user, note="Rejected by admin",
+        )
+        self.message_user(request, f"{len(reviews)} application(s) marked as Rejected.", level=messages.SUCCESS)
 
     @admin.action(description='Mark payment as Paid and notify students')
     def mark_payment_paid(self, request, queryset):
@@ -191,10 +193,10 @@ class ApplicationAdmin(admin.ModelAdmin):
 
 
 @admin.register(ApplicationReview)
-class ApplicationReviewAdmin(admin.ModelAdmin):
+class ApplicationReviewAdmin(ApplicationSearchMixin, admin.ModelAdmin):
     list_display = ('application', 'reviewer', 'status', 'created_at')
     list_filter = ('status', 'created_at')
-    search_fields = ('application__applicant__first_name', 'application__applicant__surname', 'reviewer__username')
+    search_fields = ('application__search_document__body', 'reviewer__username')
 
 
 @admin.register(News)
@@ -213,5 +215,22 @@ class ApplicationConfigAdmin(admin.ModelAdmin):
     list_display = ("applications_open", "close_at", "rollover_at", "legacy_lookup_enabled")
 
 
+@admin.register(OutboundEvent)
+class OutboundEventAdmin(admin.ModelAdmin):
+    list_display = ('id', 'event_name', 'email', 'status', 'attempts', 'next_attempt_at', 'sent_at')
+    list_filter = ('status', 'event_name')
+    search_fields = ('email', 'event_name')
+    readonly_fields = ('created_at', 'updated_at', 'sent_at')
+    actions = ('retry_events',)
+
+    @admin.action(description='Retry selected events now')
+    def retry_events(self, request, queryset):
+        updated = queryset.exclude(status=OutboundEvent.STATUS_SENT).update(
+            status=OutboundEvent.STATUS_PENDING, attempts=0, next_attempt_at=timezone.now()
+        )
+        transaction.on_commit(flush_outbound_events.delay)
+        self.message_user(request, f"{updated} event(s) queued for retry.", level=messages.SUCCESS)
+
+
 admin.site.register(FAQ)
 admin.site.register(PolicyPage)
@@ -0,0 +1,69 @@
+# applications/config.py
+"""
+Cached access to the ApplicationConfig singleton.
+
+The open/closed gate runs on every student-facing view, so the config row
+is read through three layers instead of a get_or_create per call:
+
+  1. memoized on the request (several checks in one view cost nothing)
+  2. a process-local copy, reused for CONFIG_LOCAL_TTL seconds
+  3. the shared cache, cleared after commit when the row is saved
+
+Other processes pick up an admin change within CONFIG_LOCAL_TTL seconds.
+The returned object is shared; use ApplicationConfig.get_solo() to edit.
+"""
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+from .models import ApplicationConfig
+
+CONFIG_CACHE_KEY = "application_config"
+CONFIG_CACHE_TTL = 60 * 60  # bounds staleness for writes that bypass signals
+CONFIG_LOCAL_TTL = 10
+_REQUEST_ATTR = "_application_config"
+
+_local = None  # (config, expires_at) for this process
+
+
+def _load():
+    config = cache.get(CONFIG_CACHE_KEY)
+    if config is None:
+        config = ApplicationConfig.get_solo()
+        cache.set(CONFIG_CACHE_KEY, config, timeout=CONFIG_CACHE_TTL)
+    return config
+
+
+def get_config(request=None):
+    """
+    The ApplicationConfig row, read-only, without a database query on
+    warm paths.
+    """
+    global _local
+    if request is not None:
+        config = getattr(request, _REQUEST_ATTR, None)
+        if config is not None:
+            return config
+
+    now = time.monotonic()
+    local = _local
+    if local is not None and now < local[1]:
+        config = local[0]
+    else:
+        config = _load()
+        _local = (config, now + CONFIG_LOCAL_TTL)
+
+    if request is not None:
+        setattr(request, _REQUEST_ATTR, config)
+    return config
+
+
+def invalidate_config():
+    global _local
+    cache.delete(CONFIG_CACHE_KEY)
+    _local = None
+
+
+def schedule_config_invalidation():
+    transaction.on_commit(invalidate_config)
@@ -1,17 +1,45 @@
 # applications/context_processors.py
+import operator
+from functools import partial
+
+from django.core.cache import cache
+from django.utils.functional import SimpleLazyObject
+
 from .models import ApplicantProfile, Application
 
+from utils.roles import has_any_group
+
 OFFICER_GROUP = "Scholarship Officers"
 
-def user_context(request):
-    user = request.user
+USER_FLAGS = ("has_application", "is_student", "is_officer", "is_admin")
+# student flags only change when a profile/application is created or deleted;
+# signals.py clears the entry then, the TTL is a safety net
+STUDENT_FLAGS_TTL = 60 * 30
+
+
+def _student_flags_key(user_id):
+    return f"user_flags:{user_id}"
+
+
+def invalidate_user_flags(user_id):
+    cache.delete(_student_flags_key(user_id))
 
-    context = {
-        "has_application": False,
-        "is_student": False,
-        "is_officer": False,
-        "is_admin": False,
-    }
+
+def _student_flags(user):
+    key = _student_flags_key(user.pk)
+    flags = cache.get(key)
+    if flags is None:
+        profile_id = ApplicantProfile.objects.filter(user=user).values_list("id", flat=True).first()
+        flags = {
+            "is_student": profile_id is not None,
+            "has_application": profile_id is not None and Application.objects.filter(applicant_id=profile_id).exists(),
+        }
+        cache.set(key, flags, timeout=STUDENT_FLAGS_TTL)
+    return flags
+
+
+def _resolve_user_flags(user):
+    context = dict.fromkeys(USER_FLAGS, False)
 
     if not user.is_authenticated:
         return context
@@ -22,18 +50,24 @@ def user_context(request):
         return context
 
     # Officer
-    if user.groups.filter(name='Scholarship Officers').exists():
+    if has_any_group(user, OFFICER_GROUP):
         context["is_officer"] = True
         return context
 
     # Student
-    profile = ApplicantProfile.objects.filter(user=user).only("id").first()
-    if profile:
-        context["is_student"] = True
-        context["has_application"] = Application.objects.filter(applicant_id=profile.id).exists()
-
+    context.update(_student_flags(user))
     return context
 
+
+def user_context(request):
+    """
+    Role flags for the navigation. Each value is lazy: nothing (not even
+    request.user) is resolved unless a template actually reads a flag, and
+    all four share one resolution.
+    """
+    flags = SimpleLazyObject(lambda: _resolve_user_flags(request.user))
+    return {name: SimpleLazyObject(partial(operator.getitem, flags, name)) for name in USER_FLAGS}
+
 def application_status(request):
     """
     Custom context processor that adds application status info
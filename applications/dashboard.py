@@ -0,0 +1,175 @@
+# applications/dashboard.py
+"""
+Officer dashboard snapshot store.
+
+The officer dashboard aggregates scan the whole Application/Payment tables,
+so the results are stored in a single DashboardSnapshot row. Writes that
+can move the numbers (see signals.py) only bump a data version in the
+cache and queue one debounced rebuild task; readers always get the stored
+row, so a busy week costs one rebuild per REBUILD_DEBOUNCE seconds rather
+than one per officer per write.
+"""
+import logging
+import time
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from institutions.models import Institution
+from .models import Application, DashboardSnapshot
+
+logger = logging.getLogger(__name__)
+
+DATA_VERSION_KEY = "dashboard_data_version"
+REBUILD_LOCK_KEY = "dashboard_rebuild_queued"
+REBUILD_DEBOUNCE = 30  # seconds
+
+# keys whose values are money and must come back out of JSON as Decimal
+DECIMAL_KEYS = ("committed_total", "paid_total", "remaining_total")
+FINANCE_DECIMAL_KEYS = (
+    "pool_total_tuition",
+    "pool_total_paid",
+    "pool_total_committed",
+    "pool_total_outstanding",
+)
+
+
+def compute_dashboard_stats():
+    """
+    Run every aggregate the officer dashboard needs and return them as one dict.
+    """
+    from finance.models import Payment
+    from finance.views import finance_summary_totals
+
+    institution_stats_qs = (
+        Application.objects
+        .values('institution__id', 'institution__name')
+        .annotate(
+            total=Count('id'),
+            approved=Count('id', filter=Q(status=Application.STATUS_APPROVED)),
+            rejected=Count('id', filter=Q(status=Application.STATUS_REJECTED)),
+            pending=Count('id', filter=Q(status=Application.STATUS_PENDING)),
+        )
+        .order_by('institution__name')
+    )
+    institution_stats = [
+        {
+            'id': item['institution__id'],
+            'name': item['institution__name'],
+            'total': item['total'],
+            'approved': item['approved'],
+            'rejected': item['rejected'],
+            'pending': item['pending'],
+        }
+        for item in institution_stats_qs
+    ]
+
+    totals = {
+        'total_applications': sum(s['total'] for s in institution_stats),
+        'total_approved': sum(s['approved'] for s in institution_stats),
+        'total_rejected': sum(s['rejected'] for s in institution_stats),
+        'total_pending': sum(s['pending'] for s in institution_stats),
+    }
+
+    approved_qs = Application.objects.filter(status=Application.STATUS_APPROVED)
+    finance_totals = approved_qs.aggregate(
+        pool_total_tuition=Coalesce(Sum('course__total_tuition_fee'), Decimal('0.00')),
+        pool_total_paid=Coalesce(Sum('payments__amount', filter=Q(payments__status=Payment.STATUS_PAID)), Decimal('0.00')),
+        pool_total_committed=Coalesce(Sum('payments__amount', filter=Q(payments__status=Payment.STATUS_COMMITTED)), Decimal('0.00')),
+    )
+    finance_totals['pool_total_outstanding'] = finance_totals['pool_total_tuition'] - finance_totals['pool_total_paid']
+
+    stats = {
+        'institution_stats': institution_stats,
+        'totals': totals,
+        'finance_totals': finance_totals,
+        'total_awarded': totals['total_approved'],
+        'institutions_count': Institution.objects.count(),
+    }
+    # finance_summary_totals() supplies committed/paid/remaining/paid_percent for the top cards
+    stats.update(finance_summary_totals())
+    return stats
+
+
+def _restore_decimals(data):
+    for key in DECIMAL_KEYS:
+        if key in data:
+            data[key] = Decimal(str(data[key] or '0.00'))
+    finance_totals = data.get('finance_totals') or {}
+    for key in FINANCE_DECIMAL_KEYS:
+        if key in finance_totals:
+            finance_totals[key] = Decimal(str(finance_totals[key] or '0.00'))
+    return data
+
+
+def dashboard_data_version():
+    """
+    time.time_ns() stamp of the last write that can move the numbers.
+    """
+    version = cache.get(DATA_VERSION_KEY)
+    if version is None:
+        cache.add(DATA_VERSION_KEY, time.time_ns(), timeout=None)
+        version = cache.get(DATA_VERSION_KEY)
+    return version
+
+
+def rebuild_dashboard_snapshot():
+    """
+    Recompute the aggregates and store them in the snapshot row, tagged
+    with the data version they were computed from. A write that lands while
+    this runs moves the version on, so the row reads as stale again.
+    """
+    version = dashboard_data_version()
+    stats = compute_dashboard_stats()
+    DashboardSnapshot.objects.update_or_create(
+        pk=1,
+        defaults={"data": stats, "version": version, "refreshed_at": timezone.now()},
+    )
+    return stats
+
+
+def request_dashboard_rebuild():
+    """
+    Queue one rebuild per REBUILD_DEBOUNCE window, however many writes or
+    readers ask for it.
+    """
+    if not cache.add(REBUILD_LOCK_KEY, 1, timeout=REBUILD_DEBOUNCE):
+        return
+    from .tasks import rebuild_dashboard_snapshot_task
+    try:
+        rebuild_dashboard_snapshot_task.apply_async(countdown=REBUILD_DEBOUNCE)
+    except Exception:
+        # broker down: drop the guard so the next reader tries again
+        cache.delete(REBUILD_LOCK_KEY)
+        logger.exception("Failed to queue dashboard snapshot rebuild")
+
+
+def get_dashboard_snapshot():
+    """
+    Return the stored dashboard aggregates. When writes have moved the data
+    on, the stored numbers are still served and a rebuild is queued; only
+    a missing row is built inline.
+    """
+    snapshot = DashboardSnapshot.objects.filter(pk=1).first()
+    if snapshot is None or not snapshot.data:
+        return rebuild_dashboard_snapshot()
+    if snapshot.version != dashboard_data_version():
+        request_dashboard_rebuild()
+    return _restore_decimals(snapshot.data)
+
+
+def mark_dashboard_changed():
+    cache.set(DATA_VERSION_KEY, time.time_ns(), timeout=None)
+    request_dashboard_rebuild()
+
+
+def schedule_dashboard_refresh():
+    """
+    Invalidate after the surrounding transaction commits, so a rolled-back
+    write never touches the snapshot.
+    """
+    transaction.on_commit(mark_dashboard_changed)
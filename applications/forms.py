@@ -9,6 +9,7 @@ from django.core.validators import FileExtensionValidator
 from django.contrib.auth import get_user_model
 from .validators import validate_upload
 from institutions .models import Course, Institution
+from institutions.catalogue import get_catalogue
 
 
 
@@ -160,6 +161,12 @@ class ApplicationForm(forms.ModelForm):
                 institution_id=inst_id
             )
 
+        # render the options from the cached catalogue; the querysets above
+        # are only queried to validate a submitted choice
+        catalogue = get_catalogue()
+        self.fields["institution"].choices = catalogue.institution_choices()
+        self.fields["course"].choices = catalogue.course_choices(inst_id or self.instance.institution_id)
+
     # -------------------------
     # VALIDATION
     # -------------------------
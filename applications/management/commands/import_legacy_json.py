@@ -1,41 +1,92 @@
 # applications/management/commands/import_legacy_json.py
-import json
-from decimal import Decimal
+from collections import Counter
+
 from django.core.management.base import BaseCommand
+from django.db import transaction
+
 from applications.models import LegacyStudent
-from django.conf import settings
+from applications.utils import normalize_name
+from utils.legacy_students import LEGACY_JSON_PATH, clean_legacy_record, iter_legacy_students
+
+# LegacyStudent's legacy_unique_record constraint
+KEY_FIELDS = ["first_name", "surname", "institution", "course"]
+UPDATE_FIELDS = ["first_name_norm", "surname_norm", "year_of_study", "tuition_fee"]
+
 
 class Command(BaseCommand):
-    help = "Import legacy students from JSON file with normalization"
-
-    def handle(self, *args, **kwargs):
-        path = settings.BASE_DIR / "data" / "legacy_students.json"
-        with open(path, "r", encoding="utf-8") as f:
-            raw = json.load(f)
-
-        for record in raw:
-            first_name = record.get("First Name ", "").strip()
-            surname = record.get("Surname", "").strip()
-            institution = record.get("Institution", "").strip()
-            course = record.get("Course ", "").strip()
-            year_str = record.get("Year Of Study", "").strip()
-            year = None
-            if year_str.lower().startswith("year"):
-                try:
-                    year = int(year_str.replace("Year", "").strip())
-                except ValueError:
-                    year = None
-            tuition = Decimal(record.get("Tuition Fee", "0").strip())
-
-            LegacyStudent.objects.update_or_create(
-                first_name=first_name,
-                surname=surname,
-                defaults={
-                    "institution": institution,
-                    "course": course,
-                    "year_of_study": year,
-                    "tuition_fee": tuition,
-                }
+    help = (
+        "Import legacy students from JSON file with normalization.\n\n"
+        "Rows are streamed from the file, validated and upserted in batches keyed on\n"
+        "(first name, surname, institution, course), so re-running the import updates\n"
+        "records in place.\n\n"
+        "Options:\n"
+        "  --path FILE        JSON file (default: data/legacy_students.json)\n"
+        "  --batch-size N     Rows per bulk upsert (default: 1000)\n"
+        "  --dry-run          Validate only; write nothing\n"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--path", default=str(LEGACY_JSON_PATH))
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--dry-run", action="store_true")
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        batch_size = max(1, options["batch_size"])
+        dry_run = options["dry_run"]
+
+        seen = written = 0
+        rejected = []
+        batch = {}
+
+        def flush():
+            nonlocal written
+            if not batch:
+                return
+            if not dry_run:
+                with transaction.atomic():
+                    LegacyStudent.objects.bulk_create(
+                        batch.values(),
+                        update_conflicts=True,
+                        unique_fields=KEY_FIELDS,
+                        update_fields=UPDATE_FIELDS,
+                    )
+            written += len(batch)
+            self.stdout.write(f"  {seen} rows read, {written} {'valid' if dry_run else 'upserted'}, {len(rejected)} rejected")
+            batch.clear()
+
+        for index, record in enumerate(iter_legacy_students(path), start=1):
+            seen = index
+            try:
+                values = clean_legacy_record(record)
+            except ValueError as exc:
+                rejected.append((index, str(exc)))
+                continue
+
+            student = LegacyStudent(
+                first_name_norm=normalize_name(values["first_name"]),
+                surname_norm=normalize_name(values["surname"]),
+                **values,
             )
+            # one row per key per statement (Postgres rejects a second ON CONFLICT
+            # hit on the same key); a later record for the same student wins
+            batch[tuple(values[name] for name in KEY_FIELDS)] = student
+            if len(batch) >= batch_size:
+                flush()
+        flush()
+
+        self.stdout.write(f"\nRows read: {seen}")
+        self.stdout.write(f"{'Valid' if dry_run else 'Upserted'}: {written}")
+        self.stdout.write(f"Rejected: {len(rejected)}")
+        if rejected:
+            for reason, count in Counter(reason for _, reason in rejected).most_common():
+                self.stdout.write(f"  {count} x {reason}")
+            for index, reason in rejected[:20]:
+                self.stdout.write(f"  row {index}: {reason}")
+            if len(rejected) > 20:
+                self.stdout.write(f"  ... and {len(rejected) - 20} more")
 
-        self.stdout.write(self.style.SUCCESS("Legacy students imported successfully"))
+        if dry_run:
+            self.stdout.write(self.style.WARNING("Dry run: nothing was written."))
+        else:
+            self.stdout.write(self.style.SUCCESS("Legacy students imported successfully"))
@@ -0,0 +1,22 @@
+# applications/management/commands/rebuild_dashboard_snapshot.py
+from django.core.management.base import BaseCommand
+
+from applications.dashboard import rebuild_dashboard_snapshot
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the officer dashboard snapshot from the Application/Payment tables.\n\n"
+        "Use this to repair drift (e.g. after raw SQL or queryset.update() writes that bypass signals)."
+    )
+
+    def handle(self, *args, **options):
+        stats = rebuild_dashboard_snapshot()
+
+        totals = stats["totals"]
+        self.stdout.write(f"Applications: {totals['total_applications']} "
+                          f"(approved {totals['total_approved']}, pending {totals['total_pending']}, "
+                          f"rejected {totals['total_rejected']})")
+        self.stdout.write(f"Institutions: {stats['institutions_count']}")
+        self.stdout.write(f"Committed: {stats['committed_total']}  Paid: {stats['paid_total']}")
+        self.stdout.write(self.style.SUCCESS("Dashboard snapshot rebuilt."))
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from applications.models import Application
+from applications.search import refresh_search_documents
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the officer search documents for every application (or the given ids). "
+        "Signals keep them current; run this after bulk changes made with update() or raw SQL."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("ids", nargs="*", type=int, help="Application ids (default: all)")
+
+    def handle(self, *args, **options):
+        applications = Application.objects.all()
+        if options["ids"]:
+            applications = applications.filter(pk__in=options["ids"])
+        written = refresh_search_documents(applications)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {written} search documents"))
@@ -0,0 +1,40 @@
+# Generated by Django 5.2 on 2026-10-17 22:57
+
+from django.db import migrations, models
+
+from applications.utils import normalize_name
+
+
+def fill_normalized_names(apps, schema_editor):
+    LegacyStudent = apps.get_model('applications', 'LegacyStudent')
+    batch = []
+    for student in LegacyStudent.objects.only('id', 'first_name', 'surname').iterator(chunk_size=2000):
+        student.first_name_norm = normalize_name(student.first_name)
+        student.surname_norm = normalize_name(student.surname)
+        batch.append(student)
+    LegacyStudent.objects.bulk_update(batch, ['first_name_norm', 'surname_norm'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0034_outboundevent'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='legacystudent',
+            name='first_name_norm',
+            field=models.CharField(blank=True, editable=False, max_length=100),
+        ),
+        migrations.AddField(
+            model_name='legacystudent',
+            name='surname_norm',
+            field=models.CharField(blank=True, editable=False, max_length=100),
+        ),
+        migrations.RunPython(fill_normalized_names, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='legacystudent',
+            index=models.Index(fields=['surname_norm', 'first_name_norm', 'year_of_study'], name='legacy_name_year_idx'),
+        ),
+    ]
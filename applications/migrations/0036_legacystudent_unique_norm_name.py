@@ -0,0 +1,42 @@
+# Generated by Django 5.2 on 2026-10-17 23:04
+
+from django.db import migrations, models
+from django.db.models import Count
+
+KEY_FIELDS = ('first_name', 'surname', 'institution', 'course')
+
+
+def check_duplicate_records(apps, schema_editor):
+    # The old importer's update_or_create keyed on the exact (first_name,
+    # surname), so imported data has no duplicates on this wider key. Rows
+    # added by hand might; those are left for someone to resolve rather than
+    # deleted here.
+    LegacyStudent = apps.get_model('applications', 'LegacyStudent')
+    duplicates = list(
+        LegacyStudent.objects.values(*KEY_FIELDS)
+        .annotate(rows=Count('id'))
+        .filter(rows__gt=1)[:20]
+    )
+    if duplicates:
+        listed = "\n".join(
+            f"  {d['first_name']} {d['surname']} / {d['institution']} / {d['course']} ({d['rows']} rows)"
+            for d in duplicates
+        )
+        raise RuntimeError(
+            "Duplicate LegacyStudent records; merge or delete them in the admin, then migrate again:\n" + listed
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0035_legacystudent_normalized_names'),
+    ]
+
+    operations = [
+        migrations.RunPython(check_duplicate_records, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='legacystudent',
+            constraint=models.UniqueConstraint(fields=KEY_FIELDS, name='legacy_unique_record'),
+        ),
+    ]
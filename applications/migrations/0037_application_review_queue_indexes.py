@@ -0,0 +1,21 @@
+# Generated by Django 5.2 on 2026-10-17 23:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0036_legacystudent_unique_norm_name'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['status', 'is_continuing', 'submission_date', 'id'], name='app_review_queue_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['submission_date', 'id'], name='app_submitted_idx'),
+        ),
+    ]
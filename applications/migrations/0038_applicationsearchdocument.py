@@ -0,0 +1,113 @@
+# Generated by Django 5.2 on 2026-10-17 23:31
+
+import re
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+DOC_TABLE = 'applications_applicationsearchdocument'
+FTS_TABLE = 'applications_search_fts'
+
+
+def document_text(application, profile, user, institution, course):
+    # frozen copy of applications.search.document_text as of this migration
+    parts = []
+    if user is not None:
+        parts += [user.first_name, user.last_name, user.username, user.email]
+        parts += re.split(r"[@._+-]", user.email or "")
+    if profile is not None:
+        parts += [
+            profile.first_name, profile.surname, profile.nid_number,
+            profile.active_student_id, profile.current_district,
+            profile.origin_district, profile.residency_district,
+        ]
+    if institution is not None:
+        parts += [institution.name, institution.code]
+    if course is not None:
+        parts += [course.name, course.code]
+    parts += [
+        application.email, application.active_student_id,
+        application.origin_district, application.residency_district,
+    ]
+
+    seen = set()
+    words = []
+    for part in parts:
+        part = (part or "").strip()
+        if part and part.lower() not in seen:
+            seen.add(part.lower())
+            words.append(part)
+    return " ".join(words)
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute(
+            f"CREATE INDEX applications_search_body_fts ON {DOC_TABLE} "
+            f"USING GIN (to_tsvector('simple', body))"
+        )
+    elif vendor == 'sqlite':
+        # external-content FTS5 table: stores only the index, triggers keep it in step
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5("
+            f"body, content='{DOC_TABLE}', content_rowid='application_id')"
+        )
+        schema_editor.execute(
+            f"CREATE TRIGGER {FTS_TABLE}_ai AFTER INSERT ON {DOC_TABLE} BEGIN "
+            f"INSERT INTO {FTS_TABLE}(rowid, body) VALUES (new.application_id, new.body); END"
+        )
+        schema_editor.execute(
+            f"CREATE TRIGGER {FTS_TABLE}_ad AFTER DELETE ON {DOC_TABLE} BEGIN "
+            f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, body) VALUES ('delete', old.application_id, old.body); END"
+        )
+        schema_editor.execute(
+            f"CREATE TRIGGER {FTS_TABLE}_au AFTER UPDATE ON {DOC_TABLE} BEGIN "
+            f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, body) VALUES ('delete', old.application_id, old.body); "
+            f"INSERT INTO {FTS_TABLE}(rowid, body) VALUES (new.application_id, new.body); END"
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute("DROP INDEX IF EXISTS applications_search_body_fts")
+    elif vendor == 'sqlite':
+        for suffix in ('ai', 'ad', 'au'):
+            schema_editor.execute(f"DROP TRIGGER IF EXISTS {FTS_TABLE}_{suffix}")
+        schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+def build_search_documents(apps, schema_editor):
+    Application = apps.get_model('applications', 'Application')
+    ApplicationSearchDocument = apps.get_model('applications', 'ApplicationSearchDocument')
+    batch = []
+    applications = Application.objects.select_related('applicant__user', 'institution', 'course')
+    for application in applications.iterator(chunk_size=1000):
+        profile = application.applicant
+        body = document_text(application, profile, profile.user, application.institution, application.course)
+        batch.append(ApplicationSearchDocument(application_id=application.pk, body=body))
+        if len(batch) >= 1000:
+            ApplicationSearchDocument.objects.bulk_create(batch)
+            batch = []
+    if batch:
+        ApplicationSearchDocument.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0037_application_review_queue_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ApplicationSearchDocument',
+            fields=[
+                ('application', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='search_document', serialize=False, to='applications.application')),
+                ('body', models.TextField(blank=True)),
+            ],
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+        migrations.RunPython(build_search_documents, migrations.RunPython.noop),
+    ]
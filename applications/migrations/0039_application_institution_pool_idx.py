@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-18 00:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0038_applicationsearchdocument'),
+        ('institutions', '0013_alter_course_total_tuition_fee'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['institution', 'status', 'submission_date', 'id'], name='app_institution_pool_idx'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2 on 2026-10-17 23:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0039_application_institution_pool_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['applicant', 'is_continuing'], name='app_applicant_continuing_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(condition=models.Q(('is_continuing', True)), fields=['original_application', 'year_of_study'], name='app_continuation_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='applicationreview',
+            index=models.Index(fields=['application', '-created_at'], name='review_app_created_idx'),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2 on 2026-10-17 23:40
+
+from django.db import migrations, models
+
+
+def clear_snapshots(apps, schema_editor):
+    # the rows are a cache of all-time aggregates; the first dashboard hit rebuilds pk=1
+    apps.get_model('applications', 'DashboardSnapshot').objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0040_hot_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(clear_snapshots, migrations.RunPython.noop),
+        migrations.AlterModelOptions(
+            name='dashboardsnapshot',
+            options={},
+        ),
+        migrations.RemoveField(
+            model_name='dashboardsnapshot',
+            name='fiscal_year',
+        ),
+        migrations.RemoveField(
+            model_name='dashboardsnapshot',
+            name='is_stale',
+        ),
+        migrations.AlterField(
+            model_name='dashboardsnapshot',
+            name='version',
+            field=models.BigIntegerField(default=0),
+        ),
+    ]
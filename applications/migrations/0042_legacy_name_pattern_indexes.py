@@ -0,0 +1,21 @@
+# Generated by Django 5.2 on 2026-10-17 23:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0041_single_dashboard_snapshot'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='legacystudent',
+            index=models.Index(fields=['surname_norm'], name='legacy_surname_prefix_idx', opclasses=['varchar_pattern_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='legacystudent',
+            index=models.Index(fields=['first_name_norm'], name='legacy_first_name_pattern_idx', opclasses=['varchar_pattern_ops']),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2 on 2026-10-18 00:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0042_legacy_name_pattern_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='news',
+            index=models.Index(fields=['slug'], name='news_slug_pattern_idx', opclasses=['varchar_pattern_ops']),
+        ),
+    ]
@@ -1,12 +1,13 @@
 
 # applications/models.py (cleaned / fixes)
 from decimal import Decimal
+from difflib import SequenceMatcher
 from django.db import models, transaction
 from institutions.models import Institution, Course
 from django.conf import settings
 from django.urls import reverse
-from django.utils.text import slugify
-from django.db.models import Sum
+from django.db.models import Q, Sum
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 from django.dispatch import receiver
 from django.db.models.signals import post_save
@@ -14,12 +15,16 @@ from django.conf import settings
 from django.db.models import Sum
 from decimal import Decimal
 from django.contrib.auth import get_user_model
+from django.core.serializers.json import DjangoJSONEncoder
 from django import forms
+from utils.dirty import DirtyFieldsMixin
+from utils.slugs import UniqueSlugMixin
 from .validators import validate_upload
+from .utils import normalize_name
 
 User = get_user_model()
 
-class News(models.Model):
+class News(UniqueSlugMixin, models.Model):
     title = models.CharField(max_length=255)
     slug = models.SlugField(max_length=255, unique=True, blank=True)
     excerpt = models.CharField(max_length=500, blank=True)
@@ -41,27 +46,68 @@ class News(models.Model):
         ordering = ['-published', '-created_at']
         verbose_name = 'News'
         verbose_name_plural = 'News'
+        indexes = [
+            # LIKE 'base-%' lookups in utils.slugs.next_unique_slug (PostgreSQL)
+            models.Index(fields=['slug'], opclasses=['varchar_pattern_ops'], name='news_slug_pattern_idx'),
+        ]
 
     def __str__(self):
         return self.title
 
-    def save(self, *args, **kwargs):
-        if not self.slug:
-            base = slugify(self.title)[:200]
-            slug = base
-            counter = 1
-            while News.objects.filter(slug=slug).exclude(pk=self.pk).exists():
-                slug = f"{base}-{counter}"
-                counter += 1
-            self.slug = slug
-        super().save(*args, **kwargs)
-
     def get_absolute_url(self):
         return reverse('applications:news_detail', kwargs={'pk': self.pk})
 
+class LegacyStudentQuerySet(models.QuerySet):
+    def matching(self, first_name, surname, year_of_study=None):
+        """
+        Exact match on the normalized name columns (served by legacy_name_year_idx).
+        """
+        qs = self.filter(surname_norm=normalize_name(surname), first_name_norm=normalize_name(first_name))
+        if year_of_study:
+            qs = qs.filter(year_of_study=year_of_study)
+        return qs
+
+    def fuzzy_matching(self, first_name, surname, year_of_study=None, limit=5, cutoff=0.75):
+        """
+        Close matches for misspelled names, best first.
+
+        Candidates share the surname's first two letters, or have exactly the
+        given first name so a typo at the start of the surname still matches.
+        Both are prefix/equality lookups on the varchar_pattern_ops indexes.
+        Candidates are ranked in Python by difflib similarity on both names,
+        skipping any whose quick upper bound is already below cutoff.
+        """
+        first_norm = normalize_name(first_name)
+        surname_norm = normalize_name(surname)
+        if not surname_norm:
+            return []
+
+        near = Q(surname_norm__startswith=surname_norm[:2])
+        if first_norm:
+            near |= Q(first_name_norm=first_norm)
+        candidates = self.filter(near)
+        if year_of_study:
+            candidates = candidates.filter(year_of_study=year_of_study)
+
+        scored = []
+        for record in candidates:
+            surname_match = SequenceMatcher(None, surname_norm, record.surname_norm)
+            first_match = SequenceMatcher(None, first_norm, record.first_name_norm)
+            if (surname_match.quick_ratio() + first_match.quick_ratio()) / 2 < cutoff:
+                continue
+            score = (surname_match.ratio() + first_match.ratio()) / 2
+            if score >= cutoff:
+                scored.append((score, record))
+        scored.sort(key=lambda item: item[0], reverse=True)
+        return [record for _, record in scored[:limit]]
+
+
 class LegacyStudent(models.Model):
     first_name = models.CharField(max_length=100)
     surname = models.CharField(max_length=100)
+    # normalize_name() of the two fields above, filled on save / import
+    first_name_norm = models.CharField(max_length=100, blank=True, editable=False)
+    surname_norm = models.CharField(max_length=100, blank=True, editable=False)
     institution = models.CharField(max_length=200, blank=True)
     course = models.CharField(max_length=200, blank=True)
     # models.py (Application)
@@ -78,9 +124,31 @@ class LegacyStudent(models.Model):
 
     tuition_fee = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
 
+    objects = LegacyStudentQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['surname_norm', 'first_name_norm', 'year_of_study'], name='legacy_name_year_idx'),
+            # LIKE 'ab%' prefix scans for fuzzy_matching(); the default-collation
+            # btree above can't serve those on PostgreSQL (opclasses are PG-only)
+            models.Index(fields=['surname_norm'], opclasses=['varchar_pattern_ops'], name='legacy_surname_prefix_idx'),
+            models.Index(fields=['first_name_norm'], opclasses=['varchar_pattern_ops'], name='legacy_first_name_pattern_idx'),
+        ]
+        constraints = [
+            # import key, as the old update_or_create importer matched it (exact
+            # names) plus where the student was enrolled, so namesakes stay apart;
+            # re-importing a record updates its year and tuition in place
+            models.UniqueConstraint(fields=['first_name', 'surname', 'institution', 'course'], name='legacy_unique_record'),
+        ]
+
     def __str__(self):
         return f"{self.first_name} {self.surname}"
 
+    def save(self, *args, **kwargs):
+        self.first_name_norm = normalize_name(self.first_name)
+        self.surname_norm = normalize_name(self.surname)
+        super().save(*args, **kwargs)
+
 class ApplicantProfile(models.Model):
     user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
     postal_address = models.TextField(blank=True)
@@ -149,7 +217,87 @@ class ApplicantProfile(models.Model):
         return self.user.get_full_name() or self.user.username
 
 
-class Application(models.Model):
+class ApplicationQuerySet(models.QuerySet):
+    def with_payment_totals(self):
+        """
+        Annotate paid_sum / committed_sum so total_paid, total_committed,
+        outstanding_balance and payment_status need no per-row query.
+        """
+        from finance.models import Payment
+        return self.annotate(
+            paid_sum=Coalesce(
+                Sum('payments__amount', filter=Q(payments__status=Payment.STATUS_PAID)),
+                Decimal('0.00'),
+            ),
+            committed_sum=Coalesce(
+                Sum('payments__amount', filter=Q(payments__status=Payment.STATUS_COMMITTED)),
+                Decimal('0.00'),
+            ),
+        )
+
+    def bulk_set_status(self, ids, status, reviewer=None, note=None, notify=True):
+        """
+        Application.set_status() for many applications at once: one UPDATE,
+        one bulk INSERT of ApplicationReview rows and one batched notification
+        enqueue, with the same audit trail (a review per changed application;
+        applications already in the target status are left alone).
+
+        Returns the created reviews.
+        """
+        status = Application.normalize_status(status)
+        review_status = Application.review_status_for(status)
+
+        with transaction.atomic():
+            applications = list(
+                self.filter(pk__in=ids)
+                .exclude(status=status)
+                .select_related('applicant__user')
+                .select_for_update(of=('self',))
+            )
+            if not applications:
+                return []
+
+            changes = {'status': status, 'updated_at': timezone.now()}
+            if note:
+                changes['reviewer_note'] = note
+            Application.objects.filter(pk__in=[app.pk for app in applications]).update(**changes)
+
+            decided = review_status in (ApplicationReview.STATUS_APPROVED, ApplicationReview.STATUS_REJECTED)
+            reviews = ApplicationReview.objects.bulk_create([
+                ApplicationReview(
+                    application=app,
+                    reviewer=reviewer,
+                    note=note or f"Status changed to {status}",
+                    status=review_status,
+                    # ApplicationReview.save() is bypassed, so stamp it here
+                    decision_date=changes['updated_at'] if decided else None,
+                )
+                for app in applications
+            ], batch_size=500)
+
+            # what the per-row post_save receivers would have done
+            if notify:
+                from .notifications import queue_application_status_events
+                queue_application_status_events(reviews)
+            from .dashboard import schedule_dashboard_refresh
+            from .public_cache import schedule_public_bump
+            from institutions.pools import schedule_ledger_bump
+            schedule_dashboard_refresh()
+            schedule_public_bump("stats")
+            schedule_ledger_bump(*{app.institution_id for app in applications})
+
+        return reviews
+
+    def search(self, term):
+        """
+        Applications whose search document matches every word of term
+        (see applications/search.py).
+        """
+        from .search import search_applications
+        return search_applications(self, term)
+
+
+class Application(DirtyFieldsMixin, models.Model):
     STATUS_PENDING = 'PENDING'
     STATUS_APPROVED = 'APPROVED'
     STATUS_REJECTED = 'REJECTED'
@@ -247,9 +395,27 @@ class Application(models.Model):
     submission_date = models.DateTimeField(auto_now_add=True)
     last_cycle_started_at = models.DateTimeField(null=True, blank=True)
 
+    objects = ApplicationQuerySet.as_manager()
+
     class Meta:
         ordering = ['-submission_date']
         permissions = [("view_financials", "Can view financial details for applications")]
+        indexes = [
+            # keyset pagination of the officer queues (utils/pagination.py):
+            # equality on status / is_continuing, then range on the cursor keys
+            models.Index(fields=['status', 'is_continuing', 'submission_date', 'id'], name='app_review_queue_idx'),
+            models.Index(fields=['submission_date', 'id'], name='app_submitted_idx'),
+            # institution pool pages (institutions/pools.py); also serves (institution, status)
+            models.Index(fields=['institution', 'status', 'submission_date', 'id'], name='app_institution_pool_idx'),
+            # a student's new / continuing application (dashboards, create views)
+            models.Index(fields=['applicant', 'is_continuing'], name='app_applicant_continuing_idx'),
+            # "does this application already have a year N continuation?" (rollover.py)
+            models.Index(
+                fields=['original_application', 'year_of_study'],
+                condition=Q(is_continuing=True),
+                name='app_continuation_idx',
+            ),
+        ]
 
     def __str__(self):
         username = getattr(self.applicant, 'user', None)
@@ -268,21 +434,41 @@ class Application(models.Model):
         latest = self.reviews.order_by("-created_at").first()
         return latest.status if latest else self.status
 
+    def _payment_totals(self):
+        """
+        Paid/committed sums for this application, memoized on the instance.
+        Uses the with_payment_totals() annotation when present, otherwise one
+        aggregate query covers both sums. Payment.save()/delete() clear the
+        memo on the application instance they were loaded with; any other
+        instance of the same row keeps its sums until clear_payment_totals().
+        """
+        totals = self.__dict__.get('_payment_totals_cache')
+        if totals is None:
+            if 'paid_sum' in self.__dict__ and 'committed_sum' in self.__dict__:
+                totals = {'paid': self.paid_sum, 'committed': self.committed_sum}
+            else:
+                from finance.models import Payment
+                totals = Payment.objects.filter(application=self).aggregate(
+                    paid=Sum('amount', filter=Q(status=Payment.STATUS_PAID)),
+                    committed=Sum('amount', filter=Q(status=Payment.STATUS_COMMITTED)),
+                )
+            totals = {k: Decimal(v or Decimal("0.00")) for k, v in totals.items()}
+            self._payment_totals_cache = totals
+        return totals
+
+    def clear_payment_totals(self):
+        self.__dict__.pop('_payment_totals_cache', None)
+        # a stale annotation would otherwise be picked up again
+        self.__dict__.pop('paid_sum', None)
+        self.__dict__.pop('committed_sum', None)
+
     @property
     def total_paid(self):
-        from finance.models import Payment
-        return Payment.objects.filter(
-            application=self,
-            status=Payment.STATUS_PAID
-        ).aggregate(total=Sum("amount"))["total"] or Decimal("0.00")
+        return self._payment_totals()['paid']
 
     @property
     def total_committed(self):
-        from finance.models import Payment
-        return Payment.objects.filter(
-            application=self,
-            status=Payment.STATUS_COMMITTED
-        ).aggregate(total=Sum("amount"))["total"] or Decimal("0.00")
+        return self._payment_totals()['committed']
 
 
     @property
@@ -306,11 +492,22 @@ class Application(models.Model):
             return "Partially Paid"
         return "Unpaid"
 
+    @classmethod
+    def normalize_status(cls, status):
+        status = str(status).upper()
+        if status not in {k for k, _ in cls.STATUS_CHOICES}:
+            raise ValueError(f"Invalid status: {status}")
+        return status
+
+    @classmethod
+    def review_status_for(cls, status):
+        return {
+            cls.STATUS_APPROVED: ApplicationReview.STATUS_APPROVED,
+            cls.STATUS_REJECTED: ApplicationReview.STATUS_REJECTED,
+        }.get(status, ApplicationReview.STATUS_PENDING)
+
     def set_status(self, new_status, reviewer=None, note=None, notify=True):
-        new_status = str(new_status).upper()
-        valid_keys = {k for k, _ in self.STATUS_CHOICES}
-        if new_status not in valid_keys:
-            raise ValueError(f"Invalid status: {new_status}")
+        new_status = self.normalize_status(new_status)
 
         old_status = self.status
         if old_status == new_status:
@@ -322,49 +519,52 @@ class Application(models.Model):
                 self.reviewer_note = note
             self.save(update_fields=['status', 'reviewer_note', 'updated_at'])
 
-            review_status = {
-                self.STATUS_APPROVED: ApplicationReview.STATUS_APPROVED,
-                self.STATUS_REJECTED: ApplicationReview.STATUS_REJECTED,
-            }.get(new_status, ApplicationReview.STATUS_PENDING)
-
             review = ApplicationReview.objects.create(
                 application=self,
                 reviewer=reviewer,
                 note=note or f"Status changed to {new_status}",
-                status=review_status
+                status=self.review_status_for(new_status)
             )
 
         return review
 
-    def can_start_continuing_cycle(self):
+    def continuing_year(self):
+        """
+        Year of study a continuation would start in, or None when this
+        application cannot roll over (no database access).
+        """
         if not self.course or not self.year_of_study:
-            return False
+            return None
         if self.status != self.STATUS_APPROVED:
-            return False
+            return None
         max_years = getattr(self.course, 'years_of_study', None)
         if max_years is not None and self.year_of_study >= max_years:
-            return False
-        next_year = self.year_of_study + 1
-        exists = Application.objects.filter(
+            return None
+        return self.year_of_study + 1
+
+    def _continuation_for(self, year):
+        return Application.objects.filter(
             original_application=self,
             is_continuing=True,
-            year_of_study=next_year
-        ).exists()
-        return not exists
+            year_of_study=year
+        )
+
+    def can_start_continuing_cycle(self):
+        next_year = self.continuing_year()
+        return next_year is not None and not self._continuation_for(next_year).exists()
 
     def create_continuing_application(self, when=None):
+        """
+        Single-application rollover; batches go through applications.rollover.
+        """
         if when is None:
             when = timezone.now()
-        if not self.can_start_continuing_cycle():
+        next_year = self.continuing_year()
+        if next_year is None:
             return None
 
-        next_year = self.year_of_study + 1
         with transaction.atomic():
-            existing = Application.objects.filter(
-                original_application=self,
-                is_continuing=True,
-                year_of_study=next_year
-            ).first()
+            existing = self._continuation_for(next_year).first()
             if existing:
                 return existing
 
@@ -433,7 +633,81 @@ class ApplicationConfig(models.Model):
         return bool(self.rollover_at and timezone.now() >= self.rollover_at)
 
 
-class ApplicationReview(models.Model):
+class DashboardSnapshot(models.Model):
+    """
+    Precomputed officer-dashboard aggregates (a single row, pk=1).
+    Rebuilt in the background after writes that can move the numbers
+    (see applications/dashboard.py).
+    """
+    data = models.JSONField(default=dict, encoder=DjangoJSONEncoder)
+    # the dashboard data version (a time_ns stamp) the data was computed from
+    version = models.BigIntegerField(default=0)
+    refreshed_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"Dashboard snapshot ({self.refreshed_at or 'never built'})"
+
+
+class OutboundEvent(models.Model):
+    """
+    SwiftMassive event waiting to be sent. Rows are written in the same
+    transaction as the change that triggers them and flushed in batches by
+    applications.notifications; each row keeps its own retry state.
+    """
+    STATUS_PENDING = 'PENDING'
+    STATUS_SENDING = 'SENDING'
+    STATUS_SENT = 'SENT'
+    STATUS_FAILED = 'FAILED'
+
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_SENDING, 'Sending'),
+        (STATUS_SENT, 'Sent'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    email = models.EmailField()
+    event_name = models.CharField(max_length=100)
+    data = models.JSONField(default=dict, blank=True, encoder=DjangoJSONEncoder)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='outboundevent_due_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.event_name} -> {self.email} [{self.status}]"
+
+    def as_payload(self):
+        event = {"name": self.event_name, "email": self.email}
+        if self.data:
+            event.update(self.data)
+        return event
+
+
+class ApplicationSearchDocument(models.Model):
+    """
+    Denormalized search text for one application; built and queried by
+    applications.search.
+    """
+    application = models.OneToOneField(
+        Application, on_delete=models.CASCADE, primary_key=True, related_name='search_document'
+    )
+    body = models.TextField(blank=True)
+
+    def __str__(self):
+        return f"Search document for application {self.application_id}"
+
+
+class ApplicationReview(DirtyFieldsMixin, models.Model):
     STATUS_PENDING = 'pending'
     STATUS_APPROVED = 'approved'
     STATUS_REJECTED = 'rejected'
@@ -458,6 +732,10 @@ class ApplicationReview(models.Model):
         ordering = ['-created_at']
         verbose_name = "Application Review"
         verbose_name_plural = "Application Reviews"
+        indexes = [
+            # latest review of an application, without a sort
+            models.Index(fields=['application', '-created_at'], name='review_app_created_idx'),
+        ]
         #unique_together = ('application', 'reviewer')
 
     def save(self, *args, **kwargs):
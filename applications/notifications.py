@@ -0,0 +1,267 @@
+# applications/notifications.py
+"""
+Batched SwiftMassive event dispatch.
+
+queue_event() writes an OutboundEvent row inside the caller's transaction
+(so a rolled-back status change never emails anyone) and, once committed,
+makes sure a flush is coming: immediately when SWIFTMASSIVE_BATCH_SIZE
+events are waiting, otherwise after SWIFTMASSIVE_FLUSH_INTERVAL seconds.
+
+flush_events() sends due rows in batches of up to SWIFTMASSIVE_BATCH_SIZE
+per API call. If the API rejects a whole batch with a 4xx, the batch is
+re-sent one event at a time so a single bad address does not hold back the
+rest. Failed rows are retried on their own exponential backoff until
+SWIFTMASSIVE_MAX_ATTEMPTS, then left FAILED for inspection in the admin.
+
+purge_events() deletes SENT rows after SWIFTMASSIVE_SENT_RETENTION_DAYS
+(their data holds verification tokens) and FAILED rows, once there has been
+time to review and retry them, after SWIFTMASSIVE_FAILED_RETENTION_DAYS.
+The flush task runs it at most once per PURGE_INTERVAL.
+"""
+import logging
+from datetime import timedelta
+
+import requests
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q
+from django.urls import reverse
+from django.utils import timezone
+
+from .models import OutboundEvent
+from .utils import send_swiftmassive_events
+
+logger = logging.getLogger(__name__)
+
+FLUSH_SCHEDULED_KEY = "swiftmassive:flush_scheduled"
+QUEUED_COUNT_KEY = "swiftmassive:queued_count"
+PURGE_DONE_KEY = "swiftmassive:purged"
+PURGE_INTERVAL = 60 * 60  # seconds
+PURGE_CHUNK_SIZE = 1000
+
+# a SENDING row older than this was lost with its worker and is picked up again
+SENDING_TIMEOUT = timedelta(minutes=10)
+
+
+def batch_size():
+    return max(1, int(getattr(settings, "SWIFTMASSIVE_BATCH_SIZE", 50)))
+
+
+def flush_interval():
+    return int(getattr(settings, "SWIFTMASSIVE_FLUSH_INTERVAL", 10))
+
+
+def max_attempts():
+    return int(getattr(settings, "SWIFTMASSIVE_MAX_ATTEMPTS", 5))
+
+
+def retry_backoff():
+    return int(getattr(settings, "SWIFTMASSIVE_RETRY_BACKOFF", 60))
+
+
+def sent_retention():
+    return timedelta(days=int(getattr(settings, "SWIFTMASSIVE_SENT_RETENTION_DAYS", 7)))
+
+
+def failed_retention():
+    return timedelta(days=int(getattr(settings, "SWIFTMASSIVE_FAILED_RETENTION_DAYS", 30)))
+
+
+# ---------- Queueing ----------
+
+def queue_event(email, event_name, data=None):
+    """
+    Buffer one SwiftMassive event for batched delivery.
+    """
+    if not email:
+        logger.warning("Skipping %s event with no email address", event_name)
+        return None
+    event = OutboundEvent.objects.create(email=email, event_name=event_name, data=data or {})
+    transaction.on_commit(schedule_flush)
+    return event
+
+
+def queue_events(events):
+    """
+    Buffer many (email, event_name, data) events with one INSERT.
+    """
+    rows = []
+    for email, event_name, data in events:
+        if not email:
+            logger.warning("Skipping %s event with no email address", event_name)
+            continue
+        rows.append(OutboundEvent(email=email, event_name=event_name, data=data or {}))
+    if rows:
+        OutboundEvent.objects.bulk_create(rows, batch_size=500)
+        transaction.on_commit(lambda: schedule_flush(len(rows)))
+    return rows
+
+
+def schedule_flush(count=1):
+    """
+    Flush now if a full batch is waiting, otherwise make sure one timed
+    flush is pending. Both counters live in the cache and are only hints:
+    flushing is safe to run concurrently and at any time.
+    """
+    from .tasks import flush_outbound_events
+
+    cache.add(QUEUED_COUNT_KEY, 0, timeout=None)
+    try:
+        queued = cache.incr(QUEUED_COUNT_KEY, count)
+    except ValueError:
+        queued = count
+
+    if queued >= batch_size():
+        cache.set(QUEUED_COUNT_KEY, 0, timeout=None)
+        flush_outbound_events.delay()
+    elif cache.add(FLUSH_SCHEDULED_KEY, 1, timeout=flush_interval()):
+        flush_outbound_events.apply_async(countdown=flush_interval())
+
+
+def application_status_payload(review):
+    user = review.application.applicant.user
+    return user.email, "application_status_update", {
+        "first_name": user.first_name or user.username,
+        "current_status": review.status,
+        "login_url": f"{settings.SITE_URL.rstrip('/')}{reverse('applications:user_dashboard')}",
+    }
+
+
+def queue_application_status_event(review):
+    email, event_name, data = application_status_payload(review)
+    return queue_event(email, event_name, data)
+
+
+def queue_application_status_events(reviews):
+    """
+    Batched queue_application_status_event(); each review needs
+    application.applicant.user loaded.
+    """
+    return queue_events(application_status_payload(review) for review in reviews)
+
+
+# ---------- Flushing ----------
+
+def _claim_batch(size):
+    now = timezone.now()
+    due = (
+        Q(status=OutboundEvent.STATUS_PENDING, next_attempt_at__lte=now)
+        | Q(status=OutboundEvent.STATUS_SENDING, updated_at__lt=now - SENDING_TIMEOUT)
+    )
+    with transaction.atomic():
+        events = list(
+            OutboundEvent.objects.select_for_update(skip_locked=True)
+            .filter(due)
+            .order_by("id")[:size]
+        )
+        if events:
+            OutboundEvent.objects.filter(pk__in=[e.pk for e in events]).update(
+                status=OutboundEvent.STATUS_SENDING, updated_at=now
+            )
+    return events
+
+
+def _send(events):
+    """
+    Send events and return [(event, error)] for the ones that failed.
+    """
+    try:
+        send_swiftmassive_events([e.as_payload() for e in events])
+        return []
+    except requests.exceptions.RequestException as exc:
+        status = getattr(getattr(exc, "response", None), "status_code", None)
+        if len(events) > 1 and status and 400 <= status < 500 and status != 429:
+            logger.warning("SwiftMassive rejected a batch of %s (%s); retrying events one by one", len(events), status)
+            failures = []
+            for event in events:
+                failures.extend(_send([event]))
+            return failures
+        return [(event, str(exc)) for event in events]
+
+
+def _record_results(events, failures):
+    now = timezone.now()
+    failed_ids = {event.pk for event, _ in failures}
+    sent_ids = [event.pk for event in events if event.pk not in failed_ids]
+    if sent_ids:
+        OutboundEvent.objects.filter(pk__in=sent_ids).update(
+            status=OutboundEvent.STATUS_SENT, sent_at=now, updated_at=now, last_error=""
+        )
+
+    retry_at = None
+    for event, error in failures:
+        event.attempts += 1
+        event.last_error = error[:2000]
+        if event.attempts >= max_attempts():
+            event.status = OutboundEvent.STATUS_FAILED
+            logger.error("Giving up on %s after %s attempts: %s", event, event.attempts, error)
+        else:
+            event.status = OutboundEvent.STATUS_PENDING
+            event.next_attempt_at = now + timedelta(seconds=retry_backoff() * 2 ** (event.attempts - 1))
+            retry_at = min(retry_at or event.next_attempt_at, event.next_attempt_at)
+        event.save(update_fields=["attempts", "last_error", "status", "next_attempt_at", "updated_at"])
+    return len(sent_ids), retry_at
+
+
+def flush_events(max_batches=None):
+    """
+    Send every due event, batch by batch.
+
+    Returns {"sent", "failed", "batches", "retry_in"}; retry_in is the number
+    of seconds until the earliest failed event is due again (None if none).
+    """
+    cache.set(QUEUED_COUNT_KEY, 0, timeout=None)
+    size = batch_size()
+    sent = failed = batches = 0
+    retry_at = None
+
+    while max_batches is None or batches < max_batches:
+        events = _claim_batch(size)
+        if not events:
+            break
+        batches += 1
+        failures = _send(events)
+        ok, batch_retry_at = _record_results(events, failures)
+        sent += ok
+        failed += len(failures)
+        if batch_retry_at:
+            retry_at = min(retry_at or batch_retry_at, batch_retry_at)
+        if len(events) < size:
+            break
+
+    retry_in = None
+    if retry_at:
+        retry_in = max(1, int((retry_at - timezone.now()).total_seconds()))
+    if sent or failed:
+        logger.info("SwiftMassive flush: %s sent, %s failed in %s batch(es)", sent, failed, batches)
+    return {"sent": sent, "failed": failed, "batches": batches, "retry_in": retry_in}
+
+
+# ---------- Retention ----------
+
+def purge_events(now=None):
+    """
+    Delete SENT and FAILED rows past their retention period, in chunks so a
+    large backlog never holds one long DELETE. Returns the number deleted.
+    """
+    now = now or timezone.now()
+    expired = OutboundEvent.objects.filter(
+        Q(status=OutboundEvent.STATUS_SENT, sent_at__lt=now - sent_retention())
+        | Q(status=OutboundEvent.STATUS_FAILED, updated_at__lt=now - failed_retention())
+    )
+    deleted = 0
+    while True:
+        ids = list(expired.order_by().values_list("pk", flat=True)[:PURGE_CHUNK_SIZE])
+        if not ids:
+            break
+        deleted += OutboundEvent.objects.filter(pk__in=ids).delete()[0]
+    if deleted:
+        logger.info("Purged %s old SwiftMassive event(s)", deleted)
+    return deleted
+
+
+def purge_events_if_due():
+    if cache.add(PURGE_DONE_KEY, 1, timeout=PURGE_INTERVAL):
+        return purge_events()
+    return 0
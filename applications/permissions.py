@@ -2,16 +2,18 @@
 
 from django.contrib.auth.decorators import user_passes_test
 
+from utils.roles import has_any_group
+
 def can_view_selection_media(user) -> bool:
     if not user.is_authenticated:
         return False
     if user.is_superuser or user.is_staff:
         return True
-    return user.groups.filter(name="Scholarship Officers").exists()
+    return has_any_group(user, "Scholarship Officers")
 
 def can_view_documents(user) -> bool:
     if not user.is_authenticated:
         return False
     if user.is_superuser or user.is_staff:
         return True
-    return user.groups.filter(name="Scholarship Officers").exists()
+    return has_any_group(user, "Scholarship Officers")
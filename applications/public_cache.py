@@ -0,0 +1,198 @@
+# applications/public_cache.py
+"""
+Cache layer for the public pages (home, news, FAQ, terms, privacy).
+
+Each content section has a version number in the cache ("news", "faq",
+"policy", "stats"). signals.py bumps a section after commit when one of its
+rows is saved or deleted; everything cached for that section is keyed on
+the version, so it is never read again after a change.
+
+  - page data (news pages, FAQ list, policy pages, home counters) is cached
+    per version for every visitor, so warm pages make no queries
+  - @public_page caches whole responses for anonymous visitors, keyed on
+    the path and the query params the view reads, and answers
+    If-None-Match / If-Modified-Since with 304 Not Modified
+
+The home counters change with every submission, so they are recomputed at
+most once per STATS_MIN_AGE however often the stats version is bumped.
+"""
+import hashlib
+import re
+import time
+from functools import wraps
+
+from django.contrib.messages import get_messages
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Q
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+
+PUBLIC_PAGE_TTL = 60 * 60 * 24  # versioned keys; the TTL only reclaims memory
+STATS_MIN_AGE = 60
+STATS_TTL = 10 * 60  # bounds staleness for writes that bypass signals (bulk updates)
+
+VERSION_KEY = "public_page_version:{}"
+DATA_KEY = "public_page_data:{}:{}:{}"
+RESPONSE_KEY = "public_page_response:{}:{}"
+STATS_KEY = "public_page_stats"
+
+# values of the params a public_page view reads that get a cached response
+PARAM_VALUE_RE = re.compile(r"^[0-9]{1,4}$")
+
+
+# ---------- section versions ----------
+def section_versions(*sections):
+    """
+    {section: version}. Versions are time.time_ns() stamps of the last
+    change, so they double as Last-Modified.
+    """
+    keys = {section: VERSION_KEY.format(section) for section in sections}
+    found = cache.get_many(list(keys.values()))
+    versions = {}
+    for section, key in keys.items():
+        if key not in found:
+            cache.add(key, time.time_ns(), timeout=None)
+            found[key] = cache.get(key)
+        versions[section] = found[key]
+    return versions
+
+
+def bump_public_version(*sections):
+    now = time.time_ns()
+    cache.set_many({VERSION_KEY.format(section): now for section in sections}, timeout=None)
+
+
+def schedule_public_bump(*sections):
+    transaction.on_commit(lambda: bump_public_version(*sections))
+
+
+def cached_section_data(section, name, build, timeout=PUBLIC_PAGE_TTL):
+    """
+    build() cached under the section's current version. None is not cached.
+    """
+    key = DATA_KEY.format(section, section_versions(section)[section], name)
+    data = cache.get(key)
+    if data is None:
+        data = build()
+        if data is not None:
+            cache.set(key, data, timeout=timeout)
+    return data
+
+
+# ---------- home counters ----------
+def compute_public_stats():
+    from .models import Application
+    counts = Application.objects.aggregate(
+        total_applicants=Count('id'),
+        total_awarded=Count('id', filter=Q(status=Application.STATUS_APPROVED)),
+    )
+    institution_stats = list(
+        Application.objects
+        .values('institution__name')
+        .annotate(
+            applicants=Count('id'),
+            awarded=Count('id', filter=Q(status=Application.STATUS_APPROVED))
+        )
+        .order_by('-applicants')
+    )
+    return {**counts, 'institution_stats': institution_stats}
+
+
+def public_stats():
+    """
+    Home page counters. A stored result is reused while it matches the
+    stats version, or for STATS_MIN_AGE seconds after a bump.
+    """
+    version = section_versions("stats")["stats"]
+    entry = cache.get(STATS_KEY)
+    if entry is None or (entry["version"] != version and time.time() - entry["computed_at"] >= STATS_MIN_AGE):
+        entry = {"version": version, "computed_at": time.time(), "stats": compute_public_stats()}
+        cache.set(STATS_KEY, entry, timeout=STATS_TTL)
+    return entry
+
+
+# ---------- whole responses ----------
+def _has_messages(request):
+    # len() loads the messages without marking them as shown
+    return len(get_messages(request)) > 0
+
+
+def _page_key(request, params):
+    """
+    request.path plus the query parameters the view reads, or None when one
+    of them has a value the response cache won't key on (anything but a
+    short number). Other parameters are ignored, so ?anything=random maps
+    to the same entry instead of a new one.
+    """
+    parts = [request.path]
+    for name in params:
+        value = request.GET.get(name)
+        if value is None:
+            continue
+        if not PARAM_VALUE_RE.match(value):
+            return None
+        parts.append(f"{name}={value}")
+    return "?".join(parts)
+
+
+def public_page(*sections, validator=None, params=()):
+    """
+    View decorator for public pages built only from the given sections.
+
+    For anonymous GET/HEAD requests the response gets an ETag and
+    Last-Modified derived from the section versions (plus validator(), which
+    returns an extra (token, unix_time) pair, e.g. for the home counters),
+    conditional requests get a 304, and the rendered response is cached per
+    path and the query params the view reads (e.g. params=("page",)).
+    Logged-in users and requests carrying flash messages get the view as-is,
+    since base.html renders them per user.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapped(request, *args, **kwargs):
+            page_key = _page_key(request, params)
+            if (
+                request.method not in ("GET", "HEAD")
+                or request.user.is_authenticated
+                or page_key is None
+                or _has_messages(request)
+            ):
+                return view(request, *args, **kwargs)
+
+            versions = section_versions(*sections)
+            tokens = [f"{section}.{versions[section]}" for section in sections]
+            stamps = [versions[section] / 1e9 for section in sections]
+            if validator is not None:
+                token, stamp = validator()
+                tokens.append(token)
+                stamps.append(stamp)
+            etag = hashlib.md5(f"{page_key}|{'|'.join(tokens)}".encode()).hexdigest()
+            last_modified = int(max(stamps)) if stamps else None
+
+            response = get_conditional_response(request, etag=quote_etag(etag), last_modified=last_modified)
+            if response is None:
+                key = RESPONSE_KEY.format(view.__module__ + "." + view.__name__, etag)
+                response = cache.get(key)
+                if response is None:
+                    response = view(request, *args, **kwargs)
+                    if hasattr(response, "render") and callable(response.render):
+                        response = response.render()
+                    if response.status_code == 200 and not response.streaming and not response.cookies:
+                        cache.set(key, response, timeout=PUBLIC_PAGE_TTL)
+
+            if response.status_code in (200, 304):
+                response["ETag"] = quote_etag(etag)
+                if last_modified:
+                    response["Last-Modified"] = http_date(last_modified)
+                # revalidate on every use; the 304 costs a few cache reads
+                patch_cache_control(response, public=True, max_age=0)
+                patch_vary_headers(response, ("Cookie",))
+            return response
+        return wrapped
+    return decorator
+
+
+def stats_validator():
+    entry = public_stats()
+    return f"stats.{entry['version']}.{entry['computed_at']}", entry["computed_at"]
@@ -1,23 +1,126 @@
+# applications/r2.py
+"""
+Signed GET URLs for private documents in the Cloudflare R2 bucket.
+
+One boto3 client is built per process (again after a fork) and shared by
+all threads (botocore clients are thread-safe; only their construction is
+slow). Signed URLs are cached per (key, expiry, time bucket): every view
+inside the same bucket gets the same URL, and each URL is signed to outlive
+its bucket by a full expiry period, so a cached URL is always valid for at
+least `expiry` seconds.
+"""
+import hashlib
+import os
+import threading
+import time
+
 import boto3
 from botocore.client import Config
 from django.conf import settings
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+
+SIGNED_URL_CACHE_PREFIX = "r2_signed_url:"
+
+# Application file fields shown to officers, in display order
+APPLICATION_DOCUMENT_FIELDS = (
+    "documents_pdf",
+    "grade_12_certificate",
+    "transcript",
+    "acceptance_letter",
+    "school_fee_structure",
+    "id_card",
+    "character_reference_1",
+    "character_reference_2",
+    "statdec",
+)
+
+_client = None
+_client_pid = None
+_client_lock = threading.Lock()
+
+
+def get_r2_client():
+    """
+    Return this process's boto3 client.
+
+    Keyed on the pid, like utils.http.get_session(), so gunicorn/Celery
+    children forked after first use build their own connection pool
+    instead of sharing the parent's.
+    """
+    global _client, _client_pid
+    pid = os.getpid()
+    if _client is None or _client_pid != pid:
+        with _client_lock:
+            if _client is None or _client_pid != pid:
+                _client = boto3.client(
+                    "s3",
+                    endpoint_url=settings.AWS_S3_ENDPOINT_URL,
+                    aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+                    aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+                    region_name="auto",
+                    config=Config(signature_version="s3v4"),
+                )
+                _client_pid = pid
+    return _client
+
+
+def _cache_key(key, expiry, bucket):
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+    return f"{SIGNED_URL_CACHE_PREFIX}{expiry}:{bucket}:{digest}"
+
+
+def generate_signed_urls(keys, expiry=300):
+    """
+    Return {key: signed_url} for keys, signing only those not cached for
+    the current time bucket.
+    """
+    keys = [k for k in dict.fromkeys(keys) if k]
+    if not keys:
+        return {}
+
+    now = time.time()
+    bucket = int(now // expiry)
+    bucket_ends = (bucket + 1) * expiry
+    cache_keys = {key: _cache_key(key, expiry, bucket) for key in keys}
+
+    cached = cache.get_many(list(cache_keys.values()))
+    urls = {key: cached[ck] for key, ck in cache_keys.items() if ck in cached}
+
+    missing = [key for key in keys if key not in urls]
+    if missing:
+        client = get_r2_client()
+        expires_in = int(bucket_ends + expiry - now)
+        fresh = {
+            key: client.generate_presigned_url(
+                "get_object",
+                Params={"Bucket": settings.AWS_STORAGE_BUCKET_NAME, "Key": key},
+                ExpiresIn=expires_in,
+            )
+            for key in missing
+        }
+        cache.set_many(
+            {cache_keys[key]: url for key, url in fresh.items()},
+            timeout=max(1, int(bucket_ends - now)),
+        )
+        urls.update(fresh)
+
+    return urls
 
 
 def generate_signed_url(key, expiry=300):
-    client = boto3.client(
-        "s3",
-        endpoint_url=settings.AWS_S3_ENDPOINT_URL,
-        aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-        aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-        region_name="auto",
-        config=Config(signature_version="s3v4"),
-    )
-
-    return client.generate_presigned_url(
-        "get_object",
-        Params={
-            "Bucket": settings.AWS_STORAGE_BUCKET_NAME,
-            "Key": key,
-        },
-        ExpiresIn=expiry,
-    )
+    return generate_signed_urls([key], expiry=expiry)[key]
+
+
+def sign_application_documents(application, fields=APPLICATION_DOCUMENT_FIELDS, expiry=300):
+    """
+    Signed URLs for all of an application's uploaded documents in one call:
+    {field_name: url} for each non-empty file field.
+    """
+    files = {name: getattr(application, name, None) for name in fields}
+    files = {name: f for name, f in files.items() if f}
+    if not hasattr(default_storage, "bucket_name"):
+        # local FileSystemStorage (development): nothing to sign
+        return {name: f.url for name, f in files.items()}
+    urls = generate_signed_urls([f.name for f in files.values()], expiry=expiry)
+    return {name: urls[f.name] for name, f in files.items()}
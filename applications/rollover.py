@@ -0,0 +1,198 @@
+# applications/rollover.py
+"""
+Set-based continuing-cycle rollover (used by start_continuing_cycle).
+
+Eligible APPROVED applications are walked in primary-key chunks. Each
+chunk runs in its own transaction and costs a fixed number of statements,
+whatever its size:
+
+  1. SELECT ... FOR UPDATE the chunk (with the course length)
+  2. SELECT the continuations that already exist for it
+  3. UPDATE final-year rows to GRADUATING
+  4. bulk INSERT the new continuing applications
+  5. UPDATE last_cycle_started_at on the originals
+
+A run is safe to repeat: graduated rows drop out of the APPROVED filter
+and existing continuations are skipped. An interrupted run can also be
+resumed from the last committed chunk with after_id (reported per chunk).
+"""
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+from django.db import transaction
+from django.db.models import F
+
+from .models import Application
+
+ROLLOVER_CHUNK_SIZE = 500
+
+
+class RolloverReport:
+    """
+    Counters and per-phase timings (seconds) of one rollover run.
+    """
+
+    PHASES = ("select", "existing", "graduate", "create", "stamp", "reindex")
+
+    def __init__(self):
+        self.processed = 0
+        self.created = 0
+        self.graduating = 0
+        self.existing = 0
+        self.incomplete = 0
+        self.chunks = 0
+        self.last_id = None
+        self.timings = defaultdict(float)
+        self.started = time.perf_counter()
+
+    @property
+    def skipped(self):
+        return self.graduating + self.existing + self.incomplete
+
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    @contextmanager
+    def timed(self, phase):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[phase] += time.perf_counter() - start
+
+    def lines(self):
+        yield f"Processed: {self.processed} in {self.chunks} chunk(s), {self.elapsed:.2f}s"
+        yield f"Created (or would create in dry-run): {self.created}"
+        yield (
+            f"Skipped: {self.skipped} (graduating {self.graduating}, "
+            f"continuation exists {self.existing}, missing course/year {self.incomplete})"
+        )
+        yield "Timings: " + ", ".join(f"{phase} {self.timings[phase]:.3f}s" for phase in self.PHASES)
+
+
+def eligible_applications(cutoff):
+    return Application.objects.filter(
+        status=Application.STATUS_APPROVED,
+        submission_date__lte=cutoff,
+    ).order_by("pk")
+
+
+def _rollover_chunk(rows, when, report, dry_run=False, force=False):
+    """
+    Classify one chunk of eligible rows and write the outcome.
+    Returns the created continuations.
+    """
+    with report.timed("existing"):
+        existing = set(
+            Application.objects
+            .filter(original_application_id__in=[row["id"] for row in rows], is_continuing=True)
+            .values_list("original_application_id", "year_of_study")
+        )
+
+    graduating, continuations = [], []
+    for row in rows:
+        year = row["year_of_study"]
+        if (not row["course_id"] or not year) and not force:
+            report.incomplete += 1
+            continue
+        max_years = row["max_years"]
+        if max_years and year and year >= max_years:
+            graduating.append(row)
+            continue
+        next_year = (year or 0) + 1
+        if (row["id"], next_year) in existing:
+            report.existing += 1
+            continue
+        continuations.append(Application(
+            applicant_id=row["applicant_id"],
+            institution_id=row["institution_id"],
+            course_id=row["course_id"],
+            original_application_id=row["id"],
+            is_continuing=True,
+            year_of_study=next_year,
+            status=Application.STATUS_PENDING,
+            last_cycle_started_at=when,
+        ))
+    report.graduating += len(graduating)
+    report.created += len(continuations)
+
+    if dry_run:
+        return continuations
+
+    if graduating:
+        with report.timed("graduate"):
+            Application.objects.filter(pk__in=[row["id"] for row in graduating]).update(
+                status=Application.STATUS_GRADUATING, updated_at=when,
+            )
+    if continuations:
+        with report.timed("create"):
+            continuations = Application.objects.bulk_create(continuations, batch_size=ROLLOVER_CHUNK_SIZE)
+        with report.timed("stamp"):
+            Application.objects.filter(
+                pk__in=[cont.original_application_id for cont in continuations]
+            ).update(last_cycle_started_at=when)
+
+    # what the per-row post_save receivers would have done
+    with report.timed("reindex"):
+        if continuations:
+            from .search import refresh_search_documents
+            refresh_search_documents(
+                Application.objects.filter(
+                    original_application_id__in=[cont.original_application_id for cont in continuations],
+                    is_continuing=True,
+                    last_cycle_started_at=when,
+                )
+            )
+        if graduating or continuations:
+            from .dashboard import schedule_dashboard_refresh
+            from .public_cache import schedule_public_bump
+            from institutions.pools import schedule_ledger_bump
+            schedule_dashboard_refresh()
+            schedule_public_bump("stats")
+            schedule_ledger_bump(*{row["institution_id"] for row in graduating})
+    return continuations
+
+
+def run_continuing_rollover(cutoff, when, chunk_size=ROLLOVER_CHUNK_SIZE, limit=0,
+                            after_id=None, dry_run=False, force=False, on_chunk=None):
+    """
+    Roll every eligible application submitted on/before cutoff into its
+    next year of study. limit caps the applications processed (0 = all);
+    after_id resumes after the last id of a previous run. on_chunk(report)
+    is called after each committed chunk.
+
+    Returns a RolloverReport.
+    """
+    report = RolloverReport()
+    report.last_id = after_id
+    qs = eligible_applications(cutoff)
+
+    while True:
+        size = chunk_size
+        if limit:
+            size = min(size, limit - report.processed)
+            if size <= 0:
+                break
+
+        with transaction.atomic():
+            with report.timed("select"):
+                chunk = qs if report.last_id is None else qs.filter(pk__gt=report.last_id)
+                rows = list(
+                    chunk
+                    .select_for_update(of=("self",))
+                    .values("id", "applicant_id", "institution_id", "course_id", "year_of_study",
+                            max_years=F("course__years_of_study"))[:size]
+                )
+            if not rows:
+                break
+            _rollover_chunk(rows, when, report, dry_run=dry_run, force=force)
+
+        report.processed += len(rows)
+        report.chunks += 1
+        report.last_id = rows[-1]["id"]
+        if on_chunk:
+            on_chunk(report)
+
+    return report
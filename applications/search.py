@@ -0,0 +1,184 @@
+# applications/search.py
+"""
+Officer search over applications.
+
+Every application has one ApplicationSearchDocument row holding the text
+officers search by (names, email, institution, course, NID, student IDs,
+districts), so a search touches one indexed table instead of ORing
+LIKE '%x%' across users, profiles and institutions.
+
+  - PostgreSQL: GIN index on to_tsvector('simple', body), prefix tsquery
+  - SQLite (local development): FTS5 table kept in step by triggers
+  - anything else: icontains on the document body
+
+Both indexes are created in migration 0038. applications/signals.py
+refreshes documents whenever one of the source rows changes.
+"""
+import re
+from functools import lru_cache
+
+from django.db import connection, connections
+from django.db.models import BooleanField, Q, QuerySet
+from django.db.models.expressions import RawSQL
+
+from .models import Application, ApplicationSearchDocument
+
+FTS_TABLE = "applications_search_fts"
+SEARCH_FIELD = "search_document__body"
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+# what a document is built from; keeps refresh queries to one SELECT
+DOCUMENT_RELATED = ("applicant__user", "institution", "course")
+# Application fields document_text() reads; saves that change none of them skip the rebuild
+DOCUMENT_FIELDS = (
+    "applicant", "institution", "course",
+    "email", "active_student_id", "origin_district", "residency_district",
+)
+
+
+def document_text(application, profile, user, institution, course):
+    """
+    Search text for one application. Migration 0038 holds a frozen copy;
+    a change here needs a data migration (or rebuild_search_documents).
+    """
+    parts = []
+    if user is not None:
+        parts += [user.first_name, user.last_name, user.username, user.email]
+        # 'simple' FTS keeps an address as one token; add its pieces too
+        parts += re.split(r"[@._+-]", user.email or "")
+    if profile is not None:
+        parts += [
+            profile.first_name, profile.surname, profile.nid_number,
+            profile.active_student_id, profile.current_district,
+            profile.origin_district, profile.residency_district,
+        ]
+    if institution is not None:
+        parts += [institution.name, institution.code]
+    if course is not None:
+        parts += [course.name, course.code]
+    parts += [
+        application.email, application.active_student_id,
+        application.origin_district, application.residency_district,
+    ]
+
+    seen = set()
+    words = []
+    for part in parts:
+        part = (part or "").strip()
+        if part and part.lower() not in seen:
+            seen.add(part.lower())
+            words.append(part)
+    return " ".join(words)
+
+
+def build_document(application):
+    profile = application.applicant
+    return document_text(
+        application,
+        profile,
+        getattr(profile, "user", None),
+        application.institution,
+        application.course,
+    )
+
+
+def refresh_search_documents(applications, chunk_size=500):
+    """
+    Rebuild the documents for an Application queryset (or iterable of pks).
+    Returns the number of documents written.
+    """
+    if not isinstance(applications, QuerySet):
+        applications = Application.objects.filter(pk__in=list(applications))
+    applications = applications.select_related(*DOCUMENT_RELATED).order_by()
+
+    written = 0
+    batch = []
+
+    def flush():
+        nonlocal written
+        ApplicationSearchDocument.objects.bulk_create(
+            batch,
+            update_conflicts=True,
+            unique_fields=["application"],
+            update_fields=["body"],
+        )
+        written += len(batch)
+        batch.clear()
+
+    for application in applications.iterator(chunk_size=chunk_size):
+        batch.append(ApplicationSearchDocument(application=application, body=build_document(application)))
+        if len(batch) >= chunk_size:
+            flush()
+    if batch:
+        flush()
+    return written
+
+
+# ---------- querying ----------
+def search_tokens(term):
+    return [token.lower() for token in _TOKEN_RE.findall(term or "")][:10]
+
+
+@lru_cache(maxsize=None)
+def _has_fts_table(alias):
+    with connections[alias].cursor() as cursor:
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [FTS_TABLE])
+        return cursor.fetchone() is not None
+
+
+def matching_application_ids(term):
+    """
+    Subquery of application ids whose document contains every word of term
+    (each word may be a prefix: "jo sm" finds "John Smith").
+    """
+    tokens = search_tokens(term)
+    docs = ApplicationSearchDocument.objects.all()
+    if not tokens:
+        return docs.none().values("application_id")
+
+    if connection.vendor == "postgresql":
+        tsquery = " & ".join(f"{token}:*" for token in tokens)
+        docs = docs.annotate(
+            hit=RawSQL(
+                "to_tsvector('simple', body) @@ to_tsquery('simple', %s)",
+                [tsquery],
+                output_field=BooleanField(),
+            )
+        ).filter(hit=True)
+    elif connection.vendor == "sqlite" and _has_fts_table(connection.alias):
+        match = " ".join(f'"{token}"*' for token in tokens)
+        docs = docs.filter(
+            application_id__in=RawSQL(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [match])
+        )
+    else:
+        for token in tokens:
+            docs = docs.filter(body__icontains=token)
+    return docs.values("application_id")
+
+
+def search_applications(queryset, term):
+    return queryset.filter(pk__in=matching_application_ids(term))
+
+
+class ApplicationSearchMixin:
+    """
+    ModelAdmin mixin that answers the search box from the search index.
+    A search_fields entry ending in "search_document__body" (optionally
+    behind a relation, e.g. "application__search_document__body") matches
+    through the index; other entries keep a plain icontains match.
+    """
+
+    def get_search_results(self, request, queryset, search_term):
+        term = search_term.strip()
+        if not term:
+            return queryset, False
+
+        condition = Q()
+        for field in self.get_search_fields(request):
+            if field == SEARCH_FIELD or field.endswith(f"__{SEARCH_FIELD}"):
+                prefix = field[: -len(SEARCH_FIELD)]
+                condition |= Q(**{f"{prefix}pk__in": matching_application_ids(term)})
+            else:
+                condition |= Q(**{f"{field}__icontains": term})
+        return queryset.filter(condition), False
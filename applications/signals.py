@@ -1,22 +1,20 @@
 import logging
-from django.db import transaction
-from django.db.models.signals import post_save, pre_save
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
 from django.dispatch import receiver
 
-from .models import ApplicationReview
-from .tasks import send_application_status_email, send_status_update_email
+from utils.roles import invalidate_user_groups, reset_user_groups
 
-logger = logging.getLogger(__name__)
+from .config import schedule_config_invalidation
+from .context_processors import invalidate_user_flags
+from .dashboard import schedule_dashboard_refresh
+from .models import FAQ, ApplicantProfile, Application, ApplicationConfig, ApplicationReview, News, PolicyPage
+from .notifications import queue_application_status_event
+from .public_cache import schedule_public_bump
+from .search import DOCUMENT_FIELDS, refresh_search_documents
 
-@receiver(pre_save, sender=ApplicationReview)
-def cache_old_review_status(sender, instance, **kwargs):
-    if instance.pk:
-        try:
-            instance._old_status = sender.objects.only("status").get(pk=instance.pk).status
-        except sender.DoesNotExist:
-            instance._old_status = None
-    else:
-        instance._old_status = None
+logger = logging.getLogger(__name__)
 
 @receiver(post_save, sender=ApplicationReview)
 def notify_applicant_on_review(sender, instance, created, **kwargs):
@@ -24,15 +22,156 @@ def notify_applicant_on_review(sender, instance, created, **kwargs):
     Email applicant when review is created OR status changes.
     """
     try:
-        old_status = getattr(instance, "_old_status", None)
+        # DirtyFieldsMixin still holds the pre-save values here
+        old_status = None if created else instance.original_value("status")
         new_status = instance.status
 
-        status_changed = created or (old_status != new_status)
+        status_changed = created or instance.has_changed("status")
         if not status_changed:
             return
 
-        transaction.on_commit(lambda: send_application_status_email.delay(instance.pk))
+        # buffered in the same transaction; sent in batches by flush_outbound_events
+        queue_application_status_event(instance)
         logger.info("Queued status email for review %s (old: %s, new: %s)", instance.pk, old_status, new_status)
 
     except Exception:
-        logger.exception("Failed to enqueue application status email for review %s", getattr(instance, "pk", None))
+        logger.exception("Failed to queue application status email for review %s", getattr(instance, "pk", None))
+
+
+# ---------- Officer dashboard snapshot invalidation ----------
+@receiver(post_save, sender=Application)
+@receiver(post_delete, sender=Application)
+@receiver(post_save, sender=ApplicationReview)
+@receiver(post_delete, sender=ApplicationReview)
+@receiver(post_save, sender="finance.Payment")
+@receiver(post_delete, sender="finance.Payment")
+@receiver(post_save, sender="institutions.Institution")
+@receiver(post_delete, sender="institutions.Institution")
+def invalidate_dashboard_snapshot(sender, instance, **kwargs):
+    if kwargs.get("raw"):
+        return
+    schedule_dashboard_refresh()
+
+
+# ---------- Public page cache (public_cache.py) ----------
+PUBLIC_SECTION_FOR = {News: "news", FAQ: "faq", PolicyPage: "policy"}
+
+
+@receiver(post_save, sender=News)
+@receiver(post_delete, sender=News)
+@receiver(post_save, sender=FAQ)
+@receiver(post_delete, sender=FAQ)
+@receiver(post_save, sender=PolicyPage)
+@receiver(post_delete, sender=PolicyPage)
+def bump_public_content(sender, instance, **kwargs):
+    if kwargs.get("raw"):
+        return
+    schedule_public_bump(PUBLIC_SECTION_FOR[sender])
+
+
+@receiver(post_save, sender=Application)
+@receiver(post_delete, sender=Application)
+def bump_public_stats(sender, instance, created=None, **kwargs):
+    # only submissions, deletions and moves between statuses/institutions shift the home counters
+    if kwargs.get("raw"):
+        return
+    if created is False and not (instance.has_changed("status") or instance.has_changed("institution")):
+        return
+    schedule_public_bump("stats")
+
+
+@receiver(post_save, sender="institutions.Institution")
+def bump_public_stats_on_rename(sender, instance, created, **kwargs):
+    if kwargs.get("raw") or created:
+        return
+    schedule_public_bump("stats")
+
+
+# ---------- ApplicationConfig cache (config.py) ----------
+@receiver(post_save, sender=ApplicationConfig)
+@receiver(post_delete, sender=ApplicationConfig)
+def invalidate_application_config(sender, instance, **kwargs):
+    schedule_config_invalidation()
+
+
+# ---------- Cached role resolution (utils/roles.py) ----------
+@receiver(m2m_changed, sender=get_user_model().groups.through)
+def invalidate_cached_groups(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "pre_clear", "post_clear"):
+        return
+    if not reverse:
+        # user.groups.add/remove/clear(): instance is the user
+        reset_user_groups(instance)
+    elif action == "pre_clear":
+        # group.user_set.clear(): collect members before they are removed
+        invalidate_user_groups(*instance.user_set.values_list("pk", flat=True))
+    elif action != "post_clear":
+        invalidate_user_groups(*(pk_set or ()))
+
+
+@receiver(post_save, sender=Group)
+@receiver(pre_delete, sender=Group)
+def invalidate_group_members(sender, instance, **kwargs):
+    # a renamed or deleted group changes the names cached for its members
+    if kwargs.get("raw") or kwargs.get("created"):
+        return
+    invalidate_user_groups(*instance.user_set.values_list("pk", flat=True))
+
+
+# ---------- user_context flags (context_processors.py) ----------
+@receiver(post_save, sender=ApplicantProfile)
+@receiver(post_delete, sender=ApplicantProfile)
+def invalidate_profile_flags(sender, instance, **kwargs):
+    if kwargs.get("raw") or kwargs.get("created") is False:
+        return
+    invalidate_user_flags(instance.user_id)
+
+
+@receiver(post_save, sender=Application)
+@receiver(post_delete, sender=Application)
+def invalidate_application_flags(sender, instance, **kwargs):
+    if kwargs.get("raw") or kwargs.get("created") is False:
+        return
+    user_id = ApplicantProfile.objects.filter(pk=instance.applicant_id).values_list("user_id", flat=True).first()
+    if user_id:
+        invalidate_user_flags(user_id)
+
+
+# ---------- Search documents (search.py) ----------
+@receiver(post_save, sender=Application)
+def refresh_application_search_document(sender, instance, created, **kwargs):
+    # status/review saves don't touch the searchable text
+    if kwargs.get("raw"):
+        return
+    if not created and not any(instance.has_changed(name) for name in DOCUMENT_FIELDS):
+        return
+    refresh_search_documents([instance.pk])
+
+
+@receiver(post_save, sender=ApplicantProfile)
+def refresh_profile_search_documents(sender, instance, created, **kwargs):
+    if kwargs.get("raw") or created:
+        return
+    refresh_search_documents(instance.applications.all())
+
+
+@receiver(post_save, sender=get_user_model())
+def refresh_user_search_documents(sender, instance, created, update_fields=None, **kwargs):
+    # logins save last_login only; nothing searchable changed
+    if kwargs.get("raw") or created or (update_fields and set(update_fields) <= {"last_login", "password"}):
+        return
+    refresh_search_documents(Application.objects.filter(applicant__user=instance))
+
+
+@receiver(post_save, sender="institutions.Institution")
+def refresh_institution_search_documents(sender, instance, created, **kwargs):
+    if kwargs.get("raw") or created:
+        return
+    refresh_search_documents(Application.objects.filter(institution=instance))
+
+
+@receiver(post_save, sender="institutions.Course")
+def refresh_course_search_documents(sender, instance, created, **kwargs):
+    if kwargs.get("raw") or created:
+        return
+    refresh_search_documents(Application.objects.filter(course=instance))
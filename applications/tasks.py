@@ -2,44 +2,69 @@ from celery import shared_task
 from django.contrib.auth import get_user_model
 from django.conf import settings
 from django.urls import reverse
-from .utils import trigger_swiftmassive_event
-from .models import ApplicationReview
+
+from utils.ai_scanner import scan_documents_for_eligibility
+
+from .models import Application, ApplicationReview
+from .notifications import flush_events, purge_events_if_due, queue_application_status_event, queue_event
 
 User = get_user_model()
 
-def _send_event(self, email, event_name, payload):
+
+@shared_task
+def flush_outbound_events():
+    """
+    Send buffered SwiftMassive events in batches (see notifications.py),
+    come back for any that failed once their backoff has passed, and purge
+    old SENT/FAILED rows at most once an hour.
+    """
+    result = flush_events()
+    result["purged"] = purge_events_if_due()
+    if result["retry_in"]:
+        flush_outbound_events.apply_async(countdown=result["retry_in"])
+    return result
+
+
+@shared_task(bind=True)
+def scan_application_documents(self, application_id):
+    """
+    Eligibility scan for a new application, stored in reviewer_note. OCR may
+    use a process pool here, except when the task runs eagerly inside a web
+    request.
+    """
+    application = Application.objects.get(pk=application_id)
     try:
-        trigger_swiftmassive_event(
-            email=email,
-            event_name=event_name,
-            data_dict=payload
-        )
+        note = scan_documents_for_eligibility(application, parallel=not self.request.is_eager)
     except Exception as exc:
-        raise self.retry(exc=exc, countdown=60)
+        note = f"Scan failed: {exc}"
+    Application.objects.filter(pk=application_id).update(reviewer_note=note)
 
-@shared_task(bind=True, max_retries=3)
-def send_application_status_email(self, review_id):
+
+@shared_task
+def rebuild_dashboard_snapshot_task():
+    from .dashboard import rebuild_dashboard_snapshot
+    rebuild_dashboard_snapshot()
+
+# The tasks below only buffer the event; delivery happens in flush_outbound_events.
+
+@shared_task
+def send_application_status_email(review_id):
     review = ApplicationReview.objects.select_related("application__applicant__user").get(pk=review_id)
-    user = review.application.applicant.user
-    _send_event(self, user.email, "application_status_update", {
-        "first_name": user.first_name or user.username,
-        "current_status": review.status,
-        "login_url": f"{settings.SITE_URL}{reverse('dashboard')}"
-    })
+    queue_application_status_event(review)
 
-@shared_task(bind=True, max_retries=3)
-def send_welcome_email_task(self, user_id):
+@shared_task
+def send_welcome_email_task(user_id):
     user = User.objects.get(pk=user_id)
-    full_login_url = f"{settings.SITE_URL.rstrip('/')}{reverse('login')}"
-    _send_event(self, user.email, "welcome_email", {
+    full_login_url = f"{settings.SITE_URL.rstrip('/')}{reverse('applications:login')}"
+    queue_event(user.email, "welcome_email", {
         "first_name": user.first_name or user.username,
         "login_url": full_login_url
     })
 
-@shared_task(bind=True, max_retries=3)
-def send_verification_email(self, user_email, token):
-    _send_event(self, user_email, "verification_email", {"token": token})
+@shared_task
+def send_verification_email(user_email, token):
+    queue_event(user_email, "verification_email", {"token": token})
 
-@shared_task(bind=True, max_retries=3)
-def send_status_update_email(self, user_email, status):
-    _send_event(self, user_email, "status_update", {"status": status})
+@shared_task
+def send_status_update_email(user_email, status):
+    queue_event(user_email, "status_update", {"status": status})
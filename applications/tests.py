@@ -1,3 +1,159 @@
+from unittest import mock
+
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from utils import slugs
+
+from .models import News
+
+
+class NewsSlugTests(TestCase):
+    def save_news(self, title="Scholarship Results Released"):
+        news = News(title=title, content="...")
+        with CaptureQueriesContext(connection) as ctx:
+            news.save()
+        return news, len(ctx.captured_queries)
+
+    def test_suffixes_continue_after_highest(self):
+        slugs_seen = [self.save_news()[0].slug for _ in range(12)]
+        self.assertEqual(slugs_seen[:3], [
+            "scholarship-results-released",
+            "scholarship-results-released-1",
+            "scholarship-results-released-2",
+        ])
+        self.assertEqual(slugs_seen[-1], "scholarship-results-released-11")
+
+    def test_unrelated_slugs_sharing_prefix_are_ignored(self):
+        News.objects.create(title="Results", slug="results-summary", content="...")
+        News.objects.create(title="Results", slug="results-2024-draft", content="...")
+        self.assertEqual(self.save_news("Results")[0].slug, "results")
+        self.assertEqual(self.save_news("Results")[0].slug, "results-1")
+
+    def test_explicit_slug_is_kept(self):
+        news = News.objects.create(title="Anything", slug="chosen", content="...")
+        self.assertEqual(news.slug, "chosen")
+
+    def test_retries_after_losing_a_race(self):
+        News.objects.create(title="Race", content="...")  # takes "race"
+        real = slugs.next_unique_slug
+        stale = iter(["race"])  # what a concurrent save allocated before the row above committed
+
+        def allocate(*args):
+            return next(stale, None) or real(*args)
+
+        with mock.patch.object(slugs, "next_unique_slug", side_effect=allocate):
+            news, _ = self.save_news("Race")
+        self.assertEqual(news.slug, "race-1")
+
+
+class NewsSlugBenchmark(TestCase):
+    """
+    Saving the Nth article with a common title must cost the same number
+    of queries as the second, not N probes.
+    """
+
+    def test_save_is_constant_queries(self):
+        queries = {}
+        for n in range(1, 201):
+            news = News(title="Application Window Opens", content="...")
+            with CaptureQueriesContext(connection) as ctx:
+                news.save()
+            queries[n] = len(ctx.captured_queries)
+
+        self.assertEqual(news.slug, "application-window-opens-199")
+        self.assertEqual(queries[2], queries[200])
+        self.assertEqual(len(set(queries.values())), 1)
+        # allocation SELECT + INSERT (+ savepoint statements)
+        self.assertLessEqual(queries[200], 4)
+
+
+class HotQueryPlanTests(TestCase):
+    """
+    EXPLAIN the hottest filters against a seeded database and fail when one
+    would read a whole table (or sort where an index gives the order), so a
+    dropped or reshaped index shows up here rather than in production.
+
+    PostgreSQL plans are taken with enable_seqscan off: on a small test
+    database a sequential scan is always cheapest, and the question is only
+    whether an index can serve the query at all.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        from decimal import Decimal
+
+        from finance.models import FillablePDFTemplate, GeneratedPDF
+        from institutions.models import Course, Institution
+
+        # Application rows (and so reviews/payments) can't be inserted until
+        # the pending documents_pdf migration lands; the plans below don't
+        # depend on row counts, only on which indexes exist.
+        cls.institution = Institution.objects.create(name="Institution", code="INST", location="Lae")
+        Course.objects.create(
+            institution=cls.institution, name="Course", code="C1", total_tuition_fee=Decimal("1000.00")
+        )
+        template = FillablePDFTemplate.objects.create(name="FF3", template_type="FF3", template_id="ff3")
+        GeneratedPDF.objects.bulk_create(
+            GeneratedPDF(template=template, status=("PENDING", "READY")[i % 2]) for i in range(20)
+        )
+
+    def setUp(self):
+        if connection.vendor not in ("postgresql", "sqlite"):
+            self.skipTest(f"no plan checks for {connection.vendor}")
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("SET enable_seqscan = off")
+            self.addCleanup(self._reset_seqscan)
+
+    def _reset_seqscan(self):
+        with connection.cursor() as cursor:
+            cursor.execute("RESET enable_seqscan")
+
+    def hot_queries(self):
+        """
+        (label, queryset, ordered): ordered queries must also avoid a sort.
+        """
+        from finance.models import GeneratedPDF, Payment
+
+        from .models import Application, ApplicationReview
+
+        app_id = applicant_id = 1
+        return [
+            ("application by status",
+             Application.objects.filter(status=Application.STATUS_APPROVED).order_by().values("pk"), False),
+            ("application by institution and status",
+             Application.objects.filter(institution_id=self.institution.pk, status=Application.STATUS_APPROVED).order_by().values("pk"), False),
+            ("application by applicant and is_continuing",
+             Application.objects.filter(applicant_id=applicant_id, is_continuing=True).order_by().values("pk"), False),
+            ("continuation lookup",
+             Application.objects.filter(original_application_id=app_id, is_continuing=True, year_of_study=2).order_by().values("pk"), False),
+            ("latest review of an application",
+             ApplicationReview.objects.filter(application_id=app_id).order_by("-created_at")[:1], True),
+            ("payments of an application by status",
+             Payment.objects.filter(application_id=app_id, status=Payment.STATUS_PAID).order_by(), False),
+            ("generated PDFs by status, newest first",
+             GeneratedPDF.objects.filter(status="PENDING").order_by("-generated_at"), True),
+        ]
+
+    def plan_problems(self, plan, ordered):
+        problems = []
+        for line in plan.splitlines():
+            if connection.vendor == "postgresql":
+                if "Seq Scan" in line:
+                    problems.append(line.strip())
+                elif ordered and line.strip().startswith(("Sort ", "-> Sort ", "->  Sort ")):
+                    problems.append(line.strip())
+            else:
+                if " SCAN " in f" {line} " and " USING " not in line:
+                    problems.append(line.strip())
+                elif ordered and "USE TEMP B-TREE FOR ORDER BY" in line:
+                    problems.append(line.strip())
+        return problems
 
-# Create your tests here.
+    def test_hot_queries_use_indexes(self):
+        for label, queryset, ordered in self.hot_queries():
+            with self.subTest(label):
+                plan = queryset.explain()
+                self.assertEqual(self.plan_problems(plan, ordered), [], f"{label}:\n{plan}")
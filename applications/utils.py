@@ -10,43 +10,50 @@ import json
 from django.conf import settings
 from django.contrib.staticfiles import finders
 
+from utils import http
+
 
 logger = logging.getLogger(__name__)
 
-def trigger_swiftmassive_event(email, event_name, data):
+SWIFTMASSIVE_EVENTS_URL = "https://ghz0jve3kj.execute-api.us-east-1.amazonaws.com/events"
+
+
+def send_swiftmassive_events(events):
     """
-    Core function to ping SwiftMassive API.
-    Sends an event with variables and logs the response.
+    POST a list of event dicts ({"name", "email", ...vars}) in one request.
+    Raises requests.exceptions.RequestException on transport or HTTP errors.
     """
-    url = "https://ghz0jve3kj.execute-api.us-east-1.amazonaws.com/events"
     api_key = os.environ.get('SWIFTMASSIVE_API_KEY')
-    
     if not api_key:
-        logger.error("SWIFTMASSIVE_API_KEY not found in environment.")
-        return False, "Missing API key"
+        raise requests.exceptions.RequestException("SWIFTMASSIVE_API_KEY not found in environment.")
 
     headers = {
         "x-api-key": api_key,
         "Content-Type": "application/json"
     }
-    
+    response = http.post(SWIFTMASSIVE_EVENTS_URL, headers=headers, json={"events": list(events)})
+    response.raise_for_status()
+
+    logger.debug("SwiftMassive accepted %s event(s): %s %s", len(events), response.status_code, response.text)
+    return response
+
+
+def trigger_swiftmassive_event(email, event_name, data):
+    """
+    Core function to ping SwiftMassive API.
+    Sends an event with variables and logs the response.
+
+    Sends immediately; application code should use
+    applications.notifications.queue_event() so events are batched.
+    """
     # Merge default email into the data payload
     event_payload = {"name": event_name, "email": email}
     if data:
         event_payload.update(data)
 
-    payload = {"events": [event_payload]}
-
     try:
-        response = requests.post(url, headers=headers, json=payload, timeout=10)
-        response.raise_for_status()
-
-        # Debug logging
+        response = send_swiftmassive_events([event_payload])
         logger.info("SwiftMassive event triggered successfully")
-        logger.debug("Payload sent: %s", payload)
-        logger.debug("Response code: %s", response.status_code)
-        logger.debug("Response body: %s", response.text)
-
         return True, response.text
     except requests.exceptions.RequestException as e:
         logger.error(f"SwiftMassive API error: {e}")
@@ -9,8 +9,9 @@ from django.contrib.auth.forms import UserCreationForm, AuthenticationForm
 from django.contrib.auth.models import User
 from django.db.models import Q, Count, Sum, F
 from django.contrib.admin.views.decorators import staff_member_required
-from utils.ai_scanner import scan_documents_for_eligibility
+from .tasks import scan_application_documents
 from institutions.models import Institution, Course
+from institutions.catalogue import courses_response, get_catalogue
 from finance.models import Payment # assuming this exists
 from finance.views import finance_summary_totals 
 from django.dispatch import receiver
@@ -20,13 +21,14 @@ from django.urls import reverse
 from django.contrib.auth.forms import SetPasswordForm
 from utils.decorators import require_password_setup
 from django.core.paginator import Paginator
+from utils.pagination import KeysetPaginator, approximate_count, query_without
 from django.conf import settings
 from .models import FAQ, PolicyPage
 from utils.progress import set_progress, get_progress, clear_progress
 import uuid
 import threading
 from .forms import ApplicationForm, ApplicantProfileForm
-from django.http import JsonResponse
+from django.http import Http404, JsonResponse
 import time
 from django.utils import timezone
 from django.db.models.functions import Coalesce
@@ -47,9 +49,15 @@ from .models import ApplicationConfig
 from django.contrib.auth.tokens import default_token_generator
 from django.utils.http import urlsafe_base64_encode
 from django.utils.encoding import force_bytes
-import requests
+from utils import http
 from .forms import SignupForm
 from .utils import trigger_swiftmassive_event
+from .config import get_config
+from .dashboard import get_dashboard_snapshot
+from .public_cache import cached_section_data, public_page, public_stats, stats_validator
+from utils.csv_export import format_currency, grouped_rows, streaming_csv_response
+from utils.roles import has_any_group
+import itertools
 
 logger = logging.getLogger(__name__)
 
@@ -60,7 +68,7 @@ def dashboard_redirect(request):
     user = request.user
 
     # Officers → officer dashboard
-    if user.groups.filter(name__in=OFFICER_GROUPS).exists():
+    if has_any_group(user, *OFFICER_GROUPS):
         return redirect("applications:officer_dashboard")
 
     # Admin/staff → admin
@@ -112,31 +120,21 @@ def logout_view(request):
         return redirect("applications:login")
 # --- Home ---
 
+@public_page(validator=stats_validator)
 def home_view(request):
-    total_applicants = Application.objects.count()
-    total_awarded = Application.objects.filter(status=Application.STATUS_APPROVED).count()
-
-    institution_stats = (
-        Application.objects
-        .values('institution__name')
-        .annotate(
-            applicants=Count('id'),
-            awarded=Count('id', filter=Q(status=Application.STATUS_APPROVED))
-        )
-        .order_by('-applicants')
-    )
-
+    # counters cached per stats version, recomputed at most once a minute
+    stats = public_stats()["stats"]
     return render(request, 'home.html', {
-        'total_applicants': total_applicants,
-        'total_awarded': total_awarded,
-        'institution_stats': institution_stats,
+        'total_applicants': stats['total_applicants'],
+        'total_awarded': stats['total_awarded'],
+        'institution_stats': stats['institution_stats'],
     })
 
 
 # --- Officer check ---
 
 def is_scholarship_officer(user):
-    return user.is_authenticated and user.groups.filter(name='Scholarship Officers').exists()
+    return has_any_group(user, 'Scholarship Officers')
 
 @user_passes_test(is_scholarship_officer)
 def officer_view_student_profile(request, pk):
@@ -177,7 +175,7 @@ def send_swiftmissive_event(event_name, email, variables=None):
         "Content-Type": "application/json"
     }
 
-    response = requests.post(url, json=payload, headers=headers)
+    response = http.post(url, json=payload, headers=headers)
 
     # Debug logging
     print("=== SwiftMissive Debug ===")
@@ -212,7 +210,7 @@ def register(request):
             "response": token,
             "remoteip": request.META.get("REMOTE_ADDR"),
         }
-        result = requests.post(verify_url, data=data).json()
+        result = http.post(verify_url, data=data).json()
 
         if result.get("success") and form.is_valid():
             user = form.save(commit=False)
@@ -278,7 +276,7 @@ class UserLoginForm(AuthenticationForm):
 
 @login_required
 def create_application(request):
-    cfg = ApplicationConfig.get_solo()
+    cfg = get_config(request)
     if cfg.is_closed_now():
         return applications_closed_response(request)
 
@@ -300,15 +298,8 @@ def create_application(request):
             application.is_continuing = False
             application.save()
 
-            # ---- SIMPLE SYNCHRONOUS SCAN ----
-            try:
-                scan_result = scan_documents_for_eligibility(application)
-                application.reviewer_note = scan_result
-            except Exception as exc:
-                application.reviewer_note = f"Scan failed: {exc}"
-
-            application.save(update_fields=["reviewer_note"])
-            # --------------------------------
+            # OCR runs in the background; the result lands in reviewer_note
+            transaction.on_commit(lambda: scan_application_documents.delay(application.pk))
 
             return redirect("applications:documents_submitted")
 
@@ -337,7 +328,7 @@ def choose_application_type(request):
 
 @login_required
 def create_continuing_application(request):
-    cfg = ApplicationConfig.get_solo()
+    cfg = get_config(request)
     if cfg.is_closed_now():
         return applications_closed_response(request)
 
@@ -373,7 +364,7 @@ def application_success(request):
 
 # --- Officer ---
 def is_scholarship_officer(user):
-    return user.is_authenticated and user.groups.filter(name='Scholarship Officers').exists()
+    return has_any_group(user, 'Scholarship Officers')
 
 # adjust these imports to match your project
 from .models import Application, Institution
@@ -387,7 +378,7 @@ except Exception:
 
 def is_scholarship_officer(user):
     # keep your existing check here
-    return user.is_active and user.groups.filter(name='Scholarship Officers').exists()
+    return user.is_active and has_any_group(user, 'Scholarship Officers')
 
 @user_passes_test(is_scholarship_officer)
 def officer_dashboard(request):
@@ -399,86 +390,33 @@ def officer_dashboard(request):
       - optional financial totals for approved pool if Payment model exists
     """
     query = request.GET.get('q', '').strip()
-    page = int(request.GET.get('page', 1))
 
     # Base queryset for listing/search
     applications_qs = Application.objects.select_related('applicant__user', 'institution', 'course')
 
     if query:
-        applications_qs = applications_qs.filter(
-            Q(applicant__user__first_name__icontains=query) |
-            Q(applicant__user__last_name__icontains=query) |
-            Q(institution__name__icontains=query) |
-            Q(applicant__user__email__icontains=query)
-        )
-
-    applications_qs = applications_qs.order_by('-submission_date')
+        # names, email, institution, course, NID, districts (applications/search.py)
+        applications_qs = applications_qs.search(query)
 
-    # Paginate the full list (for the "applications" view)
-    paginator = Paginator(applications_qs, 25)
-    applications_page = paginator.get_page(page)
+    applications_qs = applications_qs.order_by('-submission_date', '-id')
 
-    # Institution-level aggregated stats in a single query (avoids looping)
-    institution_stats_qs = (
-        Application.objects
-        .values('institution__id', 'institution__name')
-        .annotate(
-            total=Count('id'),
-            approved=Count('id', filter=Q(status=Application.STATUS_APPROVED)),
-            rejected=Count('id', filter=Q(status=Application.STATUS_REJECTED)),
-            pending=Count('id', filter=Q(status=Application.STATUS_PENDING)),
-        )
-        .order_by('institution__name')
+    # Cursor-paginate the full list (for the "applications" view): no OFFSET,
+    # so deep pages cost the same as the first one
+    applications_page = KeysetPaginator(applications_qs, 25).get_page(
+        after=request.GET.get('after'), before=request.GET.get('before'),
     )
+    applications_count, applications_count_is_estimate = approximate_count(applications_qs)
 
-    # Convert to list of dicts including id so templates can reverse URLs
-    institution_stats = [
-        {
-            'id': item['institution__id'],
-            'name': item['institution__name'],
-            'total': item['total'],
-            'approved': item['approved'],
-            'rejected': item['rejected'],
-            'pending': item['pending'],
-        }
-        for item in institution_stats_qs
-    ]
-
-    # Overall totals (single-query counts)
-    totals = Application.objects.aggregate(
-        total_applications=Count('id'),
-        total_approved=Count('id', filter=Q(status=Application.STATUS_APPROVED)),
-        total_rejected=Count('id', filter=Q(status=Application.STATUS_REJECTED)),
-        total_pending=Count('id', filter=Q(status=Application.STATUS_PENDING)),
-    )
+    # Institution breakdown, totals and finance aggregates come from the
+    # precomputed snapshot row (rebuilt only after a write invalidated it)
+    snapshot = get_dashboard_snapshot()
 
     # Preview: top 5 recent applications (already ordered)
     preview_applications = applications_qs[:5]
 
-    # Optional: compute financial aggregates for approved pool (global)
-    finance_totals = None
-    committed_total = paid_total = remaining_total = Decimal('0.00')
-    paid_percent = 0
     payments = []
     budget_votes = []
     if PAYMENT_AVAILABLE:
-        approved_qs = Application.objects.filter(status=Application.STATUS_APPROVED)
-        finance_totals = approved_qs.aggregate(
-            pool_total_tuition=Coalesce(Sum('course__total_tuition_fee'), Decimal('0.00')),
-            pool_total_paid=Coalesce(Sum('payments__amount', filter=Q(payments__status=Payment.STATUS_PAID)), Decimal('0.00')),
-            pool_total_committed=Coalesce(Sum('payments__amount', filter=Q(payments__status=Payment.STATUS_COMMITTED)), Decimal('0.00')),
-        )
-        finance_totals['pool_total_outstanding'] = finance_totals['pool_total_tuition'] - finance_totals['pool_total_paid']
-
-        # convenience totals for the top widgets
-        committed_total = finance_totals.get('pool_total_committed', Decimal('0.00')) or Decimal('0.00')
-        paid_total = finance_totals.get('pool_total_paid', Decimal('0.00')) or Decimal('0.00')
-        remaining_total = committed_total - paid_total
-        try:
-            paid_percent = int((paid_total / committed_total * 100).quantize(Decimal('1'))) if committed_total and committed_total != Decimal('0.00') else 0
-        except Exception:
-            paid_percent = 0
-
         # recent payments for the finance table (limit to 25)
         payments = Payment.objects.select_related('application__institution', 'application').order_by('-payment_date')[:25]
 
@@ -501,48 +439,46 @@ def officer_dashboard(request):
 
     # other stats for right column
     applications_for_stats = applications_qs  # or Application.objects.all() if you want global counts
-    total_awarded = Application.objects.filter(status=Application.STATUS_APPROVED).count()
-
-    institutions_count = Institution.objects.count()
 
     context = {
-        'applications_page': applications_page,            # paginated full list
+        'applications_page': applications_page,            # keyset-paginated full list
+        'applications_count': applications_count,
+        'applications_count_is_estimate': applications_count_is_estimate,
+        'base_query': query_without(request.GET, 'after', 'before'),
         'applications': applications_for_stats,           # queryset used for counts in template
         'preview_applications': preview_applications,      # top 5 preview
-        'institution_stats': institution_stats,           # list of dicts with id & name
+        'institution_stats': snapshot['institution_stats'],  # list of dicts with id & name
         'institutions_list': institutions_list,           # for filter select
         'statuses': statuses,                             # for filter select
-        'totals': totals,
-        'finance_totals': finance_totals,                  # None if Payment not available
-        'committed_total': committed_total,
-        'paid_total': paid_total,
-        'remaining_total': remaining_total,
-        'paid_percent': paid_percent,
+        'totals': snapshot['totals'],
+        'finance_totals': snapshot['finance_totals'] if PAYMENT_AVAILABLE else None,
+        'committed_total': snapshot['committed_total'],
+        'paid_total': snapshot['paid_total'],
+        'remaining_total': snapshot['remaining_total'],
+        'paid_percent': snapshot['paid_percent'],
         'payments': payments,
         'budget_votes': budget_votes,
         'query': query,
         'allow_export': True,                              # toggle as needed
-        'total_awarded': total_awarded,
-        'institutions_count': institutions_count,
+        'total_awarded': snapshot['total_awarded'],
+        'institutions_count': snapshot['institutions_count'],
     }
-    
-    context.update(finance_summary_totals())
-    
-    return render(request, 'applications/officer_dashboard.html', context)
 
+    return render(request, 'applications/officer_dashboard.html', context)
 
-def format_currency(amount):
-    # amount is Decimal or numeric
-    amt = Decimal(amount or 0).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
-    return f"PGK{amt:,.2f}"
 
+@user_passes_test(is_scholarship_officer)
 def export_applications_csv(request):
     """
     Export applications grouped by institution with per-institution subtotal and grand total.
     Accepts GET filters: q (search), status, institution_id (optional).
+
+    Rows are streamed in institution order, so subtotals are written as each
+    institution ends instead of buffering the whole export in memory.
     """
     q = request.GET.get('q', '').strip()
     status = (request.GET.get("status") or "").strip().upper()
+    institution_id = request.GET.get('institution_id') or request.GET.get('institution')
 
     # Force status selection so it won't export everything by accident
     if not status:
@@ -552,77 +488,57 @@ def export_applications_csv(request):
     if status not in allowed_statuses:
         return HttpResponse(f"Invalid status '{status}'. Use APPROVED / REJECTED / PENDING.", status=400)
 
+    qs = Application.objects.select_related('applicant__user', 'institution', 'course')
+    if q:
+        # same matching as the dashboard search the export link carries over
+        qs = qs.search(q)
+
     qs = qs.filter(status=status)
 
     if institution_id:
         qs = qs.filter(institution_id=institution_id)
 
-    # Group by institution in Python to write subtotals in order
-    # Build a mapping: institution -> list of applications
-    apps_by_inst = {}
-    inst_order = []
-    for app in qs:
-        inst = app.institution.name if app.institution else 'Unknown'
-        if inst not in apps_by_inst:
-            apps_by_inst[inst] = []
-            inst_order.append(inst)
-        apps_by_inst[inst].append(app)
+    # Server-side ordering by institution lets the engine emit subtotals on the fly
+    qs = qs.order_by('institution__name', 'institution_id', 'id')
+
+    def row(idx, app, inst_name):
+        tuition = getattr(app.course, 'total_tuition_fee', None) or Decimal('0.00')
+        return [
+            idx,
+            app.applicant.user.first_name if app.applicant and app.applicant.user else '',
+            app.applicant.user.last_name if app.applicant and app.applicant.user else '',
+            app.applicant.gender if hasattr(app.applicant.user, 'profile') and getattr(app.applicant.user.profile, 'gender', None) else getattr(app, 'gender', ''),
+            inst_name,
+            app.course.name if app.course else '',
+            format_currency(tuition),
+            getattr(app, 'district', '') or '',
+            getattr(app, 'year_of_study', '') or '',
+        ]
 
-    # Prepare response
-    response = HttpResponse(content_type='text/csv')
-    response['Content-Disposition'] = 'attachment; filename="applications_export.csv"'
+    # Header block (match image top lines)
+    header = [
+        ['MOROBE PROVINCIAL GOVERNMENT'],
+        ['GERSON SOLULU SCHOLARSHIP PROGRAM 2026'],
+        [],  # blank line
+        ['No.', 'First Name', 'Surname', 'Gender', 'Institution', 'Course', 'Tuition Fee', 'District', 'Year Of Study'],
+    ]
 
-    writer = csv.writer(response)
+    rows = grouped_rows(
+        qs,
+        row=row,
+        amount=lambda app: getattr(app.course, 'total_tuition_fee', None),
+        group_by=lambda app: app.institution.name if app.institution else 'Unknown',
+    )
 
-    # Header block (match image top lines)
-    writer.writerow(['MOROBE PROVINCIAL GOVERNMENT'])
-    writer.writerow(['GERSON SOLULU SCHOLARSHIP PROGRAM 2026'])
-    writer.writerow([])  # blank line
-    writer.writerow(['No.', 'First Name', 'Surname', 'Gender', 'Institution', 'Course', 'Tuition Fee', 'District', 'Year Of Study'])
-
-    grand_total = Decimal('0.00')
-
-    # Write rows grouped by institution
-    for inst_name in inst_order:
-        apps = apps_by_inst[inst_name]
-        # Institution title row
-        writer.writerow([])
-        writer.writerow([inst_name])  # institution header row
-
-        inst_subtotal = Decimal('0.00')
-        for idx, app in enumerate(apps, start=1):
-            tuition = getattr(app.course, 'total_tuition_fee', None) or Decimal('0.00')
-            inst_subtotal += Decimal(tuition)
-            writer.writerow([
-                idx,
-                app.applicant.user.first_name if app.applicant and app.applicant.user else '',
-                app.applicant.user.last_name if app.applicant and app.applicant.user else '',
-                app.applicant.gender if hasattr(app.applicant.user, 'profile') and getattr(app.applicant.user.profile, 'gender', None) else getattr(app, 'gender', ''),
-                inst_name,
-                app.course.name if app.course else '',
-                format_currency(tuition),
-                getattr(app, 'district', '') or '',
-                getattr(app, 'year_of_study', '') or '',
-            ])
-
-        # Institution subtotal row
-        writer.writerow([])
-        writer.writerow(['', '', '', '', '', 'Institution total', format_currency(inst_subtotal)])
-        grand_total += inst_subtotal
-
-    # Grand total at the end
-    writer.writerow([])
-    writer.writerow(['', '', '', '', '', 'Grand total', format_currency(grand_total)])
-
-    return response
+    return streaming_csv_response('applications_export.csv', itertools.chain(header, rows))
 
 
 
 def is_scholarship_officer(user):
-    return user.is_active and user.groups.filter(name="Scholarship Officers").exists()
+    return user.is_active and has_any_group(user, "Scholarship Officers")
 
 def is_scholarship_officer(user):
-    return user.is_authenticated and user.groups.filter(name="Scholarship Officers").exists()
+    return has_any_group(user, "Scholarship Officers")
 
 @user_passes_test(is_scholarship_officer)
 def officer_view_student_profile(request, pk):
@@ -672,7 +588,7 @@ def user_dashboard(request):
     if not profile:
         return redirect('applications:create_application')
 
-    applications = Application.objects.filter(applicant=profile).select_related('institution', 'course')
+    applications = Application.objects.filter(applicant=profile).select_related('institution', 'course').with_payment_totals()
 
     enriched_apps = []
     for app in applications:
@@ -681,10 +597,7 @@ def user_dashboard(request):
             ('Uploaded Documents (PDF)', getattr(app, "documents_pdf", None)),
         ]
 
-        total_paid = Payment.objects.filter(
-            application=app,
-            status=Payment.STATUS_PAID
-        ).aggregate(total=Coalesce(Sum('amount'), Decimal('0.00')))['total']
+        total_paid = app.total_paid
 
         total_fee = getattr(app.course, 'total_tuition_fee', Decimal('0.00')) or Decimal('0.00')
         balance = Decimal(total_fee) - Decimal(total_paid)
@@ -725,7 +638,11 @@ def continuing_dashboard(request):
     if not profile:
         return redirect('applications:create_application')
 
-    applications = Application.objects.filter(applicant=profile, is_continuing=True).select_related('institution', 'course')
+    applications = (
+        Application.objects.filter(applicant=profile, is_continuing=True)
+        .select_related('institution', 'course')
+        .with_payment_totals()
+    )
 
     enriched_apps = []
     for app in applications:
@@ -734,10 +651,7 @@ def continuing_dashboard(request):
             ('Uploaded Documents (PDF)', getattr(app, "documents_pdf", None)),
         ]
 
-        total_paid = Payment.objects.filter(
-            application=app,
-            status=Payment.STATUS_PAID
-        ).aggregate(total=Coalesce(Sum('amount'), Decimal('0.00')))['total']
+        total_paid = app.total_paid
 
         total_fee = getattr(app.course, 'total_tuition_fee', Decimal('0.00')) or Decimal('0.00')
         balance = Decimal(total_fee) - Decimal(total_paid)
@@ -765,7 +679,7 @@ def continuing_dashboard(request):
 
 
 @login_required
-@user_passes_test(lambda u: u.groups.filter(name__in=["Reviewer", "Scholarship Officers"]).exists())
+@user_passes_test(lambda u: has_any_group(u, "Reviewer", "Scholarship Officers"))
 def view_review(request, pk):
     application = get_object_or_404(
         Application.objects.select_related("applicant__user", "institution", "course"),
@@ -801,12 +715,19 @@ try:
 except Exception:
     News = None
 
+NEWS_PAGE_SIZE = 6
+
+
+@public_page("news", params=("page",))
 def news_list(request):
     if News is not None:
         qs = News.objects.filter(published__isnull=False).order_by("-published")
-        paginator = Paginator(qs, 6)
-        page_number = request.GET.get("page")
-        page_obj = paginator.get_page(page_number)
+        paginator = Paginator(qs, NEWS_PAGE_SIZE)
+        paginator.count = cached_section_data("news", "count", qs.count)
+        page_obj = paginator.get_page(request.GET.get("page"))
+        page_obj.object_list = cached_section_data(
+            "news", f"page:{page_obj.number}", lambda: list(page_obj.object_list)
+        )
         context = {
             "news_list": page_obj.object_list,
             "is_paginated": page_obj.has_other_pages(),
@@ -823,12 +744,15 @@ def news_list(request):
     return render(request, "applications/news.html", context)
 
 
+@public_page("news")
 def news_detail(request, pk):
     """
     News detail view. Uses News model if available; otherwise returns a sample item.
     """
     if News is not None:
-        item = get_object_or_404(News, pk=pk)
+        item = cached_section_data("news", f"item:{pk}", lambda: News.objects.filter(pk=pk).first())
+        if item is None:
+            raise Http404("No News matches the given query.")
         context = {"news": item}
     else:
         # Simple fallback
@@ -838,16 +762,27 @@ def news_detail(request, pk):
     return render(request, "applications/news_detail.html", context)
 
 
+@public_page("faq")
 def faq_view(request):
-    faqs = FAQ.objects.all()
+    faqs = cached_section_data("faq", "all", lambda: list(FAQ.objects.all()))
     return render(request, "applications/faq.html", {"faqs": faqs})
 
+
+def _policy_page(name, title):
+    # pages are looked up by title; a missing page is cached as "" (None is not cached)
+    page = cached_section_data("policy", name, lambda: PolicyPage.objects.filter(title=title).first() or "")
+    return page or None
+
+
+@public_page("policy")
 def terms_view(request):
-    terms = PolicyPage.objects.filter(title="Terms & Conditions").first()
+    terms = _policy_page("terms", "Terms & Conditions")
     return render(request, "applications/terms.html", {"terms": terms})
 
+
+@public_page("policy")
 def privacy_view(request):
-    privacy = PolicyPage.objects.filter(title="Privacy Policy").first()
+    privacy = _policy_page("privacy", "Privacy Policy")
     return render(request, "applications/privacy.html", {"privacy": privacy})
 
 def about_view(request):
@@ -855,7 +790,7 @@ def about_view(request):
 # -- View Of Continuing Student --
 
 def lookup_legacy(request):
-    cfg = ApplicationConfig.get_solo()
+    cfg = get_config(request)
     if cfg.rollover_due() or not cfg.legacy_lookup_enabled:
         return redirect("applications:continuing_application")  # your continuing route
 
@@ -867,17 +802,14 @@ def lookup_legacy(request):
             surname = form.cleaned_data['surname'].strip()
             year = form.cleaned_data.get('year_of_study')
 
-            filters = {
-                "first_name__iexact": first_name,
-                "surname__iexact": surname,
-            }
-            if year:
-                filters["year_of_study"] = year
+            matches = list(LegacyStudent.objects.matching(first_name, surname, year))
 
-            matches = LegacyStudent.objects.filter(**filters)
-
-            if not matches.exists():
-                messages.warning(request, "No matching legacy record found. Please apply as a new student.")
+            if not matches:
+                matches = LegacyStudent.objects.fuzzy_matching(first_name, surname, year)
+                if matches:
+                    messages.info(request, "No exact match found. Showing records with similar names.")
+                else:
+                    messages.warning(request, "No matching legacy record found. Please apply as a new student.")
     else:
         form = LegacyLookupForm()
 
@@ -907,14 +839,11 @@ def confirm_legacy(request):
         year_of_study = request.POST.get("year_of_study")
 
         if inst_id and course_id and year_of_study:
-            inst = Institution.objects.filter(id=inst_id).first()
-            course = Course.objects.filter(id=course_id, institution=inst).first()
-
-            if inst and course:
+            if get_catalogue().has_course(inst_id, course_id):
                 app = Application.objects.create(
                     applicant=applicant,
-                    institution=inst,
-                    course=course,
+                    institution_id=inst_id,
+                    course_id=course_id,
                     is_continuing=True,
                     year_of_study=year_of_study,
                     status=Application.STATUS_PENDING,
@@ -926,22 +855,12 @@ def confirm_legacy(request):
         else:
             messages.error(request, "Please select institution, course, and year of study.")
 
-        # Stay on selection page, keep legacy_id in context
-        institutions = Institution.objects.all()
-        courses = Course.objects.all()
-        return render(request, "applications/select_institution_course.html", {
-            "legacy": legacy,
-            "institutions": institutions,
-            "courses": courses,
-        })
-
-    # Initial GET → show selection form
-    institutions = Institution.objects.all()
-    courses = Course.objects.all()
+    # Initial GET, or back to the selection page with legacy_id kept in context
+    catalogue = get_catalogue()
     return render(request, "applications/select_institution_course.html", {
         "legacy": legacy,
-        "institutions": institutions,
-        "courses": courses,
+        "institutions": catalogue.institutions,
+        "courses": catalogue.all_courses(),
     })
 
 
@@ -949,9 +868,7 @@ def courses_api(request):
     inst_id = request.GET.get("institution_id")
     if not inst_id:
         return JsonResponse([], safe=False)
-
-    courses = Course.objects.filter(institution_id=inst_id).values("id", "name", "code")
-    return JsonResponse(list(courses), safe=False)
+    return courses_response(request, inst_id)
 
 @login_required
 @transaction.atomic
@@ -1001,7 +918,7 @@ def edit_continuing_application(request, pk):
 @login_required
 @transaction.atomic
 def continue_application(request, pk):
-    cfg = ApplicationConfig.get_solo()
+    cfg = get_config(request)
     if cfg.is_closed_now():
         return applications_closed_response(request)
 
@@ -1014,7 +931,7 @@ def continue_application(request, pk):
     profile = request.user.applicantprofile
 
     # Decide which application form to use based on config
-    cfg = ApplicationConfig.get_solo()
+    cfg = get_config(request)
     if cfg.rollover_due():
         ApplicationFormClass = ContinuingTranscriptOnlyForm
     else:
@@ -1072,7 +989,7 @@ def applications_closed_response(request):
     return render(request, "applications/applications_closed.html")
 
 def block_if_applications_closed(request):
-    cfg = ApplicationConfig.get_solo()
+    cfg = get_config(request)
     if cfg.is_closed_now():
         return cfg
     return None
\ No newline at end of file
@@ -6,17 +6,22 @@ from django.contrib.auth.decorators import login_required, user_passes_test
 from django.db import transaction
 from django.shortcuts import get_object_or_404, redirect, render
 
-from finance.models import Payment
+from utils.pagination import KeysetPaginator, approximate_count, query_without
+from utils.roles import has_any_group
+
 from .forms import ApplicationReviewForm
 from .models import Application, ApplicationReview
+from .r2 import sign_application_documents
 
 
 # ---------- Permissions ----------
 REVIEW_GROUPS = ["Scholarship Officers", "Reviewer", "Reviewers"]
 
+REVIEW_PAGE_SIZE = 25
+
 
 def can_review(user):
-    return user.is_authenticated and user.groups.filter(name__in=REVIEW_GROUPS).exists()
+    return has_any_group(user, *REVIEW_GROUPS)
 
 
 review_required = user_passes_test(can_review)
@@ -24,8 +29,12 @@ review_required = user_passes_test(can_review)
 
 # ---------- Helpers ----------
 def get_payment_summary(application):
-    payments = Payment.objects.filter(application=application)
-    total_paid = sum((p.amount for p in payments), Decimal("0.00"))
+    """
+    Paid totals come from Application.total_paid, which reuses the
+    with_payment_totals() annotation when the caller loaded it.
+    Only PAID payments count towards the balance.
+    """
+    total_paid = application.total_paid
 
     total_fee = Decimal("0.00")
     if getattr(application, "course", None) and getattr(application.course, "total_tuition_fee", None) is not None:
@@ -51,11 +60,15 @@ def get_payment_summary(application):
 def get_documents_for_application(application):
     """
     Returns: (template_name, documents_list)
-    documents_list is [(label, filefield_or_none), ...]
+    documents_list is [(label, filefield_or_none, signed_url_or_none), ...]
     """
-
+    fields = [
+        ("Uploaded Documents (PDF)", "documents_pdf"),
+    ]
+    urls = sign_application_documents(application, fields=[name for _, name in fields])
     documents = [
-        ("Uploaded Documents (PDF)", getattr(application, "documents_pdf", None)),
+        (label, getattr(application, name, None), urls.get(name))
+        for label, name in fields
     ]
 
     template = (
@@ -85,27 +98,50 @@ def map_review_status_to_application_status(review_status):
 @review_required
 def review_list(request):
     """
-    Officer list of applications to review.
+    Officer list of applications to review, newest first, paged by cursor.
     Filter with:
       ?type=new
       ?type=continuing
+      ?status=PENDING (any Application status)
+      ?q=<name, email, NID, institution, ...>
+    Page with ?after=<cursor> / ?before=<cursor>.
     """
     app_type = request.GET.get("type")  # "new" | "continuing" | None
+    status = request.GET.get("status", "").upper()
+    query = request.GET.get("q", "").strip()
 
-    applications = (
-        Application.objects.select_related("applicant__user", "institution", "course")
-        .order_by("-created_at")
-    )
+    applications = Application.objects.select_related("applicant__user", "institution", "course")
 
+    if status in dict(Application.STATUS_CHOICES):
+        applications = applications.filter(status=status)
+    else:
+        status = ""
     if app_type == "continuing":
         applications = applications.filter(is_continuing=True)
     elif app_type == "new":
         applications = applications.filter(is_continuing=False)
+    if query:
+        applications = applications.search(query)
+
+    page = KeysetPaginator(applications, REVIEW_PAGE_SIZE).get_page(
+        after=request.GET.get("after"), before=request.GET.get("before"),
+    )
+    total, total_is_estimate = approximate_count(applications)
 
     return render(
         request,
         "applications/officer_review_list.html",
-        {"applications": applications, "app_type": app_type},
+        {
+            "applications": page,
+            "page_obj": page,
+            "base_query": query_without(request.GET, "after", "before"),
+            "total": total,
+            "total_is_estimate": total_is_estimate,
+            "app_type": app_type,
+            "status": status,
+            "query": query,
+            "status_choices": Application.STATUS_CHOICES,
+        },
     )
 
 
@@ -121,7 +157,7 @@ def review_application(request, pk):
     - saves timestamped reviews (ApplicationReview) + updates Application.status
     """
     application = get_object_or_404(
-        Application.objects.select_related("applicant__user", "institution", "course"),
+        Application.objects.select_related("applicant__user", "institution", "course").with_payment_totals(),
         pk=pk,
     )
 
@@ -149,13 +185,8 @@ def review_application(request, pk):
                 if hasattr(application, "reviewer_note"):
                     application.reviewer_note = review.note
 
-                update_fields = ["status"]
-                if hasattr(application, "reviewer_note"):
-                    update_fields.append("reviewer_note")
-                if hasattr(application, "updated_at"):
-                    update_fields.append("updated_at")
-
-                application.save(update_fields=update_fields)
+                # writes only what the review actually changed (plus updated_at)
+                application.save_dirty()
 
             messages.success(request, "Review saved.")
             return redirect("applications:officer_application_detail", pk=application.pk)
@@ -1,4 +1,6 @@
 # finance/admin.py
+import logging
+
 from django.contrib import admin, messages
 from django.db import transaction
 from django.urls import path, reverse
@@ -6,6 +8,8 @@ from django.shortcuts import get_object_or_404, HttpResponseRedirect
 from django.utils.html import format_html
 from django.utils import timezone
 
+from applications.search import ApplicationSearchMixin
+
 from .models import (
     Payment,
     BudgetVote,
@@ -17,8 +21,11 @@ from .models import (
     PDFAudit,
 )
 
+from .pdf_pipeline import queue_pdf_batch
 from .tasks import process_generated_pdf
 
+logger = logging.getLogger(__name__)
+
 
 # ---------------- PDF admin models ----------------
 
@@ -49,7 +56,7 @@ queue_for_processing.short_description = "Queue selected PDFs for Celery process
 # ---------------- Payment admin with actions ----------------
 
 @admin.register(Payment)
-class PaymentAdmin(admin.ModelAdmin):
+class PaymentAdmin(ApplicationSearchMixin, admin.ModelAdmin):
     list_display = (
         "id",
         "application",
@@ -61,10 +68,9 @@ class PaymentAdmin(admin.ModelAdmin):
         "pdf_actions",
     )
     list_filter = ("status", "budget_vote", "application__institution")
+    # applicant/institution matching goes through the search index (ApplicationSearchMixin)
     search_fields = (
-        "application__applicant__user__username",
-        "application__applicant__user__first_name",
-        "application__applicant__user__last_name",
+        "application__search_document__body",
         "vendor_code",
     )
 
@@ -127,24 +133,18 @@ class PaymentAdmin(admin.ModelAdmin):
                     if payment.status == Payment.STATUS_PAID:
                         skipped += 1
                         continue
-                    try:
-                        payment.mark_paid(user=request.user, treasury_date=timezone.localdate(), batch_number=batch_number or None)
-                    except Exception:
-                        payment.status = Payment.STATUS_PAID
-                        payment.treasury_release_date = payment.treasury_release_date or timezone.localdate()
-                        if batch_number:
-                            payment.batch_number = batch_number
-                        payment.save(update_fields=["status", "treasury_release_date", "batch_number", "updated_at"])
-                        AuditLog.objects.create(user=request.user, action="Marked as PAID (FF4/Treasury)", payment=payment, budget_vote=payment.budget_vote, notes=f"Batch {batch_number}" if batch_number else "")
+                    payment.mark_paid(user=request.user, treasury_date=timezone.localdate(), batch_number=batch_number or None)
                     paid += 1
             except Exception:
+                # the savepoint rolled back; the payment and its vote are untouched
+                logger.exception("Failed to mark payment %s as PAID", payment.pk)
                 errors += 1
         msg = f"{paid} payment(s) marked as PAID."
         if skipped:
             msg += f" {skipped} skipped (already PAID)."
         if errors:
             msg += f" {errors} failed."
-        self.message_user(request, msg, level=messages.INFO)
+        self.message_user(request, msg, level=messages.ERROR if errors else messages.INFO)
     action_mark_payments_paid.short_description = "Mark selected payments as PAID (FF4/Treasury)"
 
     def action_cancel_payments(self, request, queryset):
@@ -158,21 +158,17 @@ class PaymentAdmin(admin.ModelAdmin):
                     if payment.status == Payment.STATUS_CANCELLED:
                         skipped += 1
                         continue
-                    try:
-                        payment.cancel(user=request.user, reason="Cancelled via admin")
-                    except Exception:
-                        payment.status = Payment.STATUS_CANCELLED
-                        payment.save(update_fields=["status", "updated_at"])
-                        AuditLog.objects.create(user=request.user, action="Cancelled payment", payment=payment, budget_vote=payment.budget_vote, notes="Cancelled via admin")
+                    payment.cancel(user=request.user, reason="Cancelled via admin")
                     cancelled += 1
             except Exception:
+                logger.exception("Failed to cancel payment %s", payment.pk)
                 errors += 1
         msg = f"{cancelled} payment(s) cancelled."
         if skipped:
             msg += f" {skipped} skipped (already cancelled)."
         if errors:
             msg += f" {errors} failed."
-        self.message_user(request, msg, level=messages.WARNING)
+        self.message_user(request, msg, level=messages.ERROR if errors else messages.WARNING)
     action_cancel_payments.short_description = "Cancel selected payments"
 
     # --- PDF actions column and bulk generation ---
@@ -197,44 +193,25 @@ class PaymentAdmin(admin.ModelAdmin):
 
     def generate_ff4_for_selected(self, request, queryset):
         return self._bulk_generate(request, queryset, template_type="FF4")
-    generate_ff4_for_selected.short_description = "Generate FF4 (fillable) for selected payments" 
-
-def _bulk_generate(self, request, queryset, template_type):
-    template = FillablePDFTemplate.objects.filter(template_type=template_type).first()
-    if not template:
-        self.message_user(
-            request,
-            f"No template configured for {template_type}",
-            level=messages.ERROR
-        )
-        return
-
-    created = 0
-    skipped = 0
-
-    for payment in queryset:
-        exists = GeneratedPDF.objects.filter(
-            payment=payment,
-            template=template,
-            status__in=["PENDING", "READY"]
-        ).exists()
-        if exists:
-            skipped += 1
-            continue
-
-        GeneratedPDF.objects.create(
-            template=template,
-            payment=payment,
-            generated_by=request.user,
-            status="PENDING"
-        )
-        created += 1
-
-    self.message_user(
-        request,
-        f"Created {created} {template_type} PDF(s). Skipped {skipped} existing.",
-        level=messages.INFO
-    )
+    generate_ff4_for_selected.short_description = "Generate FF4 (fillable) for selected payments"
+
+    def _bulk_generate(self, request, queryset, template_type):
+        template = FillablePDFTemplate.objects.filter(template_type=template_type).first()
+        if not template:
+            self.message_user(
+                request,
+                f"No template configured for {template_type}",
+                level=messages.ERROR
+            )
+            return
+
+        batch_id, created, skipped = queue_pdf_batch(queryset, template, user=request.user)
+
+        msg = f"Queued {created} {template_type} PDF(s). Skipped {skipped} existing."
+        if batch_id:
+            msg += f" Progress: {reverse('finance:pdf_batch_progress', args=[batch_id])}"
+        self.message_user(request, msg, level=messages.INFO)
+
 
 # ---------------- FillablePDFTemplate and GeneratedPDF admin ----------------
 
@@ -291,9 +268,11 @@ class GeneratedPDFAdmin(admin.ModelAdmin):
 
 @admin.register(BudgetVote)
 class BudgetVoteAdmin(admin.ModelAdmin):
-    list_display = ("vote_code", "description", "allocation_amount", "fiscal_year", "remaining_balance")
+    list_display = ("vote_code", "description", "allocation_amount", "fiscal_year", "committed_amount", "paid_amount", "remaining_balance")
     search_fields = ("vote_code", "description")
     list_filter = ("fiscal_year",)
+    # balances are maintained by payment transitions; see reconcile_budget_votes
+    readonly_fields = ("committed_amount", "paid_amount", "remaining_balance")
 
 
 @admin.register(AuditLog)
@@ -0,0 +1,75 @@
+# finance/management/commands/reconcile_budget_votes.py
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Q, Sum
+
+from finance.models import BudgetVote, Payment
+
+CENTS = Decimal("0.01")
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute BudgetVote committed/paid/remaining balances from the Payment ledger.\n\n"
+        "By default only reports votes whose stored balances differ from the ledger.\n\n"
+        "Options:\n"
+        "  --fix          Write the recomputed balances for mismatched votes\n"
+        "  --year N       Only check votes for fiscal year N\n"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--fix", action="store_true")
+        parser.add_argument("--year", type=int, default=None)
+
+    def handle(self, *args, **options):
+        fix = options["fix"]
+        year = options["year"]
+
+        votes = BudgetVote.objects.order_by("fiscal_year", "vote_code")
+        if year:
+            votes = votes.filter(fiscal_year=year)
+
+        # One grouped query for the whole ledger instead of one aggregate per vote
+        ledger = {
+            row["budget_vote"]: row
+            for row in Payment.objects.exclude(budget_vote=None).values("budget_vote").annotate(
+                committed=Sum("amount", filter=Q(status=Payment.STATUS_COMMITTED)),
+                paid=Sum("amount", filter=Q(status=Payment.STATUS_PAID)),
+            )
+        }
+
+        checked = mismatched = 0
+        for vote in votes:
+            checked += 1
+            row = ledger.get(vote.pk, {})
+            committed = Decimal(row.get("committed") or 0).quantize(CENTS)
+            paid = Decimal(row.get("paid") or 0).quantize(CENTS)
+            remaining = BudgetVote.compute_remaining(vote.allocation_amount, committed, paid)
+
+            if (vote.committed_amount, vote.paid_amount, vote.remaining_balance) == (committed, paid, remaining):
+                continue
+
+            mismatched += 1
+            self.stdout.write(
+                f"{vote}: committed {vote.committed_amount} -> {committed}, "
+                f"paid {vote.paid_amount} -> {paid}, "
+                f"remaining {vote.remaining_balance} -> {remaining}"
+            )
+
+            if fix:
+                with transaction.atomic():
+                    locked = BudgetVote.objects.select_for_update().get(pk=vote.pk)
+                    locked.committed_amount = committed
+                    locked.paid_amount = paid
+                    locked.save(update_fields=["committed_amount", "paid_amount"])
+
+        self.stdout.write(f"\nChecked: {checked}")
+        self.stdout.write(f"Mismatched: {mismatched}")
+        if mismatched and fix:
+            self.stdout.write(self.style.SUCCESS(f"Fixed {mismatched} vote(s)."))
+        elif mismatched:
+            self.stdout.write(self.style.WARNING("Run again with --fix to write the ledger values."))
+        else:
+            self.stdout.write(self.style.SUCCESS("All vote balances match the ledger."))
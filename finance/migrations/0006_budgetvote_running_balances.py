@@ -0,0 +1,50 @@
+# Generated by Django 5.2 on 2026-10-17 22:49
+
+from decimal import Decimal
+from django.db import migrations, models
+from django.db.models import Q, Sum
+
+
+def backfill_balances(apps, schema_editor):
+    BudgetVote = apps.get_model('finance', 'BudgetVote')
+    Payment = apps.get_model('finance', 'Payment')
+
+    totals = {
+        row['budget_vote']: row
+        for row in Payment.objects.exclude(budget_vote=None).values('budget_vote').annotate(
+            committed=Sum('amount', filter=Q(status='COMMITTED')),
+            paid=Sum('amount', filter=Q(status='PAID')),
+        )
+    }
+    for vote in BudgetVote.objects.all():
+        row = totals.get(vote.pk, {})
+        vote.committed_amount = row.get('committed') or Decimal('0.00')
+        vote.paid_amount = row.get('paid') or Decimal('0.00')
+        vote.remaining_balance = vote.allocation_amount - vote.committed_amount - vote.paid_amount
+        vote.save(update_fields=['committed_amount', 'paid_amount', 'remaining_balance'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0005_remove_financialreport_generated_by_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='budgetvote',
+            name='committed_amount',
+            field=models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14),
+        ),
+        migrations.AddField(
+            model_name='budgetvote',
+            name='paid_amount',
+            field=models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14),
+        ),
+        migrations.AddField(
+            model_name='budgetvote',
+            name='remaining_balance',
+            field=models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14),
+        ),
+        migrations.RunPython(backfill_balances, migrations.RunPython.noop),
+    ]
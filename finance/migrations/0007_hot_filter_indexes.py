@@ -0,0 +1,21 @@
+# Generated by Django 5.2 on 2026-10-17 23:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0006_budgetvote_running_balances'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(fields=['application', 'status'], name='payment_app_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='generatedpdf',
+            index=models.Index(fields=['status', '-generated_at'], name='gpdf_status_generated_idx'),
+        ),
+    ]
@@ -6,6 +6,8 @@ from django.contrib.auth import get_user_model
 from django.conf import settings
 from django.utils import timezone
 
+from utils.dirty import DirtyFieldsMixin
+
 User = get_user_model()
 
 
@@ -15,6 +17,12 @@ class BudgetVote(models.Model):
     allocation_amount = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal("0.00"))
     fiscal_year = models.IntegerField(default=2025)
 
+    # Running balances, maintained by Payment transitions (see record_payment_change)
+    # and repaired by the reconcile_budget_votes command.
+    committed_amount = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal("0.00"))
+    paid_amount = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal("0.00"))
+    remaining_balance = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal("0.00"))
+
     class Meta:
         unique_together = ("vote_code", "fiscal_year")
         ordering = ("-fiscal_year", "vote_code")
@@ -22,25 +30,56 @@ class BudgetVote(models.Model):
     def __str__(self):
         return f"{self.vote_code} ({self.fiscal_year})"
 
-    @property
-    def committed_amount(self):
-        # COMMITTED only (not PAID, not CANCELLED)
-        total = self.payments.filter(status=Payment.STATUS_COMMITTED).aggregate(
-            total=Sum("amount")
-        )["total"] or Decimal("0.00")
-        return Decimal(total)
-
-    @property
-    def paid_amount(self):
-        total = self.payments.filter(status=Payment.STATUS_PAID).aggregate(
-            total=Sum("amount")
-        )["total"] or Decimal("0.00")
-        return Decimal(total)
-
-    @property
-    def remaining_balance(self):
-        # Allocation - (Committed + Paid)
-        return Decimal(self.allocation_amount) - self.committed_amount
+    def save(self, *args, **kwargs):
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            # full saves (admin form) must not overwrite balances moved since the row was loaded
+            stored = BudgetVote.objects.filter(pk=self.pk).values("committed_amount", "paid_amount").first()
+            if stored:
+                self.committed_amount = stored["committed_amount"]
+                self.paid_amount = stored["paid_amount"]
+        # kept in step when allocation is edited
+        self.remaining_balance = self.compute_remaining(self.allocation_amount, self.committed_amount, self.paid_amount)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "remaining_balance" not in update_fields:
+            kwargs["update_fields"] = list(update_fields) + ["remaining_balance"]
+        super().save(*args, **kwargs)
+
+    @staticmethod
+    def compute_remaining(allocation, committed, paid):
+        """
+        Allocation - (Committed + Paid): money already paid out is spent, so it
+        never becomes available for new commitments again.
+        """
+        return Decimal(allocation or 0) - Decimal(committed or 0) - Decimal(paid or 0)
+
+    @classmethod
+    def record_payment_change(cls, vote_id, amount, old_status=None, new_status=None):
+        """
+        Move `amount` out of the old status bucket and into the new one on the
+        stored running balances. The vote row is locked for the update, so
+        call this inside the payment's transaction.
+        """
+        if not vote_id:
+            return None
+        vote = cls.objects.select_for_update().get(pk=vote_id)
+        amount = Decimal(amount or 0)
+        for status, sign in ((old_status, -1), (new_status, 1)):
+            if status == Payment.STATUS_COMMITTED:
+                vote.committed_amount += sign * amount
+            elif status == Payment.STATUS_PAID:
+                vote.paid_amount += sign * amount
+        vote.save(update_fields=["committed_amount", "paid_amount"])
+        return vote
+
+    def ledger_totals(self):
+        """
+        Recompute committed/paid from the Payment ledger (used by reconciliation).
+        """
+        totals = self.payments.aggregate(
+            committed=Sum("amount", filter=models.Q(status=Payment.STATUS_COMMITTED)),
+            paid=Sum("amount", filter=models.Q(status=Payment.STATUS_PAID)),
+        )
+        return {k: Decimal(v or Decimal("0.00")) for k, v in totals.items()}
 
 
 
@@ -58,7 +97,7 @@ class PaymentQuerySet(models.QuerySet):
         return self.aggregate(total=Sum("amount"))["total"] or Decimal("0.00")
 
 
-class Payment(models.Model):
+class Payment(DirtyFieldsMixin, models.Model):
     STATUS_COMMITTED = "COMMITTED"
     STATUS_PAID = "PAID"
     STATUS_CANCELLED = "CANCELLED"
@@ -99,6 +138,8 @@ class Payment(models.Model):
             models.Index(fields=["status"]),
             models.Index(fields=["batch_number"]),
             models.Index(fields=["vendor_code"]),
+            # per-application paid/committed sums (pools, dashboards)
+            models.Index(fields=["application", "status"], name="payment_app_status_idx"),
         ]
         constraints = [
             models.CheckConstraint(check=models.Q(amount__gt=0), name="payment_amount_gt_0"),
@@ -109,35 +150,83 @@ class Payment(models.Model):
         inst_label = inst.name if inst else "Unknown Institution"
         return f"PGK {self.amount} - {inst_label} ({self.status})"
 
+    @transaction.atomic
+    def save(self, *args, **kwargs):
+        """
+        New payments and full-form edits (admin change form) are applied to the
+        vote balances here; the status transitions below pass update_fields and
+        move the balances themselves. Deletes are handled in signals.py.
+        """
+        self.clear_application_totals()
+        if self._state.adding:
+            super().save(*args, **kwargs)
+            BudgetVote.record_payment_change(self.budget_vote_id, self.amount, new_status=self.status)
+            return
+
+        if kwargs.get("update_fields") is not None:
+            super().save(*args, **kwargs)
+            return
+
+        # compare against the values loaded with this instance, not a re-read row
+        ledger_fields = ("status", "amount", "budget_vote")
+        changed = any(self.has_changed(name) for name in ledger_fields)
+        old_status, old_amount, old_vote_id = (self.original_value(name) for name in ledger_fields)
+        super().save(*args, **kwargs)
+        if changed:
+            BudgetVote.record_payment_change(old_vote_id, old_amount, old_status=old_status)
+            BudgetVote.record_payment_change(self.budget_vote_id, self.amount, new_status=self.status)
+
+    def clear_application_totals(self):
+        """
+        Drop the memoized total_paid/total_committed on the Application
+        instance this payment was loaded with (or created through).
+        """
+        if Payment.application.is_cached(self):
+            self.application.clear_payment_totals()
+
     @transaction.atomic
     def commit(self, user=None):
         if self.status != self.STATUS_COMMITTED:
             raise ValueError("Only payments in COMMITTED state can be re-committed.")
-        if self.budget_vote:
-            if self.budget_vote.remaining_balance < self.amount:
+        if self.budget_vote_id:
+            vote = BudgetVote.objects.select_for_update().get(pk=self.budget_vote_id)
+            if vote.remaining_balance < self.amount:
                 raise ValueError("Insufficient allocation for this commitment.")
         self.save(update_fields=["status", "updated_at"])
         AuditLog.objects.create(user=user, action="Committed (FF3)", payment=self)
         return self
 
+    def _lock(self):
+        """
+        Reload this payment under a row lock so a concurrent transition (two
+        admins running the same bulk action) is seen before the vote moves.
+        """
+        self.refresh_from_db(from_queryset=Payment.objects.select_for_update())
+
     @transaction.atomic
     def mark_paid(self, user=None, treasury_date=None, batch_number=None):
+        self._lock()
         if self.status == self.STATUS_PAID:
             return self
+        old_status = self.status
         self.status = self.STATUS_PAID
         self.treasury_release_date = treasury_date or self.treasury_release_date
         self.batch_number = batch_number or self.batch_number
         self.updated_at = timezone.now()
         self.save(update_fields=["status", "treasury_release_date", "batch_number", "updated_at"])
+        BudgetVote.record_payment_change(self.budget_vote_id, self.amount, old_status=old_status, new_status=self.status)
         AuditLog.objects.create(user=user, action="Marked as PAID (FF4/Treasury)", payment=self)
         return self
 
     @transaction.atomic
     def cancel(self, user=None, reason=None):
+        self._lock()
         if self.status == self.STATUS_CANCELLED:
             return self
+        old_status = self.status
         self.status = self.STATUS_CANCELLED
         self.save(update_fields=["status", "updated_at"])
+        BudgetVote.record_payment_change(self.budget_vote_id, self.amount, old_status=old_status, new_status=self.status)
         AuditLog.objects.create(user=user, action="Cancelled payment", payment=self, budget_vote=self.budget_vote, notes=reason or "")
         return self
 
@@ -188,6 +277,10 @@ class GeneratedPDF(models.Model):
 
     class Meta:
         ordering = ("-generated_at",)
+        indexes = [
+            # PDF queue by status, newest first (pdf_list, worker)
+            models.Index(fields=["status", "-generated_at"], name="gpdf_status_generated_idx"),
+        ]
 
     def __str__(self):
         payment_label = f"{self.payment.pk}" if self.payment else "bulk"
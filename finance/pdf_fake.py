@@ -0,0 +1,84 @@
+# finance/pdf_fake.py
+"""
+Offline stand-in for the 2pdf fill service.
+
+Enabled with TWO_PDF_USE_FAKE=True (or TWO_PDF_API_URL="fake://"). It returns
+a small, valid one-page PDF listing the submitted fields, so the bulk
+pipeline can be run end to end in development and tests without network
+access or API credits.
+"""
+import time
+
+from django.conf import settings
+
+FAKE_URL_PREFIX = "fake://"
+
+
+def fake_pdf_enabled(api_url=None):
+    if getattr(settings, "TWO_PDF_USE_FAKE", False):
+        return True
+    return bool(api_url) and str(api_url).startswith(FAKE_URL_PREFIX)
+
+
+def _escape(text):
+    return str(text).replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def render_fake_pdf(payload):
+    """
+    Build a minimal PDF document whose page lists template_id and fields.
+    """
+    lines = [f"template: {payload.get('template_id', '')}"]
+    lines += [f"{key}: {value}" for key, value in (payload.get("fields") or {}).items()]
+
+    text_ops = ["BT", "/F1 10 Tf", "50 800 Td", "14 TL"]
+    for line in lines:
+        text_ops.append(f"({_escape(line)}) Tj T*")
+    text_ops.append("ET")
+    stream = "\n".join(text_ops).encode("latin-1", "replace")
+
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+        b"/Resources << /Font << /F1 5 0 R >> >> /Contents 4 0 R >>",
+        b"<< /Length " + str(len(stream)).encode() + b" >>\nstream\n" + stream + b"\nendstream",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for num, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{num} 0 obj\n".encode() + body + b"\nendobj\n"
+    xref_at = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    for offset in offsets:
+        out += f"{offset:010d} 00000 n \n".encode()
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref_at}\n%%EOF\n".encode()
+    return bytes(out)
+
+
+class FakePDFResponse:
+    """
+    Just enough of requests.Response for generate_fillable_pdf_for_payment.
+    """
+
+    status_code = 200
+
+    def __init__(self, content):
+        self.content = content
+        self.headers = {"Content-Type": "application/pdf"}
+
+    def raise_for_status(self):
+        return None
+
+    def json(self):
+        raise ValueError("Fake PDF service returns PDF bytes, not JSON")
+
+
+def fake_post(payload):
+    delay = getattr(settings, "TWO_PDF_FAKE_DELAY", 0)
+    if delay:
+        time.sleep(delay)
+    return FakePDFResponse(render_fake_pdf(payload))
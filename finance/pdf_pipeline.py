@@ -0,0 +1,58 @@
+# finance/pdf_pipeline.py
+"""
+Bulk FF3/FF4 PDF generation.
+
+queue_pdf_batch() creates the GeneratedPDF rows for a set of payments in a
+single bulk_create and hands their ids to the run_pdf_batch task, which
+works through them in capped waves (see finance/tasks.py). Progress is
+published under the batch id via utils.progress.
+"""
+import uuid
+
+from django.db import transaction
+
+from utils.progress import set_progress
+from .models import GeneratedPDF
+from .tasks import run_pdf_batch
+
+# rows in these states already have (or are getting) a file for the template
+ACTIVE_PDF_STATUSES = ("PENDING", "PROCESSING", "READY")
+
+
+def queue_pdf_batch(payments, template, user=None):
+    """
+    Create and enqueue GeneratedPDF rows for payments that do not already
+    have an active PDF for template.
+
+    payments may be a queryset or an iterable of Payment objects / ids.
+    Returns (batch_id, created_count, skipped_count); batch_id is None when
+    nothing was created.
+    """
+    payment_ids = [getattr(p, "pk", p) for p in payments]
+
+    existing = set(
+        GeneratedPDF.objects.filter(
+            payment_id__in=payment_ids,
+            template=template,
+            status__in=ACTIVE_PDF_STATUSES,
+        ).values_list("payment_id", flat=True)
+    )
+    to_create = [pid for pid in dict.fromkeys(payment_ids) if pid not in existing]
+    skipped = len(payment_ids) - len(to_create)
+
+    if not to_create:
+        return None, 0, skipped
+
+    with transaction.atomic():
+        rows = GeneratedPDF.objects.bulk_create([
+            GeneratedPDF(template=template, payment_id=pid, generated_by=user, status="PENDING")
+            for pid in to_create
+        ])
+
+    batch_id = f"pdf-batch-{uuid.uuid4().hex}"
+    generated_pdf_ids = [row.pk for row in rows]
+    set_progress(batch_id, 0, f"Queued {len(generated_pdf_ids)} {template.template_type} PDF(s)")
+
+    # workers must not see ids before the rows are committed
+    transaction.on_commit(lambda: run_pdf_batch.delay(batch_id, generated_pdf_ids))
+    return batch_id, len(generated_pdf_ids), skipped
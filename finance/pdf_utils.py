@@ -1,13 +1,15 @@
 # finance/pdf_utils.py
 import os
 import tempfile
-import requests
 
 from django.conf import settings
 from django.core.files import File
 from django.utils import timezone
 
+from utils import http
+
 from .models import GeneratedPDF
+from .pdf_fake import fake_pdf_enabled, fake_post
 
 
 def _safe_name(payment):
@@ -37,13 +39,13 @@ def _write_pdf_to_gen(gen, pdf_bytes, filename_prefix="ff"):
             pass
 
 
-def generate_fillable_pdf_for_payment(generated_pdf_id, flatten=False, timeout=60):
+def generate_fillable_pdf_for_payment(generated_pdf_id, flatten=False, timeout=None):
     """
     Calls external 2pdf service to fill a template for a specific GeneratedPDF row.
 
     - generated_pdf_id: ID of GeneratedPDF
     - flatten: whether to flatten the PDF fields (True = non-editable)
-    - timeout: seconds for API calls
+    - timeout: seconds for API calls (default: per-host timeout from utils.http)
     """
     gen = GeneratedPDF.objects.select_related("payment__application__institution", "template").get(pk=generated_pdf_id)
 
@@ -59,7 +61,9 @@ def generate_fillable_pdf_for_payment(generated_pdf_id, flatten=False, timeout=6
     api_key = getattr(settings, "TWO_PDF_API_KEY", None)
     api_url = getattr(settings, "TWO_PDF_API_URL", None)
 
-    if not api_url:
+    use_fake = fake_pdf_enabled(api_url)
+
+    if not api_url and not use_fake:
         gen.status = "FAILED"
         gen.notes = "TWO_PDF_API_URL is not configured"
         gen.save(update_fields=["status", "notes"])
@@ -102,7 +106,10 @@ def generate_fillable_pdf_for_payment(generated_pdf_id, flatten=False, timeout=6
         gen.notes = ""
         gen.save(update_fields=["status", "notes"])
 
-        resp = requests.post(api_url, json=payload, headers=headers, timeout=timeout)
+        if use_fake:
+            resp = fake_post(payload)
+        else:
+            resp = http.post(api_url, json=payload, headers=headers, timeout=timeout)
         resp.raise_for_status()
 
         ctype = (resp.headers.get("Content-Type") or "").lower()
@@ -124,7 +131,7 @@ def generate_fillable_pdf_for_payment(generated_pdf_id, flatten=False, timeout=6
             return False
 
         # Download the pdf
-        r2 = requests.get(file_url, timeout=timeout)
+        r2 = http.get(file_url, timeout=timeout)
         r2.raise_for_status()
 
         _write_pdf_to_gen(gen, r2.content, filename_prefix=template.template_type.lower())
@@ -1,6 +1,8 @@
 # finance/permissions.py
 from django.contrib.auth.decorators import user_passes_test
 
+from utils.roles import has_any_group
+
 SECTION32_GROUP = "Section32 Officers"
 FINANCE_GROUP = "Finance Officers"
 
@@ -9,7 +11,7 @@ def is_section32_or_finance(user):
         return False
     if user.is_superuser:
         return True
-    return user.groups.filter(name__in=[SECTION32_GROUP, FINANCE_GROUP]).exists()
+    return has_any_group(user, SECTION32_GROUP, FINANCE_GROUP)
 
 
 section32_required = user_passes_test(is_section32_or_finance)
@@ -0,0 +1,23 @@
+# finance/signals.py
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from .models import BudgetVote, Payment
+
+
+# ---------- BudgetVote running balances ----------
+@receiver(post_delete, sender=Payment)
+def release_payment_from_vote(sender, instance, **kwargs):
+    """
+    Take a deleted payment out of its vote's committed/paid balance.
+
+    A receiver rather than Payment.delete(), so application cascades and
+    queryset deletes are covered too. Uses the values the row was loaded
+    with (DirtyFieldsMixin), which are what the balances last recorded.
+    """
+    instance.clear_application_totals()
+    BudgetVote.record_payment_change(
+        instance.original_value("budget_vote"),
+        instance.original_value("amount"),
+        old_status=instance.original_value("status"),
+    )
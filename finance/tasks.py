@@ -1,8 +1,11 @@
 # finance/tasks.py
 import logging
-from celery import shared_task
+from celery import chord, shared_task
+from django.conf import settings
 from django.db import transaction
+from django.db.models import Count
 
+from utils.progress import set_progress
 from .models import GeneratedPDF
 from .pdf_utils import generate_fillable_pdf_for_payment
 
@@ -64,3 +67,58 @@ def process_generated_pdf(self, generated_pdf_id):
             except Exception:
                 pass
             return {"status": "failed_max_retries", "id": generated_pdf_id, "error": str(exc)}
+
+
+# ---------------- Bulk PDF batches ----------------
+
+def _report_batch_progress(batch_id, generated_pdf_ids, finished=False):
+    counts = dict(
+        GeneratedPDF.objects.filter(pk__in=generated_pdf_ids)
+        .values_list("status")
+        .annotate(n=Count("id"))
+    )
+    total = len(generated_pdf_ids)
+    ready = counts.get("READY", 0)
+    failed = counts.get("FAILED", 0)
+    done = ready + failed
+    if finished:
+        set_progress(batch_id, 100, f"Finished: {ready} ready, {failed} failed of {total}")
+    else:
+        percent = min(99, int(done * 100 / total)) if total else 0
+        set_progress(batch_id, percent, f"{done}/{total} processed ({ready} ready, {failed} failed)")
+    return done, total
+
+
+@shared_task
+def run_pdf_batch(batch_id, generated_pdf_ids, offset=0):
+    """
+    Dispatch the next wave of a bulk PDF batch.
+
+    At most PDF_BATCH_CONCURRENCY rows are sent as one chord; the chord
+    callback queues the following wave, so a large batch never has more
+    than that many calls open against the PDF service at once.
+    """
+    size = max(1, int(getattr(settings, "PDF_BATCH_CONCURRENCY", 8)))
+    wave = generated_pdf_ids[offset:offset + size]
+    if not wave:
+        _report_batch_progress(batch_id, generated_pdf_ids, finished=True)
+        return {"batch": batch_id, "status": "done"}
+
+    chord(process_generated_pdf.s(gen_id) for gen_id in wave)(
+        pdf_batch_wave_done.s(batch_id, generated_pdf_ids, offset + len(wave))
+    )
+    return {"batch": batch_id, "status": "dispatched", "offset": offset, "size": len(wave)}
+
+
+@shared_task
+def pdf_batch_wave_done(results, batch_id, generated_pdf_ids, next_offset):
+    """
+    Chord callback: record progress and queue the next wave, if any.
+    """
+    finished = next_offset >= len(generated_pdf_ids)
+    done, total = _report_batch_progress(batch_id, generated_pdf_ids, finished=finished)
+    if not finished:
+        run_pdf_batch.delay(batch_id, generated_pdf_ids, next_offset)
+    else:
+        logger.info("PDF batch %s finished: %s/%s processed", batch_id, done, total)
+    return {"batch": batch_id, "next_offset": next_offset}
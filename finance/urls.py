@@ -12,6 +12,7 @@ urlpatterns = [
     # Generate PDFs
     path("pdfs/generate/<int:payment_id>/", views.generate_pdf_for_payment, name="generate_pdf_for_payment"),
     path("pdfs/queue/<int:generated_pdf_id>/", views.trigger_generate_pdf, name="queue_generated_pdf"),
+    path("pdfs/batches/<str:batch_id>/", views.pdf_batch_progress, name="pdf_batch_progress"),
 
     # Downloads (separate by audience)
     path("pdfs/download/<int:pk>/", views.pdf_download, name="pdf_download"),  # Section32/Finance
@@ -2,11 +2,8 @@
 import csv
 import io
 import os
-import tempfile
-import requests
 from decimal import Decimal
 
-from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth import get_user_model
 from django.contrib.auth.decorators import login_required, user_passes_test, permission_required
@@ -18,6 +15,7 @@ from django.http import (
     JsonResponse,
 )
 from django.shortcuts import get_object_or_404, redirect, render
+from django.urls import reverse
 from django.utils import timezone
 from django.views.decorators.http import require_POST
 from django.views import generic
@@ -31,10 +29,13 @@ from .models import (
     BudgetVote,
 )
 from .permissions import section32_required
+from .pdf_pipeline import queue_pdf_batch
 from .tasks import process_generated_pdf
 from django.utils.dateparse import parse_date
-from django.core.files import File
 from django.db.models import Sum
+from utils.csv_export import EXPORT_CHUNK_SIZE, streaming_csv_response
+from utils.progress import get_progress
+from utils.roles import has_any_group
 
 User = get_user_model()
 
@@ -79,11 +80,16 @@ def finance_summary_totals():
 # ---------------- Utility permission checks ----------------
 
 def is_provincial_admin(user):
-    return user.is_superuser or user.groups.filter(name="Provincial Administrators").exists()
+    return user.is_superuser or has_any_group(user, "Provincial Administrators")
 
 
 def is_section32_or_finance(user):
-    return user.is_superuser or user.groups.filter(name__in=["Section32 Officers", "Finance Officers"]).exists()
+    return user.is_superuser or has_any_group(user, "Section32 Officers", "Finance Officers")
+
+
+def can_follow_pdf_batches(user):
+    # whoever can start a batch (generate_pdf_for_payment) must be able to poll it
+    return is_section32_or_finance(user) or is_provincial_admin(user)
 
 
 # ---------------- FF4 / IFMS CSV export ----------------
@@ -91,33 +97,34 @@ def is_section32_or_finance(user):
 @login_required
 @user_passes_test(is_provincial_admin)
 def export_ff4_report(request):
-    response = HttpResponse(content_type="text/csv")
     filename = f"FF4_Report_{timezone.localdate().year}.csv"
-    response["Content-Disposition"] = f'attachment; filename="{filename}"'
 
-    writer = csv.writer(response)
-    writer.writerow(["Vendor Code", "Vendor Name", "Budget Vote", "Description", "Amount", "Treasury Release Date", "Batch Number"])
+    paid_payments = (
+        Payment.objects.filter(status=Payment.STATUS_PAID)
+        .select_related("application__institution", "budget_vote", "application__applicant__user")
+    )
 
-    paid_payments = Payment.objects.filter(status=Payment.STATUS_PAID).select_related("application__institution", "budget_vote", "application__applicant__user")
+    def rows():
+        yield ["Vendor Code", "Vendor Name", "Budget Vote", "Description", "Amount", "Treasury Release Date", "Batch Number"]
 
-    for p in paid_payments:
-        inst = getattr(p.application, "institution", None)
+        for p in paid_payments.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+            inst = getattr(p.application, "institution", None)
 
-        # Prefer Institution vendor_code if you have it, else fallback to Payment.vendor_code
-        vendor_code = getattr(inst, "vendor_code", None) or p.vendor_code or ""
-        vendor_name = getattr(inst, "name", "") if inst else ""
+            # Prefer Institution vendor_code if you have it, else fallback to Payment.vendor_code
+            vendor_code = getattr(inst, "vendor_code", None) or p.vendor_code or ""
+            vendor_name = getattr(inst, "name", "") if inst else ""
 
-        vote_code = p.budget_vote.vote_code if p.budget_vote else (p.vote_item_code or "")
+            vote_code = p.budget_vote.vote_code if p.budget_vote else (p.vote_item_code or "")
 
-        applicant_user = getattr(getattr(p.application, "applicant", None), "user", None)
-        applicant_name = applicant_user.get_full_name() if applicant_user else f"Application {p.application.pk}"
-        description = f"Scholarship for {applicant_name}"
+            applicant_user = getattr(getattr(p.application, "applicant", None), "user", None)
+            applicant_name = applicant_user.get_full_name() if applicant_user else f"Application {p.application.pk}"
+            description = f"Scholarship for {applicant_name}"
 
-        amount = f"{Decimal(p.amount):.2f}"
-        treasury_date = p.treasury_release_date.strftime("%d/%m/%Y") if p.treasury_release_date else ""
-        writer.writerow([vendor_code, vendor_name, vote_code, description, amount, treasury_date, p.batch_number or ""])
+            amount = f"{Decimal(p.amount):.2f}"
+            treasury_date = p.treasury_release_date.strftime("%d/%m/%Y") if p.treasury_release_date else ""
+            yield [vendor_code, vendor_name, vote_code, description, amount, treasury_date, p.batch_number or ""]
 
-    return response
+    return streaming_csv_response(filename, rows())
 
 
 # ---------------- Payment status endpoints ----------------
@@ -187,89 +194,32 @@ def download_generated_pdf(request, pk):
 @user_passes_test(is_provincial_admin)
 @require_POST
 def generate_pdf_for_payment(request, payment_id):
+    """
+    Queue FF4 generation for one payment. The 2pdf call runs on a Celery
+    worker; poll pdf_batch_progress with the returned batch id.
+    """
     payment = get_object_or_404(Payment, pk=payment_id)
     template = FillablePDFTemplate.objects.filter(template_type="FF4").first()
     if not template:
         return JsonResponse({"error": "FF4 template not configured"}, status=400)
 
-    gen = GeneratedPDF.objects.create(template=template, payment=payment, generated_by=request.user, status="PENDING")
-
-    applicant_user = getattr(getattr(payment.application, "applicant", None), "user", None)
-    applicant_label = payment.application.applicant.user.get_full_name()
-
-    field_map = {
-        "payment_id": str(payment.id),
-        "applicant_name": applicant_label,
-        "institution_name": getattr(getattr(payment.application, "institution", None), "name", ""),
-        "amount": f"{Decimal(payment.amount):.2f}",
-        "payment_date": payment.payment_date.strftime("%d/%m/%Y") if payment.payment_date else timezone.localdate().strftime("%d/%m/%Y"),
-        "budget_vote": payment.budget_vote.vote_code if payment.budget_vote else (payment.vote_item_code or ""),
-        "vendor_code": payment.vendor_code or "",
-        "cheque_number": payment.cheque_number or "",
-        "batch_number": payment.batch_number or "",
-        "form11_identifier": payment.form11_identifier or "",
-        "section_32_officer": payment.section_32_officer or "",
-    }
+    batch_id, created, skipped = queue_pdf_batch([payment], template, user=request.user)
+    if not batch_id:
+        gen = payment.generated_pdfs.filter(template=template).order_by("-generated_at").first()
+        return JsonResponse({"status": gen.status.lower() if gen else "skipped", "generated_pdf_id": gen.pk if gen else None})
 
-    api_key = getattr(settings, "TWO_PDF_API_KEY", None)
-    api_url = getattr(settings, "TWO_PDF_API_URL", "https://api.2pdf.com/fill")
+    return JsonResponse({
+        "status": "queued",
+        "batch_id": batch_id,
+        "progress_url": reverse("finance:pdf_batch_progress", args=[batch_id]),
+    }, status=202)
 
-    try:
-        payload = {"template_id": template.template_id, "fields": field_map, "flatten": True}
-        headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"} if api_key else {"Content-Type": "application/json"}
-        resp = requests.post(api_url, json=payload, headers=headers, timeout=30)
-        resp.raise_for_status()
-
-        content_type = resp.headers.get("Content-Type", "")
-
-        if "application/pdf" in content_type:
-            tmp = tempfile.NamedTemporaryFile(delete=False, suffix=".pdf")
-            tmp.write(resp.content)
-            tmp.flush()
-            tmp.close()
-
-            with open(tmp.name, "rb") as f:
-                gen.file.save(f"ff4_{payment.id}_{gen.id}.pdf", File(f), save=True)
-
-            os.unlink(tmp.name)
-            gen.status = "READY"
-            gen.save(update_fields=["status", "file"])
-            PDFAudit.objects.create(user=request.user, action="GENERATED", generated_pdf=gen, notes="Synchronous generation")
-            return JsonResponse({"status": "ready", "download_url": gen.file.url})
-
-        # else: service returns JSON pointing to a URL
-        data = resp.json()
-        file_url = data.get("file_url") or data.get("url")
-        if not file_url:
-            gen.status = "FAILED"
-            gen.notes = "No file returned by PDF service"
-            gen.save(update_fields=["status", "notes"])
-            return JsonResponse({"error": "No file returned by PDF service"}, status=500)
-
-        file_resp = requests.get(file_url, timeout=30)
-        file_resp.raise_for_status()
-
-        tmp = tempfile.NamedTemporaryFile(delete=False, suffix=".pdf")
-        tmp.write(file_resp.content)
-        tmp.flush()
-        tmp.close()
-
-        with open(tmp.name, "rb") as f:
-            gen.file.save(f"ff4_{payment.id}_{gen.id}.pdf", File(f), save=True)
-
-        os.unlink(tmp.name)
-        gen.status = "READY"
-        gen.external_id = data.get("id", "")
-        gen.save(update_fields=["status", "file", "external_id"])
-        PDFAudit.objects.create(user=request.user, action="GENERATED", generated_pdf=gen, notes="Synchronous generation (URL)")
-        return JsonResponse({"status": "ready", "download_url": gen.file.url})
 
-    except Exception as exc:
-        gen.status = "FAILED"
-        gen.notes = str(exc)
-        gen.save(update_fields=["status", "notes"])
-        PDFAudit.objects.create(user=request.user, action="GENERATED", generated_pdf=gen, notes=f"Failed: {exc}")
-        return JsonResponse({"error": str(exc)}, status=500)
+@login_required
+@user_passes_test(can_follow_pdf_batches)
+def pdf_batch_progress(request, batch_id):
+    """Progress of a bulk PDF batch, as published by finance.tasks."""
+    return JsonResponse(get_progress(batch_id))
 
 
 @login_required
@@ -257,4 +257,27 @@ CRISPY_TEMPLATE_PACK = "bootstrap5"
 # PDF API
 #TWO_PDF_API_KEY = env("TWO_PDF_API_KEY", default="")
 #TWO_PDF_API_URL = env("TWO_PDF_API_URL", default="https://api.2pdf.com/fill")
+# Offline fake PDF service (finance/pdf_fake.py) for development and tests
+TWO_PDF_USE_FAKE = env.bool("TWO_PDF_USE_FAKE", default=False)
+# Max PDFs in flight per bulk batch (finance/pdf_pipeline.py)
+PDF_BATCH_CONCURRENCY = env.int("PDF_BATCH_CONCURRENCY", default=8)
+
+# SwiftMassive event batching (applications/notifications.py)
+SWIFTMASSIVE_BATCH_SIZE = env.int("SWIFTMASSIVE_BATCH_SIZE", default=50)
+SWIFTMASSIVE_FLUSH_INTERVAL = env.int("SWIFTMASSIVE_FLUSH_INTERVAL", default=10)  # seconds
+SWIFTMASSIVE_MAX_ATTEMPTS = env.int("SWIFTMASSIVE_MAX_ATTEMPTS", default=5)
+# SENT rows (their data includes verification tokens) and FAILED rows are deleted after these many days
+SWIFTMASSIVE_SENT_RETENTION_DAYS = env.int("SWIFTMASSIVE_SENT_RETENTION_DAYS", default=7)
+SWIFTMASSIVE_FAILED_RETENTION_DAYS = env.int("SWIFTMASSIVE_FAILED_RETENTION_DAYS", default=30)
+
+# Document scanner OCR processes (utils/ai_scanner.py); 0 = min(4, CPU count)
+OCR_MAX_WORKERS = env.int("OCR_MAX_WORKERS", default=0)
+
+# Outbound HTTP (utils/http.py): pooled keep-alive session per process
+HTTP_POOL_MAXSIZE = env.int("HTTP_POOL_MAXSIZE", default=20)
+HTTP_DEFAULT_TIMEOUT = (5, 30)
+HTTP_TIMEOUTS = {
+    "api.2pdf.com": (5, 60),
+    "ghz0jve3kj.execute-api.us-east-1.amazonaws.com": (5, 10),
+}
 
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class InstitutionsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'institutions'
+
+    def ready(self):
+        # register the approved-pool cache invalidation receivers
+        from . import signals  # noqa: F401
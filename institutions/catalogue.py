@@ -0,0 +1,156 @@
+# institutions/catalogue.py
+"""
+The institution -> course catalogue as one versioned JSON document.
+
+Every dropdown and course lookup (application forms, legacy confirmation,
+the course APIs) reads this instead of querying Institution/Course. The
+document is built in two queries, stored in the shared cache under a
+version number and kept per process, so a warm read costs one cache get
+(the version). signals.py bumps the version after commit whenever an
+Institution or Course is saved or deleted.
+
+Responses carry a strong ETag (a hash of the document bytes, identical
+in every process), so browsers revalidate with a 304.
+"""
+import hashlib
+import json
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag
+
+from .models import Course, Institution
+
+CATALOGUE_VERSION_KEY = "institution_catalogue_version"
+CATALOGUE_KEY = "institution_catalogue:{}"
+CATALOGUE_TTL = 60 * 60 * 24  # versioned keys; the TTL only reclaims memory
+
+_local = None  # this process's Catalogue for the last version seen
+
+
+class Catalogue:
+    """
+    Institutions (by name) with their courses (by name), as plain dicts:
+    {"id", "name", "code", "courses": [{"id", "name", "code"}, ...]}.
+    """
+
+    def __init__(self, version, institutions):
+        self.version = version
+        self.institutions = institutions
+        self.content = json.dumps({"institutions": institutions}, separators=(",", ":")).encode("utf-8")
+        self.etag = hashlib.sha256(self.content).hexdigest()
+        self._by_id = {inst["id"]: inst for inst in institutions}
+
+    def institution(self, institution_id):
+        try:
+            return self._by_id.get(int(institution_id))
+        except (TypeError, ValueError):
+            return None
+
+    def courses_for(self, institution_id):
+        inst = self.institution(institution_id)
+        return inst["courses"] if inst else []
+
+    def has_course(self, institution_id, course_id):
+        return any(str(course["id"]) == str(course_id) for course in self.courses_for(institution_id))
+
+    def all_courses(self):
+        """
+        Every course with its institution_name, in institution order.
+        """
+        return [
+            {**course, "institution_name": inst["name"]}
+            for inst in self.institutions
+            for course in inst["courses"]
+        ]
+
+    # labels match Institution.__str__ / Course.__str__
+    def institution_choices(self):
+        return [("", "---------")] + [
+            (inst["id"], f"{inst['name']} ({inst['code'] or 'No Code'})") for inst in self.institutions
+        ]
+
+    def course_choices(self, institution_id):
+        inst = self.institution(institution_id)
+        courses = inst["courses"] if inst else []
+        return [("", "---------")] + [
+            (course["id"], f"{course['code']} - {course['name']} at {inst['name']}") for course in courses
+        ]
+
+
+# ---------- version ----------
+def catalogue_version():
+    version = cache.get(CATALOGUE_VERSION_KEY)
+    if version is None:
+        cache.add(CATALOGUE_VERSION_KEY, time.time_ns(), timeout=None)
+        version = cache.get(CATALOGUE_VERSION_KEY)
+    return version
+
+
+def bump_catalogue_version():
+    cache.set(CATALOGUE_VERSION_KEY, time.time_ns(), timeout=None)
+
+
+def schedule_catalogue_bump():
+    transaction.on_commit(bump_catalogue_version)
+
+
+# ---------- building / reading ----------
+def build_catalogue_data():
+    courses = {}
+    for course in Course.objects.order_by("name", "id").values("id", "name", "code", "institution_id"):
+        courses.setdefault(course.pop("institution_id"), []).append(course)
+    return [
+        {**inst, "courses": courses.get(inst["id"], [])}
+        for inst in Institution.objects.order_by("name", "id").values("id", "name", "code")
+    ]
+
+
+def get_catalogue():
+    global _local
+    version = catalogue_version()
+    local = _local
+    if local is not None and local.version == version:
+        return local
+
+    key = CATALOGUE_KEY.format(version)
+    data = cache.get(key)
+    if data is None:
+        data = build_catalogue_data()
+        cache.set(key, data, timeout=CATALOGUE_TTL)
+    _local = local = Catalogue(version, data)
+    return local
+
+
+def json_response(request, content, etag):
+    """
+    JSON bytes with a strong ETag; a matching If-None-Match gets a 304.
+    Browsers keep the body and revalidate it on each use.
+    """
+    etag = quote_etag(etag)
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = HttpResponse(content, content_type="application/json")
+    if response.status_code in (200, 304):
+        response["ETag"] = etag
+        patch_cache_control(response, public=True, max_age=0)
+    return response
+
+
+def catalogue_response(request):
+    catalogue = get_catalogue()
+    return json_response(request, catalogue.content, catalogue.etag)
+
+
+def courses_response(request, institution_id, fields=("id", "name", "code")):
+    """
+    One institution's courses from the catalogue, as the old per-institution
+    endpoints returned them.
+    """
+    catalogue = get_catalogue()
+    courses = [{name: course[name] for name in fields} for course in catalogue.courses_for(institution_id)]
+    content = json.dumps(courses, separators=(",", ":")).encode("utf-8")
+    return json_response(request, content, hashlib.sha256(content).hexdigest())
@@ -1,8 +1,60 @@
 from django.db import models
 from django.core.validators import RegexValidator
 from django.apps import apps
+from django.db.models import Count, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Coalesce
 from decimal import Decimal
 
+# pool name (URLs, templates) -> prefix of the with_pool_stats() annotations;
+# the prefix upper-cased is the Application status
+POOLS = {
+    'selected': 'approved',
+    'pending': 'pending',
+    'rejected': 'rejected',
+}
+
+
+class InstitutionQuerySet(models.QuerySet):
+    def with_pool_stats(self):
+        """
+        Annotate, in one grouped query:
+          total_applications, approved_count / pending_count / rejected_count,
+          approved_tuition / pending_tuition / rejected_tuition (course fees),
+          approved_paid / approved_committed (payments on the approved pool).
+        Payment sums are correlated subqueries so the payments join cannot
+        multiply the application counts.
+        """
+        from finance.models import Payment
+
+        def payments(status):
+            return Coalesce(
+                Subquery(
+                    Payment.objects.filter(
+                        application__institution=OuterRef('pk'),
+                        application__status=POOLS['selected'].upper(),
+                        status=status,
+                    )
+                    .order_by()
+                    .values('application__institution')
+                    .annotate(total=Sum('amount'))
+                    .values('total')
+                ),
+                Decimal('0.00'),
+            )
+
+        annotations = {'total_applications': Count('applications')}
+        for prefix in POOLS.values():
+            in_pool = Q(applications__status=prefix.upper())
+            annotations[f'{prefix}_count'] = Count('applications', filter=in_pool)
+            annotations[f'{prefix}_tuition'] = Coalesce(
+                Sum('applications__course__total_tuition_fee', filter=in_pool), Decimal('0.00')
+            )
+        return self.annotate(
+            **annotations,
+            approved_paid=payments(Payment.STATUS_PAID),
+            approved_committed=payments(Payment.STATUS_COMMITTED),
+        )
+
 
 class Institution(models.Model):
     name = models.CharField(max_length=255)
@@ -34,6 +86,8 @@ class Institution(models.Model):
     ]
     status = models.CharField(max_length=12, choices=STATUS_CHOICES, default="ACTIVE")
 
+    objects = InstitutionQuerySet.as_manager()
+
     class Meta:
         ordering = ["name"]
 
@@ -62,6 +116,24 @@ class Institution(models.Model):
         Application = apps.get_model("applications", "Application")
         return self.applications_qs().filter(status=Application.STATUS_REJECTED)
 
+    def pool_applications(self, pool):
+        """
+        Applications in a named pool ('selected', 'pending', 'rejected');
+        raises KeyError for an unknown pool.
+        """
+        return self.applications_qs().filter(status=POOLS[pool].upper())
+
+    def pool_stats(self, pool):
+        """
+        {'count', 'tuition'} for a pool; needs an instance loaded through
+        Institution.objects.with_pool_stats().
+        """
+        prefix = POOLS[pool]
+        return {
+            'count': getattr(self, f'{prefix}_count'),
+            'tuition': getattr(self, f'{prefix}_tuition'),
+        }
+
     def total_payments(self):
         from finance.models import Payment
         return Payment.objects.filter(application__institution=self).total_amount()
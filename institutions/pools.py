@@ -0,0 +1,139 @@
+# institutions/pools.py
+"""
+Approved-pool finance listing, shared by the full page and the modal fragment.
+
+Pool totals are cached per institution under a "ledger version" counter.
+Any write that can move an institution's numbers (payment or application
+save/delete, course fee change; see signals.py) bumps the counter after
+commit, so totals cached under the old version are simply never read
+again. A warm request costs the one indexed page query.
+"""
+import time
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db import transaction
+from django.db.models import F, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+from .models import POOLS, Institution
+
+APPROVED_POOL_PAGE_SIZE = 25
+POOL_TOTALS_TTL = 60 * 60  # bounds staleness for writes that bypass signals
+
+LEDGER_VERSION_KEY = "institution_ledger_version:{}"
+POOL_TOTALS_KEY = "approved_pool_totals:{}:{}"
+
+
+# ---------- ledger version ----------
+def ledger_version(institution_id):
+    key = LEDGER_VERSION_KEY.format(institution_id)
+    version = cache.get(key)
+    if version is None:
+        # seed from the clock so a counter lost to eviction never restarts
+        # at a number whose totals are still cached
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def bump_ledger_version(*institution_ids):
+    for institution_id in {pk for pk in institution_ids if pk}:
+        key = LEDGER_VERSION_KEY.format(institution_id)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, time.time_ns(), timeout=None)
+
+
+def schedule_ledger_bump(*institution_ids):
+    """
+    Bump after the surrounding transaction commits, so a reader can never
+    cache totals computed before the write under the new version.
+    """
+    transaction.on_commit(lambda: bump_ledger_version(*institution_ids))
+
+
+# ---------- queries ----------
+def _payment_sum(status):
+    from finance.models import Payment
+    return Coalesce(
+        Subquery(
+            Payment.objects.filter(application=OuterRef('pk'), status=status)
+            .order_by()
+            .values('application')
+            .annotate(total=Sum('amount'))
+            .values('total')
+        ),
+        Decimal('0.00'),
+    )
+
+
+def approved_pool_rows(institution_id):
+    """
+    Approved applications of an institution with paid_amount,
+    committed_amount, tuition_fee and outstanding per row. The sums are
+    correlated subqueries, so only the rows of the requested page pay for them.
+    """
+    from applications.models import Application
+    from finance.models import Payment
+    return (
+        Application.objects
+        .filter(institution_id=institution_id, status=POOLS['selected'].upper())
+        .select_related('applicant__user', 'course')
+        .annotate(
+            paid_amount=_payment_sum(Payment.STATUS_PAID),
+            committed_amount=_payment_sum(Payment.STATUS_COMMITTED),
+            tuition_fee=F('course__total_tuition_fee'),
+        )
+        .annotate(outstanding=F('tuition_fee') - F('paid_amount'))
+        .order_by('-submission_date', '-id')
+    )
+
+
+def approved_pool_totals(institution_id):
+    """
+    {'count', 'pool_total_tuition', 'pool_total_paid', 'pool_total_committed',
+    'pool_total_outstanding'} for the approved pool, cached per ledger version.
+    """
+    # read the version before computing: a write that lands meanwhile bumps
+    # it, and these totals end up under a version nobody reads any more
+    key = POOL_TOTALS_KEY.format(institution_id, ledger_version(institution_id))
+    totals = cache.get(key)
+    if totals is None:
+        stats = (
+            Institution.objects.with_pool_stats()
+            .filter(pk=institution_id)
+            .values('approved_count', 'approved_tuition', 'approved_paid', 'approved_committed')
+            .first()
+        ) or {}
+        totals = {
+            'count': stats.get('approved_count', 0),
+            'pool_total_tuition': stats.get('approved_tuition', Decimal('0.00')),
+            'pool_total_paid': stats.get('approved_paid', Decimal('0.00')),
+            'pool_total_committed': stats.get('approved_committed', Decimal('0.00')),
+        }
+        totals['pool_total_outstanding'] = totals['pool_total_tuition'] - totals['pool_total_paid']
+        cache.set(key, totals, timeout=POOL_TOTALS_TTL)
+    return totals
+
+
+def approved_pool_page(institution_id, page_number=1, per_page=APPROVED_POOL_PAGE_SIZE):
+    """
+    Return (page_obj, totals, page_subtotal) for one page of the approved pool.
+    """
+    totals = approved_pool_totals(institution_id)
+
+    paginator = Paginator(approved_pool_rows(institution_id), per_page)
+    paginator.count = totals['count']  # known from the cached totals
+    page_obj = paginator.get_page(page_number)
+    page_obj.object_list = rows = list(page_obj.object_list)
+
+    page_subtotal = {
+        'page_tuition': sum((app.tuition_fee or Decimal('0.00') for app in rows), Decimal('0.00')),
+        'page_paid': sum((app.paid_amount for app in rows), Decimal('0.00')),
+        'page_committed': sum((app.committed_amount for app in rows), Decimal('0.00')),
+    }
+    page_subtotal['page_outstanding'] = page_subtotal['page_tuition'] - page_subtotal['page_paid']
+    return page_obj, totals, page_subtotal
@@ -0,0 +1,55 @@
+# institutions/signals.py
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .catalogue import schedule_catalogue_bump
+from .models import Course, Institution
+from .pools import schedule_ledger_bump
+
+
+# ---------- Approved-pool totals cache (pools.py) ----------
+@receiver(post_save, sender="finance.Payment")
+@receiver(post_delete, sender="finance.Payment")
+def bump_ledger_on_payment(sender, instance, **kwargs):
+    if kwargs.get("raw"):
+        return
+    # use the loaded application when there is one; otherwise one indexed lookup
+    application = sender._meta.get_field("application").get_cached_value(instance, None)
+    if application is not None:
+        institution_id = application.institution_id
+    else:
+        from applications.models import Application
+        institution_id = (
+            Application.objects.filter(pk=instance.application_id)
+            .values_list("institution_id", flat=True)
+            .first()
+        )
+    schedule_ledger_bump(institution_id)
+
+
+@receiver(post_save, sender="applications.Application")
+@receiver(post_delete, sender="applications.Application")
+def bump_ledger_on_application(sender, instance, **kwargs):
+    if kwargs.get("raw"):
+        return
+    # an application moved to another institution leaves the old pool too
+    schedule_ledger_bump(instance.institution_id, instance.original_value("institution"))
+
+
+@receiver(post_save, sender=Course)
+def bump_ledger_on_course(sender, instance, created, **kwargs):
+    # a fee change moves the tuition totals of every application on the course
+    if kwargs.get("raw") or created:
+        return
+    schedule_ledger_bump(instance.institution_id)
+
+
+# ---------- Institution/course catalogue (catalogue.py) ----------
+@receiver(post_save, sender=Institution)
+@receiver(post_delete, sender=Institution)
+@receiver(post_save, sender=Course)
+@receiver(post_delete, sender=Course)
+def bump_catalogue(sender, instance, **kwargs):
+    if kwargs.get("raw"):
+        return
+    schedule_catalogue_bump()
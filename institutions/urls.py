@@ -8,6 +8,7 @@ urlpatterns = [
     # Institution management
     path('', views.manage_institutions, name='list'),
     path('manage/', views.manage_institutions, name='manage'),
+    path("api/catalogue/", views.catalogue_api, name="catalogue"),
     path("api/courses/", views.courses_by_institution, name="courses_by_institution"),
     path("get-courses/<int:institution_id>/", views.get_courses, name="get_courses"),
     # -------- FINANCE / APPROVED POOL (MOST SPECIFIC FIRST) --------
@@ -16,6 +17,11 @@ urlpatterns = [
         views.institution_approved_pool,
         name='approved_pool'
     ),
+    path(
+        'pool/<int:institution_id>/finance/fragment/',
+        views.institution_approved_pool_fragment,
+        name='approved_pool_fragment'
+    ),
 
     # -------- EXPORT --------
     path(
@@ -54,9 +60,4 @@ urlpatterns = [
         views.institution_stats_view,
         name='institution_stats'
     ),
-    path(
-        'get-courses/<int:institution_id>/',
-        views.get_courses,
-        name='get_courses'
-    ),
 ]
@@ -1,64 +1,55 @@
 # institutions/views.py
 from django.shortcuts import render, get_object_or_404, redirect
 from django.http import Http404
-from django.db.models import Count, Sum, F, DecimalField, Q
-from .models import Institution, Course
+from .models import POOLS, Institution, Course
 from .forms import CourseForm
-from applications.models import Application
+from .catalogue import catalogue_response, courses_response, get_catalogue
+from .pools import approved_pool_page
 from django.core.paginator import Paginator
-from django.db.models.functions import Coalesce
-from finance.models import Payment
 from django.contrib.admin.views.decorators import staff_member_required
+from django.contrib.auth.decorators import permission_required
 import csv
 from django.http import HttpResponse, JsonResponse
 
 from decimal import Decimal, ROUND_HALF_UP
+import itertools
+from utils.csv_export import format_currency as _format_currency, grouped_rows, streaming_csv_response
 
 
-def courses_by_institution(request):
-    inst_id = request.GET.get("institution_id")
-    courses = Course.objects.filter(institution_id=inst_id).values("id", "name", "code")
-    return JsonResponse(list(courses), safe=False)
+def catalogue_api(request):
+    """
+    The whole institution -> course tree; forms load it once and filter locally.
+    """
+    return catalogue_response(request)
 
-def _format_currency(amount):
-    amt = Decimal(amount or 0).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
-    return f"PGK{amt:,.2f}"
 
-def export_pool_csv(request, institution_id, pool='pending'):
-    institution = get_object_or_404(Institution, id=institution_id)
+def courses_by_institution(request):
+    return courses_response(request, request.GET.get("institution_id"))
 
-    pool_map = {
-        'selected': institution.selected_applications(),
-        'pending': institution.pending_applications(),
-        'rejected': institution.rejected_applications(),
-    }
-    if pool not in pool_map:
+@staff_member_required
+@permission_required('institutions.view_institution', raise_exception=True)
+def export_pool_csv(request, institution_id, pool='pending'):
+    if pool not in POOLS:
         raise Http404("Unknown pool")
+    institution = get_object_or_404(Institution.objects.with_pool_stats(), id=institution_id)
+    stats = institution.pool_stats(pool)
 
-    qs = pool_map[pool].select_related('applicant__user', 'course').order_by('applicant__user__last_name')
-
-    # Prepare response
-    filename = f"{institution.name.replace(' ', '_')}_{pool}_pool.csv"
-    response = HttpResponse(content_type='text/csv')
-    response['Content-Disposition'] = f'attachment; filename="{filename}"'
-    writer = csv.writer(response)
+    qs = institution.pool_applications(pool).select_related('applicant__user', 'course').order_by('applicant__user__last_name', 'id')
 
     # Header (customize as needed)
-    writer.writerow([institution.name])
-    writer.writerow([f"Pool: {pool.capitalize()}"])
-    writer.writerow([])
-
-    # Column headers
-    writer.writerow(['No.', 'First Name', 'Surname', 'Gender', 'Institution', 'Course', 'Tuition Fee', 'District', 'Year Of Study'])
-
-    subtotal = Decimal('0.00')
-    for idx, app in enumerate(qs, start=1):
+    header = [
+        [institution.name],
+        [f"Pool: {pool.capitalize()}"],
+        [f"Applications: {stats['count']}"],
+        [],
+        # Column headers
+        ['No.', 'First Name', 'Surname', 'Gender', 'Institution', 'Course', 'Tuition Fee', 'District', 'Year Of Study'],
+    ]
+
+    def row(idx, app, _group):
         tuition = getattr(app.course, 'total_tuition_fee', Decimal('0.00')) or Decimal('0.00')
-        subtotal += Decimal(tuition)
         gender = getattr(app.applicant, "gender", "") if app.applicant else ""
-        district = getattr(app, "origin_district", "") or getattr(app, "residency_district", "")
-
-        writer.writerow([
+        return [
             idx,
             app.applicant.user.first_name if app.applicant and app.applicant.user else '',
             app.applicant.user.last_name if app.applicant and app.applicant.user else '',
@@ -68,14 +59,19 @@ def export_pool_csv(request, institution_id, pool='pending'):
             _format_currency(tuition),
             getattr(app, 'district', '') or '',
             getattr(app, 'year_of_study', '') or '',
-        ])
-
-    # Subtotal and grand total (for a single institution grand == subtotal)
-    writer.writerow([])
-    writer.writerow(['', '', '', '', '', 'Pool total', _format_currency(subtotal)])
-    writer.writerow([])
+        ]
+
+    # Single institution, so the pool total is the only total row
+    rows = grouped_rows(
+        qs,
+        row=row,
+        amount=lambda app: getattr(app.course, 'total_tuition_fee', None),
+        subtotal_label='Pool total',
+        grand_total_label=None,
+    )
 
-    return response
+    filename = f"{institution.name.replace(' ', '_')}_{pool}_pool.csv"
+    return streaming_csv_response(filename, itertools.chain(header, rows, [[]]))
 
 def manage_institutions(request):
     """
@@ -116,15 +112,15 @@ def manage_institutions(request):
     })
 
 def institution_modal(request, institution_id):
-    institution = get_object_or_404(Institution, id=institution_id)
+    # status counts come back with the institution row (one grouped query)
+    institution = get_object_or_404(Institution.objects.with_pool_stats(), id=institution_id)
     courses = institution.courses.all()
 
-    # Use Application status constants for safety
     stats = {
-        'total': institution.applications_qs().count(),
-        'approved': institution.selected_applications().count(),
-        'rejected': institution.rejected_applications().count(),
-        'pending': institution.pending_applications().count(),
+        'total': institution.total_applications,
+        'approved': institution.approved_count,
+        'rejected': institution.rejected_count,
+        'pending': institution.pending_count,
     }
     return render(request, 'institutions/institution_modal.html', {
         'institution': institution,
@@ -149,50 +145,41 @@ def add_course_modal(request, institution_id):
 
 
 def institution_stats_view(request):
-    # Use consistent status keys; 'awarded' was not defined on Application — use STATUS_APPROVED
     institution_stats = (
-        Application.objects
-        .values('institution__name')
-        .annotate(
-            applicants=Count('id'),
-            awarded=Count('id', filter=Q(status=Application.STATUS_APPROVED))
-        )
-        .order_by('-applicants')
+        Institution.objects.with_pool_stats()
+        .filter(total_applications__gt=0)
+        .order_by('-total_applications', 'name')
     )
     return render(request, 'institutions/institution_stats.html', {'institution_stats': institution_stats})
 
 
-def get_courses(request, institution_id):
-    courses = Course.objects.filter(institution_id=institution_id).values('id', 'name')
-    return JsonResponse(list(courses), safe=False)
+def page_tuition(page_obj):
+    return sum(
+        (app.course.total_tuition_fee for app in page_obj
+         if app.course and app.course.total_tuition_fee is not None),
+        Decimal('0.00'),
+    )
 
 
 # New: view to show pools for an institution (paginated)
 
 def institution_pools(request, institution_id, pool='pending'):
-    institution = get_object_or_404(Institution, id=institution_id)
-
-    pool_map = {
-        'selected': institution.selected_applications(),
-        'pending': institution.pending_applications(),
-        'rejected': institution.rejected_applications(),
-    }
-    if pool not in pool_map:
+    if pool not in POOLS:
         raise Http404("Unknown pool")
+    # pool count and tuition total come back with the institution row
+    institution = get_object_or_404(Institution.objects.with_pool_stats(), id=institution_id)
+    stats = institution.pool_stats(pool)
+    pool_total = stats['tuition']
 
     # base queryset for the pool (use select_related to avoid N+1)
-    qs = pool_map[pool].select_related('applicant__user', 'course').order_by('-submission_date')
+    qs = institution.pool_applications(pool).select_related('applicant__user', 'course').order_by('-submission_date', '-id')
 
-    # total tuition for the entire pool (sum of course.total_tuition_fee)
-    pool_total = qs.aggregate(total=Coalesce(Sum('course__total_tuition_fee'), Decimal('0.00')))['total']
-
-    # paginate and compute subtotal for the current page
     paginator = Paginator(qs, 25)
-    page_number = request.GET.get('page', 1)
-    page_obj = paginator.get_page(page_number)
+    paginator.count = stats['count']  # already known; skips the COUNT(*)
+    page_obj = paginator.get_page(request.GET.get('page', 1))
 
-    # subtotal for the current page
-    page_subtotal = qs.aggregate(total=Coalesce(Sum('course__total_tuition_fee'), Decimal('0.00')))['total']
+    # subtotal for the rows on this page, from the rows already fetched
+    page_subtotal = page_tuition(page_obj)
 
     return render(request, 'institutions/pool_list.html', {
         'institution': institution,
@@ -205,44 +192,9 @@ def institution_pools(request, institution_id, pool='pending'):
 @staff_member_required
 def institution_approved_pool(request, institution_id):
     institution = get_object_or_404(Institution, pk=institution_id)
+    page_obj, totals, page_subtotal = approved_pool_page(institution.pk, request.GET.get('page', 1))
 
-    base_qs = Application.objects.filter(
-        institution=institution,
-        status=Application.STATUS_APPROVED
-    ).select_related('applicant__user', 'course')
-
-    annotated_qs = base_qs.annotate(
-        paid_amount=Coalesce(
-            Sum('payments__amount', filter=Q(payments__status=Payment.STATUS_PAID)),
-            Decimal('0.00')
-        ),
-        committed_amount=Coalesce(
-            Sum('payments__amount', filter=Q(payments__status=Payment.STATUS_COMMITTED)),
-            Decimal('0.00')
-        ),
-        tuition_fee=F('course__total_tuition_fee'),
-    ).annotate(
-        outstanding=F('tuition_fee') - F('paid_amount')
-    ).order_by('-submission_date')
-
-    paginator = Paginator(annotated_qs, 25)
-    page_obj = paginator.get_page(request.GET.get('page', 1))
-
-    totals = annotated_qs.aggregate(
-        pool_total_tuition=Coalesce(Sum('tuition_fee'), Decimal('0.00')),
-        pool_total_paid=Coalesce(Sum('paid_amount'), Decimal('0.00')),
-        pool_total_committed=Coalesce(Sum('committed_amount'), Decimal('0.00')),
-    )
-    totals['pool_total_outstanding'] = totals['pool_total_tuition'] - totals['pool_total_paid']
-
-    page_subtotal = page_obj.object_list.aggregate(
-        page_tuition=Coalesce(Sum('tuition_fee'), Decimal('0.00')),
-        page_paid=Coalesce(Sum('paid_amount'), Decimal('0.00')),
-        page_committed=Coalesce(Sum('committed_amount'), Decimal('0.00')),
-    )
-    page_subtotal['page_outstanding'] = page_subtotal['page_tuition'] - page_subtotal['page_paid']
-
-    return render(request, 'institution/approved_pool.html', {
+    return render(request, 'institutions/approved_pool.html', {
         'institution': institution,
         'page_obj': page_obj,
         'totals': totals,
@@ -256,37 +208,17 @@ def institution_approved_pool_fragment(request, institution_id):
     the full layout — suitable for AJAX/modal insertion.
     """
     institution = get_object_or_404(Institution, pk=institution_id)
+    page_obj, totals, page_subtotal = approved_pool_page(institution.pk, request.GET.get('page', 1))
 
-    # reuse the same queryset/aggregation logic as above
-    base_qs = Application.objects.filter(
-        institution=institution,
-        status=Application.STATUS_APPROVED
-    ).select_related('applicant__user', 'course')
-
-    annotated_qs = base_qs.annotate(
-        paid_amount=Coalesce(Sum('payments__amount', filter=Q(payments__status=Payment.STATUS_PAID)), Decimal('0.00')),
-        committed_amount=Coalesce(Sum('payments__amount', filter=Q(payments__status=Payment.STATUS_COMMITTED)), Decimal('0.00')),
-        tuition_fee=F('course__total_tuition_fee'),
-    ).annotate(outstanding=F('tuition_fee') - F('paid_amount')).order_by('-submission_date')
-
-    paginator = Paginator(annotated_qs, 25)
-    page_obj = paginator.get_page(request.GET.get('page', 1))
-
-    totals = annotated_qs.aggregate(
-        pool_total_tuition=Coalesce(Sum('tuition_fee'), Decimal('0.00')),
-        pool_total_paid=Coalesce(Sum('paid_amount'), Decimal('0.00')),
-        pool_total_committed=Coalesce(Sum('committed_amount'), Decimal('0.00')),
-    )
-    totals['pool_total_outstanding'] = totals['pool_total_tuition'] - totals['pool_total_paid']
-
-    return render(request, 'institution/_approved_pool_fragment.html', {
+    return render(request, 'institutions/_approved_pool_fragment.html', {
         'institution': institution,
         'page_obj': page_obj,
         'totals': totals,
+        'page_subtotal': page_subtotal,
     })
 
 
 def get_courses(request, institution_id):
-    institution = get_object_or_404(Institution, pk=institution_id)
-    courses = Course.objects.filter(institution=institution).order_by("name").values("id", "name")
-    return JsonResponse(list(courses), safe=False)
+    if get_catalogue().institution(institution_id) is None:
+        raise Http404("No Institution matches the given query.")
+    return courses_response(request, institution_id, fields=("id", "name"))
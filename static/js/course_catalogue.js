@@ -0,0 +1,52 @@
+// static/js/course_catalogue.js
+// Institution -> course catalogue for the application form dropdowns.
+// The whole tree is downloaded once per browser session (kept in
+// sessionStorage with its ETag); later pages only revalidate it (304), and
+// changing the institution filters locally instead of calling the server.
+window.courseCatalogue = (function () {
+  const script = document.currentScript;
+  const url = (script && script.dataset.catalogueUrl) || '/institutions/api/catalogue/';
+  const storageKey = 'gss.courseCatalogue';
+  let loading = null;
+
+  function stored() {
+    try {
+      return JSON.parse(sessionStorage.getItem(storageKey));
+    } catch (e) {
+      return null;
+    }
+  }
+
+  function load() {
+    if (loading) return loading;
+    const cached = stored();
+    const headers = cached && cached.etag ? { 'If-None-Match': cached.etag } : {};
+
+    loading = fetch(url, { headers: headers, cache: 'no-store', credentials: 'same-origin' })
+      .then(function (res) {
+        if (res.status === 304 && cached) return cached.doc;
+        if (!res.ok) throw new Error('Bad response');
+        const etag = res.headers.get('ETag');
+        return res.json().then(function (doc) {
+          try {
+            sessionStorage.setItem(storageKey, JSON.stringify({ etag: etag, doc: doc }));
+          } catch (e) { /* storage full or disabled: keep it in memory only */ }
+          return doc;
+        });
+      })
+      .catch(function (err) {
+        loading = null;
+        throw err;
+      });
+    return loading;
+  }
+
+  function coursesFor(institutionId) {
+    return load().then(function (doc) {
+      const inst = doc.institutions.find(function (i) { return String(i.id) === String(institutionId); });
+      return inst ? inst.courses : [];
+    });
+  }
+
+  return { load: load, coursesFor: coursesFor };
+})();
@@ -1,7 +1,14 @@
 # utils/ai_scanner.py
-from io import BytesIO
+import hashlib
+import multiprocessing
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from io import BytesIO
+
 import fitz  # PyMuPDF
+from django.conf import settings
+from django.core.cache import cache
 from PIL import Image, ImageOps
 import pytesseract
 
@@ -42,6 +49,17 @@ def extract_gpa(text: str):
     return None
 
 
+# Binarization threshold as a 256-entry lookup table: Image.point() applies it
+# in C instead of calling a Python function for every pixel.
+BINARIZE_THRESHOLD = 160
+_BINARIZE_LUT = [0] * BINARIZE_THRESHOLD + [255] * (256 - BINARIZE_THRESHOLD)
+
+# Extracted text is cached by the file's content hash; bump the version when
+# the preprocessing changes so old text is not reused.
+OCR_CACHE_PREFIX = "ocr_text:v1:"
+OCR_CACHE_TTL = 60 * 60 * 24 * 30  # 30 days
+
+
 def _preprocess_image_for_ocr(img: Image.Image) -> Image.Image:
     """
     Basic OCR preprocessing to improve accuracy.
@@ -55,48 +73,131 @@ def _preprocess_image_for_ocr(img: Image.Image) -> Image.Image:
 
     # increase contrast + binarize
     img = ImageOps.autocontrast(img)
-    img = img.point(lambda x: 0 if x < 160 else 255, "1")
+    img = img.point(_BINARIZE_LUT, "1")
     return img
 
 
 def _ocr_image_bytes(raw: bytes) -> str:
+    # runs in the OCR worker processes, so it must stay a top-level function
     img = Image.open(BytesIO(raw))
     img = _preprocess_image_for_ocr(img)
-    return pytesseract.image_to_string(img)
+    return pytesseract.image_to_string(img).strip()
 
 
-def _extract_pdf_text_with_ocr_fallback(raw: bytes) -> str:
+def _document_parts(raw: bytes, file_name: str):
     """
-    Extract text from PDF pages; if a page is scanned and returns no text,
-    render it to an image and OCR it.
+    Split a document into ("text", str) parts that need no OCR and
+    ("ocr", png_bytes) parts that do, in page order.
     """
-    out = []
-    pdf = fitz.open(stream=raw, filetype="pdf")
+    if file_name.endswith(".pdf"):
+        parts = []
+        pdf = fitz.open(stream=raw, filetype="pdf")
+        try:
+            for page in pdf:
+                page_text = (page.get_text("text") or "").strip()
+                if page_text:
+                    parts.append(("text", page_text))
+                else:
+                    # scanned page: render at 200dpi (a good balance) and OCR it
+                    parts.append(("ocr", page.get_pixmap(dpi=200).tobytes("png")))
+        finally:
+            pdf.close()
+        return parts
 
-    for page in pdf:
-        page_text = page.get_text("text") or ""
-        page_text = page_text.strip()
+    if file_name.endswith((".png", ".jpg", ".jpeg")):
+        return [("ocr", raw)]
 
-        if page_text:
-            out.append(page_text)
-            continue
+    # fallback attempt
+    return [("text", raw.decode("utf-8", errors="ignore"))]
 
-        # OCR fallback for scanned page
-        pix = page.get_pixmap(dpi=200)  # 200dpi is a good balance
-        img = Image.open(BytesIO(pix.tobytes("png")))
-        img = _preprocess_image_for_ocr(img)
-        ocr_text = pytesseract.image_to_string(img).strip()
-        if ocr_text:
-            out.append(ocr_text)
 
-    pdf.close()
-    return "\n".join(out)
+def _ocr_pool(job_count, parallel):
+    """
+    Process pool for OCR jobs, or None to run them inline. Only callers that
+    ask for it get a pool (the background scan task); web requests never
+    fork OCR processes. Also inline for a single job, OCR_MAX_WORKERS <= 1,
+    or inside a daemonic Celery worker, which may not start child processes.
+    """
+    if not parallel:
+        return None
+    workers = getattr(settings, "OCR_MAX_WORKERS", None) or min(4, os.cpu_count() or 1)
+    if job_count < 2 or workers <= 1 or multiprocessing.current_process().daemon:
+        return None
+    return ProcessPoolExecutor(max_workers=min(workers, job_count))
 
 
-def scan_documents_for_eligibility(application, task_id=None, progress_callback=None):
+def extract_document_texts(documents, on_page_done=None, parallel=False):
+    """
+    Extract text for documents, a list of (key, raw_bytes, file_name).
+
+    Text already cached for the same content hash is reused. With
+    parallel=True every page that still needs OCR, across all documents, is
+    sent to one process pool; otherwise pages are OCR'd inline.
+    Returns {key: text}, or {key: exception} for documents that failed.
+    on_page_done(done, total) is called as OCR pages finish.
+    """
+    results = {}
+    pending = {}  # key -> (cache_key, parts)
+
+    for key, raw, file_name in documents:
+        cache_key = OCR_CACHE_PREFIX + hashlib.sha256(raw).hexdigest()
+        cached = cache.get(cache_key)
+        if cached is not None:
+            results[key] = cached
+            continue
+        try:
+            pending[key] = (cache_key, _document_parts(raw, file_name))
+        except Exception as exc:
+            results[key] = exc
+
+    jobs = [
+        (key, idx, payload)
+        for key, (_, parts) in pending.items()
+        for idx, (kind, payload) in enumerate(parts)
+        if kind == "ocr"
+    ]
+    ocr_text, failed = {}, {}
+    pool = _ocr_pool(len(jobs), parallel)
+    try:
+        if pool is None:
+            for done, (key, idx, payload) in enumerate(jobs, start=1):
+                try:
+                    ocr_text[(key, idx)] = _ocr_image_bytes(payload)
+                except Exception as exc:
+                    failed[key] = exc
+                if on_page_done:
+                    on_page_done(done, len(jobs))
+        else:
+            futures = {pool.submit(_ocr_image_bytes, payload): (key, idx) for key, idx, payload in jobs}
+            for done, future in enumerate(as_completed(futures), start=1):
+                key, idx = futures[future]
+                try:
+                    ocr_text[(key, idx)] = future.result()
+                except Exception as exc:
+                    failed[key] = exc
+                if on_page_done:
+                    on_page_done(done, len(jobs))
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    for key, (cache_key, parts) in pending.items():
+        if key in failed:
+            results[key] = failed[key]
+            continue
+        texts = [payload if kind == "text" else ocr_text[(key, idx)] for idx, (kind, payload) in enumerate(parts)]
+        text = "\n".join(t for t in texts if t)
+        cache.set(cache_key, text, timeout=OCR_CACHE_TTL)
+        results[key] = text
+
+    return results
+
+
+def scan_documents_for_eligibility(application, task_id=None, progress_callback=None, parallel=False):
     """
     Scans application documents and returns a text summary.
     If task_id is provided, progress_callback(task_id, progress, message) will be called.
+    parallel=True lets OCR use a process pool (background tasks only).
     """
 
     def maybe_update(pct, msg):
@@ -120,7 +221,7 @@ def scan_documents_for_eligibility(application, task_id=None, progress_callback=
         ("id_card", application.id_card),
         ("character_reference_1", application.character_reference_1),
         ("character_reference_2", application.character_reference_2),
-        ("statedec", application.statedec),
+        ("statdec", application.statdec),
         # ("expression_of_interest", getattr(application, "expression_of_interest", None)),
     ]
 
@@ -129,38 +230,39 @@ def scan_documents_for_eligibility(application, task_id=None, progress_callback=
 
     maybe_update(1, "Starting document scan...")
 
+    # Read everything first so all pages that need OCR go through one pool
+    documents, read_errors = [], {}
     for label, file in document_fields:
-        processed += 1
-        pct = int((processed - 1) / max(total, 1) * 90)
-        maybe_update(pct, f"Processing {label.replace('_', ' ').title()}...")
-
         if not file:
-            eligibility_flags.append(f"❌ Missing: {label.replace('_', ' ').title()}")
             continue
-
-        text = ""
-        file_name = (getattr(file, "name", "") or "").lower()
-
         try:
             file.seek(0)
             raw = file.read()
             file.seek(0)
+            documents.append((label, raw, (getattr(file, "name", "") or "").lower()))
+        except Exception as e:
+            read_errors[label] = e
 
-            if file_name.endswith(".pdf"):
-                text = _extract_pdf_text_with_ocr_fallback(raw)
+    maybe_update(5, f"Extracting text from {len(documents)} document(s)...")
+    texts = extract_document_texts(
+        documents,
+        on_page_done=lambda done, pages: maybe_update(5 + int(done / max(pages, 1) * 75), f"OCR page {done}/{pages}"),
+        parallel=parallel,
+    )
+    texts.update(read_errors)
 
-            elif file_name.endswith((".png", ".jpg", ".jpeg")):
-                text = _ocr_image_bytes(raw)
+    for label, file in document_fields:
+        processed += 1
+        pct = 80 + int((processed - 1) / max(total, 1) * 10)
+        maybe_update(pct, f"Processing {label.replace('_', ' ').title()}...")
 
-            else:
-                # fallback attempt
-                try:
-                    text = raw.decode("utf-8", errors="ignore")
-                except Exception:
-                    text = ""
+        if not file:
+            eligibility_flags.append(f"❌ Missing: {label.replace('_', ' ').title()}")
+            continue
 
-        except Exception as e:
-            summary.append(f"⚠️ Error reading {label}: {str(e)}")
+        text = texts.get(label, "")
+        if isinstance(text, Exception):
+            summary.append(f"⚠️ Error reading {label}: {str(text)}")
             continue
 
         text_lower = (text or "").lower()
@@ -223,7 +325,7 @@ def scan_documents_for_eligibility(application, task_id=None, progress_callback=
                 eligibility_flags.append("⚠️ Expression of interest lacks clear motivation")
 
         # progress after each document
-        pct = int(processed / max(total, 1) * 90)
+        pct = 80 + int(processed / max(total, 1) * 10)
         maybe_update(pct, f"Processed {processed}/{total} documents")
 
     # Finalize (make denominator consistent)
@@ -0,0 +1,97 @@
+# utils/csv_export.py
+"""
+Streaming CSV export engine shared by the officer, pool and FF4 exports.
+
+Rows are pulled from the database with .iterator(chunk_size=...) and written
+straight to a StreamingHttpResponse, so memory stays flat and the first bytes
+reach the browser before the last row has been read. Group subtotals are
+emitted on the fly as the group key changes, which requires the queryset to
+be ordered by that key on the database side.
+"""
+import csv
+from decimal import Decimal, ROUND_HALF_UP
+
+from django.http import StreamingHttpResponse
+
+EXPORT_CHUNK_SIZE = 2000
+
+_NO_GROUP = object()
+
+
+class Echo:
+    """
+    Pseudo-buffer for csv.writer: write() returns the encoded line instead of
+    storing it, so each row can be yielded to the response as it is produced.
+    """
+
+    def write(self, value):
+        return value
+
+
+def format_currency(amount):
+    amt = Decimal(amount or 0).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+    return f"PGK{amt:,.2f}"
+
+
+def streaming_csv_response(filename, rows):
+    """
+    Wrap an iterable of CSV rows (lists) in a StreamingHttpResponse download.
+    """
+    writer = csv.writer(Echo())
+    response = StreamingHttpResponse(
+        (writer.writerow(row) for row in rows),
+        content_type='text/csv',
+    )
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
+def _total_row(label, amount):
+    return ['', '', '', '', '', label, format_currency(amount)]
+
+
+def grouped_rows(queryset, row, amount, group_by=None,
+                 subtotal_label='Institution total', grand_total_label='Grand total',
+                 chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Yield CSV rows for queryset with a subtotal row after every group.
+
+    - row(idx, obj, group): builds the data row; idx restarts at 1 per group
+    - amount(obj): value summed into the subtotals
+    - group_by(obj): group key; each new key gets a title row. With no
+      group_by the whole queryset is a single untitled group and the
+      subtotal row is always written, even when there are no rows.
+    - grand_total_label: label for the closing grand-total row (None skips it)
+
+    The queryset must be ordered by the group key, otherwise groups repeat.
+    """
+    current = _NO_GROUP
+    idx = 0
+    subtotal = grand_total = Decimal('0.00')
+
+    for obj in queryset.iterator(chunk_size=chunk_size):
+        key = group_by(obj) if group_by else None
+        if key != current:
+            if current is not _NO_GROUP:
+                yield []
+                yield _total_row(subtotal_label, subtotal)
+            current = key
+            idx = 0
+            subtotal = Decimal('0.00')
+            if group_by:
+                yield []
+                yield [key]
+
+        idx += 1
+        value = Decimal(amount(obj) or 0)
+        subtotal += value
+        grand_total += value
+        yield row(idx, obj, key)
+
+    if current is not _NO_GROUP or not group_by:
+        yield []
+        yield _total_row(subtotal_label, subtotal)
+
+    if grand_total_label:
+        yield []
+        yield _total_row(grand_total_label, grand_total)
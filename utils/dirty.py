@@ -0,0 +1,112 @@
+# utils/dirty.py
+"""
+Dirty-field tracking for models without a database round trip.
+
+DirtyFieldsMixin snapshots the concrete field values an instance was
+loaded (or constructed) with in post_init, so "did status change?" is a
+dict comparison instead of a SELECT in pre_save. The snapshot is taken
+again after every successful save() and refresh_from_db(); post_save
+receivers still see the pre-save values.
+
+Only fields present on the instance are tracked (deferred fields are
+unknown until loaded). In-place mutation of mutable values (JSONField
+dicts) is not detected; assign a new value instead.
+"""
+from django.db.models.signals import post_init
+
+_SNAPSHOT_ATTR = "_loaded_values"
+_MISSING = object()
+
+
+def _attnames(instance):
+    return [f.attname for f in instance._meta.concrete_fields if not f.primary_key]
+
+
+def _take_snapshot(instance, attnames=None):
+    values = instance.__dict__
+    snapshot = values.setdefault(_SNAPSHOT_ATTR, {})
+    for attname in attnames or _attnames(instance):
+        if attname in values:
+            snapshot[attname] = values[attname]
+
+
+def _snapshot_on_init(sender, instance, **kwargs):
+    _take_snapshot(instance)
+
+
+class DirtyFieldsMixin:
+    """
+    Mix into a model (before models.Model) to get get_dirty_fields(),
+    has_changed(), original_value() and save_dirty().
+    """
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        post_init.connect(_snapshot_on_init, sender=cls, weak=False,
+                          dispatch_uid=f"dirty_fields:{cls.__module__}.{cls.__qualname__}")
+
+    def _attname(self, field_name):
+        return self._meta.get_field(field_name).attname
+
+    def original_value(self, field_name, default=None):
+        """
+        Value the field had when loaded or last saved (FK fields give the id).
+        """
+        return self.__dict__.get(_SNAPSHOT_ATTR, {}).get(self._attname(field_name), default)
+
+    def has_changed(self, field_name):
+        attname = self._attname(field_name)
+        snapshot = self.__dict__.get(_SNAPSHOT_ATTR, {})
+        if attname not in snapshot:
+            return attname in self.__dict__
+        return self.__dict__.get(attname) != snapshot[attname]
+
+    def get_dirty_fields(self):
+        """
+        {field_name: original_value} for every loaded field whose value differs.
+        """
+        snapshot = self.__dict__.get(_SNAPSHOT_ATTR, {})
+        dirty = {}
+        for field in self._meta.concrete_fields:
+            if field.primary_key or field.attname not in self.__dict__:
+                continue
+            original = snapshot.get(field.attname, _MISSING)
+            if original is _MISSING or self.__dict__[field.attname] != original:
+                dirty[field.name] = None if original is _MISSING else original
+        return dirty
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None:
+            _take_snapshot(self)
+        else:
+            _take_snapshot(self, [self._attname(name) for name in update_fields])
+
+    save.alters_data = True
+
+    def save_dirty(self, **kwargs):
+        """
+        Save only the changed fields (plus auto_now timestamps). New instances
+        get a normal full save. Returns the list of saved field names
+        (empty when nothing changed and no query was made).
+        """
+        if self._state.adding:
+            self.save(**kwargs)
+            return [f.name for f in self._meta.concrete_fields]
+        fields = list(self.get_dirty_fields())
+        if not fields:
+            return []
+        fields += [
+            f.name for f in self._meta.concrete_fields
+            if getattr(f, "auto_now", False) and f.name not in fields
+        ]
+        self.save(update_fields=fields, **kwargs)
+        return fields
+
+    save_dirty.alters_data = True
+
+    def refresh_from_db(self, using=None, fields=None, **kwargs):
+        super().refresh_from_db(using=using, fields=fields, **kwargs)
+        _take_snapshot(self, [self._attname(name) for name in fields] if fields else None)
+
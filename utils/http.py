@@ -0,0 +1,90 @@
+# utils/http.py
+"""
+Shared outbound HTTP client for the PDF service, SwiftMassive and other APIs.
+
+One requests.Session per process keeps TCP/TLS connections alive between
+calls, so bulk PDF runs and email fan-outs reuse pooled connections instead
+of handshaking per request. Connection errors are retried with backoff for
+every method; status-code retries only apply to idempotent methods so a
+POST is never sent twice after the server has accepted it.
+
+Settings (all optional):
+  HTTP_POOL_CONNECTIONS   number of per-host pools kept (default 10)
+  HTTP_POOL_MAXSIZE       connections kept per host (default 20)
+  HTTP_RETRY_TOTAL        retry budget per request (default 3)
+  HTTP_RETRY_BACKOFF      backoff factor in seconds (default 0.5)
+  HTTP_DEFAULT_TIMEOUT    (connect, read) seconds (default (5, 30))
+  HTTP_TIMEOUTS           {"host": (connect, read)} per-host overrides
+"""
+import os
+import threading
+from urllib.parse import urlsplit
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+_session = None
+_session_pid = None
+_lock = threading.Lock()
+
+
+def _build_session():
+    retry = Retry(
+        total=getattr(settings, "HTTP_RETRY_TOTAL", 3),
+        backoff_factor=getattr(settings, "HTTP_RETRY_BACKOFF", 0.5),
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset({"GET", "HEAD", "OPTIONS"}),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=getattr(settings, "HTTP_POOL_CONNECTIONS", 10),
+        pool_maxsize=getattr(settings, "HTTP_POOL_MAXSIZE", 20),
+        max_retries=retry,
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_session():
+    """
+    Return this process's pooled session.
+
+    Keyed on the pid so Celery/gunicorn children forked after first use
+    build their own pool instead of sharing the parent's sockets.
+    """
+    global _session, _session_pid
+    pid = os.getpid()
+    if _session is None or _session_pid != pid:
+        with _lock:
+            if _session is None or _session_pid != pid:
+                _session = _build_session()
+                _session_pid = pid
+    return _session
+
+
+def timeout_for(url):
+    host = (urlsplit(url).hostname or "").lower()
+    timeouts = getattr(settings, "HTTP_TIMEOUTS", {}) or {}
+    return timeouts.get(host, getattr(settings, "HTTP_DEFAULT_TIMEOUT", (5, 30)))
+
+
+def request(method, url, timeout=None, **kwargs):
+    """
+    requests.request() through the pooled session, with the host's timeout
+    unless one is passed explicitly.
+    """
+    return get_session().request(method, url, timeout=timeout or timeout_for(url), **kwargs)
+
+
+def get(url, **kwargs):
+    return request("GET", url, **kwargs)
+
+
+def post(url, **kwargs):
+    return request("POST", url, **kwargs)
@@ -1,9 +1,107 @@
 # utils/legacy_students.py
 import json
+from decimal import Decimal, InvalidOperation
+
 from django.conf import settings
 
 LEGACY_JSON_PATH = settings.BASE_DIR / "data" / "legacy_students.json"
 
+READ_CHUNK_SIZE = 64 * 1024
+
+_decoder = json.JSONDecoder()
+
+
 def load_legacy_students():
     with open(LEGACY_JSON_PATH, "r", encoding="utf-8") as f:
         return json.load(f)
+
+
+def iter_json_array(fh, read_size=READ_CHUNK_SIZE):
+    """
+    Yield the elements of a top-level JSON array one at a time, reading the
+    file in read_size chunks instead of loading it whole.
+    """
+    buf = fh.read(read_size).lstrip()
+    if not buf.startswith("["):
+        raise ValueError("Legacy JSON must be a top-level array")
+    pos = 1
+    eof = False
+
+    while True:
+        # skip whitespace and separators; refill when the buffer runs dry
+        while True:
+            while pos < len(buf) and buf[pos] in " \t\r\n,":
+                pos += 1
+            if pos < len(buf) or eof:
+                break
+            more = fh.read(read_size)
+            eof = not more
+            buf, pos = buf[pos:] + more, 0
+
+        if pos >= len(buf):
+            raise ValueError("Unexpected end of legacy JSON (missing ']')")
+        if buf[pos] == "]":
+            return
+
+        try:
+            item, end = _decoder.raw_decode(buf, pos)
+            # a scalar cut at the buffer edge can still decode, so read on
+            complete = eof or end < len(buf)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            complete = False
+        if not complete:
+            more = fh.read(read_size)
+            eof = not more
+            buf, pos = buf[pos:] + more, 0
+            continue
+        yield item
+        pos = end
+
+
+def iter_legacy_students(path=LEGACY_JSON_PATH):
+    with open(path, "r", encoding="utf-8-sig") as f:
+        yield from iter_json_array(f)
+
+
+def clean_legacy_record(record):
+    """
+    Map one raw spreadsheet-export record to LegacyStudent field values.
+    Raises ValueError with a short reason for rows that cannot be imported.
+    """
+    if not isinstance(record, dict):
+        raise ValueError("not an object")
+
+    def text(key):
+        return str(record.get(key) or "").strip()
+
+    first_name = text("First Name ") or text("First Name")
+    surname = text("Surname")
+    if not first_name or not surname:
+        raise ValueError("missing first name or surname")
+
+    year = None
+    year_str = text("Year Of Study")
+    if year_str.lower().startswith("year"):
+        try:
+            year = int(year_str[4:].strip())
+        except ValueError:
+            year = None
+    if year is not None and not 1 <= year <= 5:
+        raise ValueError(f"year of study out of range: {year_str}")
+
+    tuition_str = text("Tuition Fee").replace(",", "") or "0"
+    try:
+        tuition = Decimal(tuition_str)
+    except InvalidOperation:
+        raise ValueError(f"invalid tuition fee: {tuition_str!r}")
+
+    return {
+        "first_name": first_name,
+        "surname": surname,
+        "institution": text("Institution"),
+        "course": text("Course ") or text("Course"),
+        "year_of_study": year,
+        "tuition_fee": tuition,
+    }
@@ -0,0 +1,181 @@
+# utils/pagination.py
+"""
+Keyset (cursor) pagination for long, append-mostly listings.
+
+Instead of COUNT(*) + OFFSET, each page is fetched with a row-value bound
+on the ordering keys ("submitted before X, or at X with a lower id"), so
+every page costs the same index range scan however deep the officer goes.
+Cursors are opaque URL-safe tokens; the ordering keys must be non-null
+and end with a unique column (usually the primary key).
+"""
+import base64
+import datetime
+import json
+from functools import reduce
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections
+from django.db.models import Q
+
+# below this many estimated rows an exact COUNT(*) is cheap enough
+EXACT_COUNT_THRESHOLD = 1000
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+class _CursorEncoder(DjangoJSONEncoder):
+    # DjangoJSONEncoder rounds datetimes to milliseconds, which would break
+    # the equality half of the bound for rows sharing a timestamp
+    def default(self, o):
+        if isinstance(o, datetime.datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+class KeysetPage:
+    """
+    One page of results. Iterates like a Page; has_next / has_previous and
+    next_cursor / previous_cursor replace page numbers.
+    """
+
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next or self.has_previous
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+
+class KeysetPaginator:
+    """
+    Paginate queryset by ordering, e.g. ("-submission_date", "-id").
+
+    get_page(after=cursor) returns the rows following a cursor,
+    get_page(before=cursor) the rows preceding it; a missing or malformed
+    cursor yields the first page, like Paginator.get_page().
+    """
+
+    def __init__(self, queryset, per_page, ordering=("-submission_date", "-id")):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.ordering = [
+            (name.lstrip("-"), name.startswith("-")) for name in ordering
+        ]
+        opts = queryset.model._meta
+        self.fields = [opts.get_field(name) for name, _ in self.ordering]
+
+    # ---- cursors ----
+    def encode_cursor(self, obj):
+        values = [getattr(obj, field.attname) for field in self.fields]
+        raw = json.dumps(values, cls=_CursorEncoder, separators=(",", ":"))
+        return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+    def decode_cursor(self, cursor):
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+            if not isinstance(values, list) or len(values) != len(self.fields):
+                raise ValueError("wrong number of keys")
+            return [field.to_python(value) for field, value in zip(self.fields, values)]
+        except Exception as exc:
+            raise InvalidCursor(str(exc)) from exc
+
+    # ---- queries ----
+    def _bound(self, values, forward):
+        """
+        Q for rows strictly after values in the (possibly reversed) ordering:
+        (a > x) OR (a = x AND b > y) OR ...
+        """
+        clauses = []
+        for i, ((name, desc), value) in enumerate(zip(self.ordering, values)):
+            lookup = "lt" if desc == forward else "gt"
+            equal = {n: v for (n, _), v in zip(self.ordering[:i], values[:i])}
+            clauses.append(Q(**equal, **{f"{name}__{lookup}": value}))
+        return reduce(lambda a, b: a | b, clauses)
+
+    def _order(self, forward):
+        return [
+            f"-{name}" if desc == forward else name
+            for name, desc in self.ordering
+        ]
+
+    def get_page(self, after=None, before=None):
+        forward = not before
+        cursor = after if forward else before
+        qs = self.queryset.order_by(*self._order(forward))
+
+        if cursor:
+            try:
+                qs = qs.filter(self._bound(self.decode_cursor(cursor), forward))
+            except InvalidCursor:
+                cursor, forward = None, True
+                qs = self.queryset.order_by(*self._order(True))
+
+        rows = list(qs[: self.per_page + 1])
+        more = len(rows) > self.per_page
+        rows = rows[: self.per_page]
+        if not forward:
+            rows.reverse()
+
+        if not rows:
+            return KeysetPage(rows)
+
+        first, last = self.encode_cursor(rows[0]), self.encode_cursor(rows[-1])
+        if forward:
+            return KeysetPage(rows, next_cursor=last if more else None,
+                              previous_cursor=first if cursor else None)
+        return KeysetPage(rows, next_cursor=last,
+                          previous_cursor=first if more else None)
+
+
+def approximate_count(queryset, exact_below=EXACT_COUNT_THRESHOLD):
+    """
+    Row count for a listing header. On PostgreSQL the planner's estimate is
+    used for large results (no full scan); small results, and other
+    databases, get an exact COUNT(*).
+
+    Returns (count, is_estimate).
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return queryset.count(), False
+
+    sql, params = queryset.order_by().values("pk").query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    estimate = int(plan[0]["Plan"]["Plan Rows"])
+
+    if estimate < exact_below:
+        return queryset.count(), False
+    return estimate, True
+
+
+def query_without(querydict, *keys):
+    """
+    Urlencoded copy of a GET QueryDict minus the given keys, for building
+    pagination links that keep the current filters.
+    """
+    params = querydict.copy()
+    for key in keys:
+        params.pop(key, None)
+    return params.urlencode()
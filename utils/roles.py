@@ -0,0 +1,61 @@
+# utils/roles.py
+"""
+Group-based role resolution shared by every permission predicate.
+
+A user's group names are loaded once and memoized on the user object, so
+all the checks made while serving one request (decorators, views, context
+processors) share a single lookup. Across requests the names are kept in
+the cache; applications/signals.py clears the entry whenever the user's
+groups change.
+"""
+from django.core.cache import cache
+
+GROUPS_CACHE_TTL = 60 * 60  # 1 hour
+_MEMO_ATTR = "_group_names_memo"
+
+
+def _cache_key(user_id):
+    return f"user_groups:{user_id}"
+
+
+def get_group_names(user):
+    """
+    Return the names of user's groups as a frozenset (empty for anonymous).
+    """
+    if not user or not user.is_authenticated:
+        return frozenset()
+
+    names = getattr(user, _MEMO_ATTR, None)
+    if names is not None:
+        return names
+
+    key = _cache_key(user.pk)
+    cached = cache.get(key)
+    if cached is None:
+        cached = list(user.groups.values_list("name", flat=True))
+        cache.set(key, cached, timeout=GROUPS_CACHE_TTL)
+
+    names = frozenset(cached)
+    setattr(user, _MEMO_ATTR, names)
+    return names
+
+
+def has_any_group(user, *group_names):
+    return not get_group_names(user).isdisjoint(group_names)
+
+
+def invalidate_user_groups(*user_ids):
+    """
+    Drop cached group names for the given users (memos on live user objects
+    end with their request).
+    """
+    if user_ids:
+        cache.delete_many([_cache_key(user_id) for user_id in user_ids])
+
+
+def reset_user_groups(user):
+    """
+    Forget user's group names both on the object and in the cache.
+    """
+    user.__dict__.pop(_MEMO_ATTR, None)
+    invalidate_user_groups(user.pk)
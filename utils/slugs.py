@@ -0,0 +1,88 @@
+# utils/slugs.py
+"""
+Unique slug allocation in a constant number of queries.
+
+The next free slug for a base is found with one LIKE 'base-%' query that
+returns only the highest numeric suffix, instead of probing base, base-1,
+base-2, ... one query at a time. On PostgreSQL the slug's unique btree
+can't serve a LIKE prefix under a non-C collation, so models using this
+should also index the slug with varchar_pattern_ops (see News).
+
+Two concurrent saves can still pick the same slug; UniqueSlugMixin
+catches the unique violation inside a savepoint and allocates again.
+"""
+import re
+
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.db.models.functions import Length
+from django.utils.text import slugify
+
+# room left after the base for "-<counter>"
+SLUG_SUFFIX_RESERVE = 10
+SLUG_SAVE_ATTEMPTS = 5
+
+
+def next_unique_slug(instance, value, slug_field="slug"):
+    """
+    First free slug for value on instance's model: base, then base-1,
+    base-2, ... continuing after the highest suffix in use.
+    """
+    model = type(instance)
+    field = model._meta.get_field(slug_field)
+    base = slugify(value or "")[: field.max_length - SLUG_SUFFIX_RESERVE].strip("-") or "item"
+
+    taken = (
+        model._default_manager
+        .filter(
+            Q(**{slug_field: base})
+            | Q(**{
+                f"{slug_field}__startswith": f"{base}-",
+                f"{slug_field}__regex": rf"^{re.escape(base)}-[0-9]+$",
+            })
+        )
+        .exclude(pk=instance.pk)
+        # "base-10" sorts after "base-9" by length first
+        .order_by(Length(slug_field).desc(), f"-{slug_field}")
+        .values_list(slug_field, flat=True)
+        .first()
+    )
+    if taken is None:
+        return base
+    if taken == base:
+        return f"{base}-1"
+    return f"{base}-{int(taken.rsplit('-', 1)[1]) + 1}"
+
+
+class UniqueSlugMixin:
+    """
+    Model mixin that fills an empty unique slug from another field on save.
+    Set slug_source (default "title") and slug_field (default "slug").
+    """
+
+    slug_source = "title"
+    slug_field = "slug"
+
+    def save(self, *args, **kwargs):
+        if getattr(self, self.slug_field):
+            return super().save(*args, **kwargs)
+
+        for attempt in range(1, SLUG_SAVE_ATTEMPTS + 1):
+            setattr(self, self.slug_field, next_unique_slug(self, getattr(self, self.slug_source), self.slug_field))
+            try:
+                with transaction.atomic(using=kwargs.get("using")):
+                    return super().save(*args, **kwargs)
+            except IntegrityError:
+                # lost a race for this slug: allocate again; anything else is re-raised
+                slug = getattr(self, self.slug_field)
+                collided = (
+                    type(self)._default_manager
+                    .filter(**{self.slug_field: slug})
+                    .exclude(pk=self.pk)
+                    .exists()
+                )
+                setattr(self, self.slug_field, "")
+                if not collided or attempt == SLUG_SAVE_ATTEMPTS:
+                    raise
+
+    save.alters_data = True